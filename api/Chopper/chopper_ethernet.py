@@ -1,18 +1,32 @@
+import logging
 import time
 
 from pymodbus.client import ModbusTcpClient
+from pymodbus.exceptions import ConnectionException
+from pymodbus.framer import ModbusRtuFramer
 
 from api.Chopper.chopper_sync import Chopper
+from store.state import state
+
+logger = logging.getLogger(__name__)
 
 
 class ChopperEthernet(Chopper):
+    """Chopper behind WaveShare RS485-Ethernet gateway in transparent mode.
+    The gateway forwards raw RTU frames, so the client uses the RTU framer over TCP.
+    """
+
     def __init__(
         self,
-        host: str = "169.254.54.24",
-        port: int = 1111,
+        host: str = state.WAVESHARE_HOST,
+        port: int = state.WAVESHARE_PORT,
         baudrate: int = 9600,
         slave_address: int = 1,
+        frame_gap: float = None,
     ):
+        # RTU requires 3.5 characters (11 bits each) of silence between frames
+        self.frame_gap = 3.5 * 11 / baudrate if frame_gap is None else frame_gap
+        self.last_frame = 0
         super().__init__(host, port, baudrate, slave_address)
 
     def init_client(self):
@@ -21,15 +35,53 @@ class ChopperEthernet(Chopper):
             if self.client.connected:
                 self.client.close()
         self.client = ModbusTcpClient(
-            method="rtu",
             host=self.host,
             port=self.port,
-            baudrate=self.baudrate,
-            stopbits=1,
-            bytesize=8,
-            parity="N",
+            framer=ModbusRtuFramer,
+            timeout=state.CHOPPER_ETHERNET_TIMEOUT,
+            retries=state.CHOPPER_ETHERNET_RETRIES,
+            reconnect_delay=0,
         )
 
+    def reconnect(self) -> bool:
+        self.client.close()
+        self.profiles = {}
+        connected = self.client.connect()
+        logger.info(f"[{self.__class__.__name__}.reconnect] Connected {connected}")
+        return connected
+
+    def execute(self, method: str, *args):
+        """Run a client request keeping the RTU inter-frame gap,
+        reconnect immediately and repeat the request once if the link was lost
+        """
+        with self.lock:
+            for attempt in range(1, 3):
+                delay = self.last_frame + self.frame_gap - time.time()
+                if delay > 0:
+                    time.sleep(delay)
+                try:
+                    if not self.client.connected:
+                        self.reconnect()
+                    return getattr(self.client, method)(*args, self.slave_address)
+                except (ConnectionException, OSError) as e:
+                    logger.error(
+                        f"[{self.__class__.__name__}.execute][Attempt {attempt}] {e}"
+                    )
+                    if attempt == 2:
+                        raise
+                    self.reconnect()
+                finally:
+                    self.last_frame = time.time()
+
+    def write_register(self, address: int, value: int):
+        return self.execute("write_register", address, value)
+
+    def write_registers(self, address: int, values):
+        return self.execute("write_registers", address, values)
+
+    def read_holding_registers(self, address: int, count: int = 1):
+        return self.execute("read_holding_registers", address, count)
+
 
 if __name__ == "__main__":
     chopper = ChopperEthernet()
@@ -1,17 +1,31 @@
 import logging
+import threading
 import time
-from typing import Union
+from typing import List, Union
 
 from pymodbus.client import ModbusSerialClient as ModbusClient
 from pymodbus.constants import Endian
-from pymodbus.payload import BinaryPayloadBuilder, BinaryPayloadDecoder
+from pymodbus.payload import BinaryPayloadDecoder
 
+from api.Chopper.profiles import (
+    PR_CONTROL_ADDRESS,
+    SLOW_DOWN_PROFILE,
+    MotionProfile,
+    position_profile,
+    step_profile,
+    velocity_profile,
+)
 from store.state import state
 
 logger = logging.getLogger(__name__)
 
 
 class Chopper:
+    # PR control register values, enumerated (not bit flags)
+    MOTION_RUNNING = frozenset(range(0x010, 0x020)) | {0x020, 0x200}
+    MOTION_COMPLETED = frozenset(range(0x000, 0x010))
+    MOTION_EMERGENCY_STOP = 0x040
+
     def __init__(
         self,
         host: str = None,
@@ -26,6 +40,8 @@ class Chopper:
         self.baudrate = baudrate
         self.slave_address = slave_address
         self.client = None
+        self.profiles = {}
+        self.lock = threading.RLock()
         self.init_client()
 
         self.frequency = 1
@@ -45,6 +61,7 @@ class Chopper:
 
     def connect(self) -> bool:
         if not self.client.connected:
+            self.profiles = {}
             self.client.connect()
         logger.info(
             f"[{[self.__class__.__name__]}.connect] Connected {self.client.connected}"
@@ -58,49 +75,137 @@ class Chopper:
     def __del__(self):
         logger.info(f"[{[self.__class__.__name__]}.__del__] Instance deleted")
 
+    def write_register(self, address: int, value: int):
+        with self.lock:
+            return self.client.write_register(address, value, self.slave_address)
+
+    def write_registers(self, address: int, values: List[int]):
+        with self.lock:
+            return self.client.write_registers(address, values, self.slave_address)
+
+    def read_holding_registers(self, address: int, count: int = 1):
+        with self.lock:
+            return self.client.read_holding_registers(
+                address, count, self.slave_address
+            )
+
     def save_parameters_to_eeprom(self):
-        self.client.write_register(int(0x1801), int(0x2211), self.slave_address)
+        self.write_register(int(0x1801), int(0x2211))
 
     def motor_direction(self, param):
         # 0:CW; 1:CCW
-        self.client.write_register(int(0x007), int(param), self.slave_address)
+        self.write_register(int(0x007), int(param))
 
     def jog_speed(self, param):
         # 0--5000 rpm
-        self.client.write_register(int(0x01E1), int(param), self.slave_address)
+        self.write_register(int(0x01E1), int(param))
 
     def jog_acc_dec_time(self, param):
         # in ms/1000rpm
-        self.client.write_register(int(0x01E7), int(param), self.slave_address)
+        self.write_register(int(0x01E7), int(param))
 
     def jogCW(self):
-        self.client.write_register(int(0x1801), int(0x4001), self.slave_address)
+        self.write_register(int(0x1801), int(0x4001))
         logger.info("jogCW")
 
     def jogCCW(self):
-        self.client.write_register(int(0x1801), int(0x4002), self.slave_address)
+        self.write_register(int(0x1801), int(0x4002))
         logger.info("jogCCW")
 
     def emergency_stop(self):
-        self.client.write_register(int(0x6002), int(0x040), self.slave_address)
+        self.write_register(PR_CONTROL_ADDRESS, int(0x040))
         logger.info("Emergency stop")
 
     def set_origin(self):
         """Set current position as 'Zero'"""
-        self.client.write_register(int(0x6002), int(0x021), self.slave_address)
+        self.write_register(PR_CONTROL_ADDRESS, int(0x021))
         pos = self.get_actual_pos()
         logger.info(f"Origin set, actual position (in pulses): {pos}")
 
     def get_actual_pos(self) -> int:
         start_address = int(0x602C)
         count = 2
-        result = self.client.read_holding_registers(start_address, count, 1)
+        result = self.read_holding_registers(start_address, count)
         decoder = BinaryPayloadDecoder.fromRegisters(
             result.registers, byteorder=Endian.BIG, wordorder=Endian.BIG
         )
         actual_pos = decoder.decode_32bit_int()
         return actual_pos
 
+    def get_motion_status(self) -> Union[int, None]:
+        """PR control register state:
+        0x01P - path P is running, 0x020 - homing, 0x040 - emergency stop,
+        0x200 - command completed, waiting for positioning, 0x000P - path P completed
+        """
+        result = self.read_holding_registers(PR_CONTROL_ADDRESS, 1)
+        if result.isError():
+            return None
+        return result.registers[0]
+
+    def get_motion_state(self) -> Union[str, None]:
+        """'running', 'completed', 'emergency_stop' or 'fault' (any other status),
+        None if the status can't be read
+        """
+        status = self.get_motion_status()
+        if status is None:
+            return None
+        if status in self.MOTION_RUNNING:
+            return "running"
+        if status in self.MOTION_COMPLETED:
+            return "completed"
+        if status == self.MOTION_EMERGENCY_STOP:
+            return "emergency_stop"
+        logger.error(f"[{self.__class__.__name__}] Motion status {hex(status)}")
+        return "fault"
+
+    def wait_motion_complete(
+        self,
+        target: int = None,
+        timeout: float = None,
+        interval: float = None,
+        tolerance: int = None,
+    ) -> bool:
+        """Poll the drive until the current motion is finished.
+        Motion is finished when the position has converged to the target (or stopped
+        changing if target is None) and the drive reports that no path is running.
+        If the status register is not conclusive, two consecutive converged polls are enough.
+        Emergency stop and fault states end the waiting at once.
+        :param target: expected final position, pulses
+        :param timeout: maximum waiting time, seconds
+        :param interval: polling interval, seconds
+        :param tolerance: allowed position error, pulses
+        :return: True if the motion has completed in time
+        """
+        timeout = state.CHOPPER_MOTION_TIMEOUT if timeout is None else timeout
+        interval = state.CHOPPER_MOTION_POLL_INTERVAL if interval is None else interval
+        tolerance = state.CHOPPER_POSITION_TOLERANCE if tolerance is None else tolerance
+        start = time.time()
+        last_pos = None
+        converged_polls = 0
+        while time.time() - start < timeout:
+            motion_state = self.get_motion_state()
+            if motion_state in ("emergency_stop", "fault"):
+                logger.warning(f"[wait_motion_complete] Motion ended by {motion_state}")
+                return False
+            running = None if motion_state is None else motion_state == "running"
+            actual_pos = self.get_actual_pos()
+            reference = target if target is not None else last_pos
+            if reference is not None and abs(actual_pos - reference) <= tolerance:
+                converged_polls += 1
+            else:
+                converged_polls = 0
+            if (converged_polls and running is False) or converged_polls >= 2:
+                logger.debug(
+                    f"[wait_motion_complete] Done in {round(time.time() - start, 3)} s"
+                )
+                return True
+            last_pos = actual_pos
+            time.sleep(interval)
+        logger.warning(
+            f"[wait_motion_complete] Timeout {timeout} s, target {target}, actual {last_pos}"
+        )
+        return False
+
     def get_actual_speed(self) -> float:
         t1 = time.time()
         x1 = self.get_actual_pos()
@@ -110,111 +215,70 @@ class Chopper:
         speed = (x2 - x1) / (10000 * (t2 - t1))
         return speed
 
+    def upload_profile(self, profile: MotionProfile) -> None:
+        """Write PR path registers in one transaction if they differ from the drive's copy"""
+        if self.profiles.get(profile.path) == profile.registers:
+            return
+        result = self.write_registers(profile.address, list(profile.registers))
+        if result.isError():
+            self.profiles.pop(profile.path, None)
+            logger.error(f"[upload_profile] Unable to upload {profile}")
+            return
+        self.profiles[profile.path] = profile.registers
+
+    def trigger_profile(self, profile: MotionProfile) -> None:
+        self.upload_profile(profile)
+        self.write_register(PR_CONTROL_ADDRESS, profile.trigger)
+
     # CW by 90 deg
-    def path0(self, angle: float = 90):
+    def path0(self, angle: float = 90) -> bool:
         """Step rotation method.
         :param
         - angle (float): Angle in degrees
+        :return: True if the motion has completed in time
         """
-        steps = int(angle / 360 * 10000)
-        self.client.write_register(
-            int(0x6200), int(0b01000001), self.slave_address
-        )  # relative position mode
-        # position high bits
-        self.client.write_register(int(0x6201), int(0), self.slave_address)
-        # position low bits
-        self.client.write_register(
-            int(0x6202), steps, self.slave_address
-        )  # 10000 ppr, equals to 90 deg rotation
-        # turn speed
-        self.client.write_register(int(0x6203), int(25), self.slave_address)
-        # acc/decc time
-        self.client.write_register(int(0x6204), int(5000), self.slave_address)
-        self.client.write_register(int(0x6205), int(10000), self.slave_address)
-        # trigger PR0 motion
-        if abs(self.get_actual_pos() - (int(self.get_actual_pos() / 2500) * 2500)) > 50:
+        steps = int(angle / 360 * 10000)  # 10000 ppr, 2500 equals to 90 deg rotation
+        actual_pos = self.get_actual_pos()
+        offset = actual_pos % 2500
+        if min(offset, 2500 - offset) > 50:
             logger.info("[path0] Aligning before rotation")
             self.align()
-            time.sleep(0.3)
-        self.client.write_register(int(0x6002), int(0x010), self.slave_address)
-        time.sleep(0.3)
+            actual_pos = int(round(actual_pos / 2500) * 2500)
+        self.trigger_profile(step_profile(steps))
+        return self.wait_motion_complete(target=actual_pos + steps)
 
     # Constant speed
     def set_frequency(self, frequency: float = 1):
         self.frequency = frequency  # Hz
         omega = frequency * 60
-        self.client.write_register(int(0x620B), int(omega), self.slave_address)
+        self.upload_profile(velocity_profile(int(omega)))
 
     def path1(self):
-        self.client.write_register(
-            int(0x6208), int(0b0010), self.slave_address
-        )  # velocity mode
-        # Angular speed (rpm)
-        # freq = 12  # Hz
-        # omega = freq * 60
-        # self.client.write_register(int(0x620B), int(omega), self.slave_address)
-        self.set_frequency(self.frequency)
-        # self.client.write_register(int(0x0191), 24, self.slave_address)  # set max current 2.4 A
-        # acc/dec (ms/1000 rpm)
-        self.client.write_register(int(0x620C), int(10000), self.slave_address)
-        self.client.write_register(int(0x620D), int(5000), self.slave_address)
-        # trigger PR1 motion
-        self.client.write_register(int(0x6002), int(0x011), self.slave_address)
-        # logger.info("Constant speed:", freq, "Hz")
+        self.trigger_profile(velocity_profile(int(self.frequency * 60)))
 
     # slow down
-    def path2(self):
+    def path2(self) -> bool:
         logger.info("[path2]!Axis in rotation!")
         logger.info("[path2] Slowing down, wait for complete stop ...")
-        while True:
-            self.client.write_register(
-                int(0x6210), int(0b01000001), self.slave_address
-            )  # relative position mode
-            # position high bits
-            self.client.write_register(int(0x6211), int(0), self.slave_address)
-            # position low bits
-            self.client.write_register(int(0x6212), int(0), self.slave_address)
-            # turn speed
-            self.client.write_register(int(0x6213), int(4), self.slave_address)
-            # acc/decc time
-            self.client.write_register(int(0x6214), int(12000), self.slave_address)
-            self.client.write_register(int(0x6215), int(12000), self.slave_address)
-            # trigger PR0 motion
-            self.client.write_register(int(0x6002), int(0x012), self.slave_address)
-            if self.get_actual_speed() < 0.1:
-                self.emergency_stop()
-                logger.info("[path2] Stopped")
-                self.align()
-                logger.info("[path2] Aligned")
-                break
-            time.sleep(0.1)
-
-    def go_to_pos(self, pulse: int):
-        starting_address = int(0x6219)
-        builder = BinaryPayloadBuilder(byteorder=Endian.BIG, wordorder=Endian.BIG)
-        builder.add_32bit_int(pulse)
-        registers = builder.to_registers()
-        self.client.write_registers(starting_address, registers, self.slave_address)
-        # logger.info("Moving to position: p = ", pulse, "...")
-
-        self.client.write_register(
-            int(0x6218), int(0b00000001), self.slave_address
-        )  # absolute position mode
-        # Angular speed (rpm)
-        self.client.write_register(int(0x621B), int(25), self.slave_address)
-        # acc/dec (ms/100 rpm)
-        self.client.write_register(int(0x621C), int(3000), self.slave_address)
-        self.client.write_register(int(0x621D), int(3000), self.slave_address)
-        # trigger PR2 motion
-        self.client.write_register(int(0x6002), int(0x013), self.slave_address)
-        time.sleep(0.3)
-
-    def align(self):
+        self.trigger_profile(SLOW_DOWN_PROFILE)
+        stopped = self.wait_motion_complete(timeout=state.CHOPPER_STOP_TIMEOUT)
+        self.emergency_stop()
+        logger.info(f"[path2] Stopped {stopped}")
+        aligned = self.align()
+        logger.info("[path2] Aligned")
+        return stopped and aligned
+
+    def go_to_pos(self, pulse: int) -> bool:
+        self.trigger_profile(position_profile(pulse))
+        return self.wait_motion_complete(target=pulse)
+
+    def align(self) -> bool:
         actual_pos = self.get_actual_pos()
         logger.info(f"[align] Actual position: {actual_pos}")
         target = int(round(actual_pos / 2500) * 2500)
-        self.go_to_pos(target)
-        logger.info(f"[align] Chopper aligned")
+        aligned = self.go_to_pos(target)
+        logger.info(f"[align] Chopper aligned {aligned}")
+        return aligned
 
 
 if __name__ == "__main__":
@@ -0,0 +1,97 @@
+from typing import Tuple
+
+PR_CONTROL_ADDRESS = int(0x6002)
+PR_BASE_ADDRESS = int(0x6200)
+PR_PATH_SIZE = 8
+PR_TRIGGER = int(0x010)
+
+RELATIVE_POSITION_MODE = 0b01000001
+ABSOLUTE_POSITION_MODE = 0b00000001
+VELOCITY_MODE = 0b0010
+
+
+class MotionProfile:
+    """PR path description compiled to one contiguous block of registers:
+    mode, position high bits, position low bits, speed (rpm), acc time, dec time (ms/1000 rpm)
+    """
+
+    def __init__(
+        self,
+        path: int,
+        mode: int,
+        position: int = 0,
+        speed: int = 0,
+        acceleration: int = 0,
+        deceleration: int = 0,
+    ):
+        self.path = path
+        self.mode = mode
+        self.position = int(position)
+        self.speed = int(speed)
+        self.acceleration = int(acceleration)
+        self.deceleration = int(deceleration)
+        self.address = PR_BASE_ADDRESS + PR_PATH_SIZE * path
+        self.trigger = PR_TRIGGER + path
+        self.registers = self.compile()
+
+    def compile(self) -> Tuple[int, ...]:
+        position = self.position & 0xFFFFFFFF
+        return (
+            int(self.mode),
+            position >> 16,
+            position & 0xFFFF,
+            self.speed,
+            self.acceleration,
+            self.deceleration,
+        )
+
+    def __repr__(self):
+        return (
+            f"{self.__class__.__name__}(path={self.path}, registers={self.registers})"
+        )
+
+
+def step_profile(steps: int) -> MotionProfile:
+    """PR0: relative rotation, 10000 ppr"""
+    return MotionProfile(
+        path=0,
+        mode=RELATIVE_POSITION_MODE,
+        position=steps,
+        speed=25,
+        acceleration=5000,
+        deceleration=10000,
+    )
+
+
+def velocity_profile(rpm: int) -> MotionProfile:
+    """PR1: constant speed rotation"""
+    return MotionProfile(
+        path=1,
+        mode=VELOCITY_MODE,
+        speed=rpm,
+        acceleration=10000,
+        deceleration=5000,
+    )
+
+
+def position_profile(pulse: int) -> MotionProfile:
+    """PR3: absolute positioning"""
+    return MotionProfile(
+        path=3,
+        mode=ABSOLUTE_POSITION_MODE,
+        position=pulse,
+        speed=25,
+        acceleration=3000,
+        deceleration=3000,
+    )
+
+
+# PR2: slow down to complete stop
+SLOW_DOWN_PROFILE = MotionProfile(
+    path=2,
+    mode=RELATIVE_POSITION_MODE,
+    position=0,
+    speed=4,
+    acceleration=12000,
+    deceleration=12000,
+)
@@ -0,0 +1,85 @@
+import logging
+import threading
+import time
+from typing import Union
+
+import numpy as np
+
+from store.state import state
+from utils.buffers import RingBuffer
+from utils.lockin import CHOPPER_PULSES_PER_REVOLUTION
+
+logger = logging.getLogger(__name__)
+
+
+class ChopperTelemetry:
+    """Timestamped chopper position stream.
+    Speed and phase are derived from the buffered positions without blocking Modbus calls.
+    """
+
+    def __init__(self, capacity: int = state.CHOPPER_MONITOR_POINTS):
+        self.buffer = RingBuffer(capacity, columns=2)  # time, position
+        self.lock = threading.Lock()
+
+    def clear(self) -> None:
+        with self.lock:
+            self.buffer.clear()
+
+    def poll(self, chopper) -> Union[int, None]:
+        t1 = time.time()
+        try:
+            position = chopper.get_actual_pos()
+        except Exception as e:
+            logger.error(f"[{self.__class__.__name__}.poll] {e}")
+            return None
+        t2 = time.time()
+        timestamp = (t1 + t2) / 2
+        with self.lock:
+            self.buffer.append((timestamp, position))
+        return position
+
+    def samples(self, duration: float = None) -> np.ndarray:
+        """Copy of (time, position) rows, optionally for the last duration seconds only"""
+        with self.lock:
+            data = self.buffer.view().copy()
+        if duration is not None and len(data):
+            data = data[data[:, 0] >= data[-1, 0] - duration]
+        return data
+
+    def speed(self, window: float = state.CHOPPER_SPEED_WINDOW) -> float:
+        """Least squares slope of position over the last window seconds, rev/s"""
+        data = self.samples(window)
+        if len(data) < 2:
+            return 0.0
+        t = data[:, 0] - data[:, 0].mean()
+        x = data[:, 1] - data[:, 1].mean()
+        denominator = np.sum(t * t)
+        if denominator == 0:
+            return 0.0
+        return float(np.sum(t * x) / denominator / CHOPPER_PULSES_PER_REVOLUTION)
+
+    def position_at(self, times, window: float = state.CHOPPER_SPEED_WINDOW):
+        """Chopper positions interpolated at times, extrapolated with the actual speed
+        beyond the last sample
+        """
+        data = self.samples()
+        times = np.asarray(times, dtype=float)
+        if not len(data):
+            return np.full(times.shape, np.nan)
+        positions = np.interp(times, data[:, 0], data[:, 1])
+        speed = self.speed(window) * CHOPPER_PULSES_PER_REVOLUTION
+        after = times > data[-1, 0]
+        positions[after] = data[-1, 1] + speed * (times[after] - data[-1, 0])
+        return positions
+
+    def phase(self, at: float = None) -> float:
+        """Chopper angle, degrees"""
+        at = time.time() if at is None else at
+        position = self.position_at([at])[0]
+        if np.isnan(position):
+            return np.nan
+        revolution = position % CHOPPER_PULSES_PER_REVOLUTION
+        return float(revolution / CHOPPER_PULSES_PER_REVOLUTION * 360)
+
+
+chopper_telemetry = ChopperTelemetry()
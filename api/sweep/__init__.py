@@ -0,0 +1,19 @@
+from api.sweep.adaptive import interval_loss, refinement_points
+from api.sweep.axes import (
+    Axis,
+    ChopperStateAxis,
+    KeithleyCurrentAxis,
+    NiCodeAxis,
+    NiFrequencyAxis,
+)
+from api.sweep.engine import SweepEngine
+from api.sweep.segments import SegmentedFrequencyAxis, SweepSegment, load_segments
+from api.sweep.sensors import (
+    BackgroundPointSensor,
+    ChopperLockInSensor,
+    KeithleyReadbackSensor,
+    NRXSensor,
+    Sensor,
+    SpectrumPeakSensor,
+)
+from api.sweep.tuning import TuningCorrections, YigTuner
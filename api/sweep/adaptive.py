@@ -0,0 +1,41 @@
+import numpy as np
+
+
+def interval_loss(x, y) -> np.ndarray:
+    """Refinement loss of every interval between neighbouring points.
+    Loss is the largest of the power step across the interval (slope)
+    and the deviations of its end points from the chord through their neighbours
+    (curvature), so both steep skirts and sharp passband corners are refined.
+    NaN power (failed readouts) makes the interval loss infinite.
+    """
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    loss = np.abs(np.diff(y))
+    if len(x) > 2:
+        chord = y[:-2] + (y[2:] - y[:-2]) * (x[1:-1] - x[:-2]) / (x[2:] - x[:-2])
+        deviation = np.zeros(len(x))
+        deviation[1:-1] = np.abs(y[1:-1] - chord)
+        loss = np.maximum(loss, np.maximum(deviation[:-1], deviation[1:]))
+    return np.where(np.isnan(loss), np.inf, loss)
+
+
+def refinement_points(
+    x, y, tolerance: float, budget: int, min_step: float = 0
+) -> np.ndarray:
+    """Midpoints of the intervals with loss above tolerance, worst intervals first.
+
+    :param x: measured points, sorted
+    :param y: measured values
+    :param tolerance: acceptable interval loss, same units as y
+    :param budget: maximum number of new points
+    :param min_step: intervals narrower than 2 * min_step are not split
+    :return: sorted new points
+    """
+    x = np.asarray(x, dtype=float)
+    if len(x) < 2 or budget <= 0:
+        return np.array([])
+    loss = interval_loss(x, y)
+    width = np.diff(x)
+    candidates = np.flatnonzero((loss > tolerance) & (width >= 2 * min_step))
+    candidates = candidates[np.argsort(loss[candidates])[::-1]][: int(budget)]
+    return np.sort((x[candidates] + x[candidates + 1]) / 2)
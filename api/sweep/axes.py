@@ -0,0 +1,140 @@
+import logging
+from typing import Sequence, Union
+
+import numpy as np
+
+from store.calibration import digital_calibration
+from store.state import state
+from utils.calibration import sweep_direction
+from utils.lockin import chopper_sector
+
+logger = logging.getLogger(__name__)
+
+
+class Axis:
+    """Swept parameter. Base axis doesn't touch any instrument (e.g. repeats)"""
+
+    def __init__(
+        self,
+        name: str,
+        values: Sequence,
+        settle: float = 0,
+        first_settle: float = 0,
+    ):
+        self.name = name
+        self.values = np.asarray(values)
+        self.settle = settle
+        self.first_settle = first_settle
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def settle_time(self, index: int) -> float:
+        if index == 0:
+            return self.settle + self.first_settle
+        return self.settle
+
+    @property
+    def max_samples(self) -> Union[int, None]:
+        return None
+
+    def point_samples(self, index: int) -> Union[int, None]:
+        """Samples count at the point if the axis limits it"""
+        return None
+
+    def prepare(self) -> None:
+        pass
+
+    def set(self, index: int) -> None:
+        pass
+
+    def finish(self) -> None:
+        pass
+
+
+class KeithleyCurrentAxis(Axis):
+    """Analog YIG current, A. Initial current is restored after the sweep"""
+
+    def __init__(self, keithley, values: Sequence, **kwargs):
+        super().__init__("current", values, **kwargs)
+        self.keithley = keithley
+        self.initial_current = None
+
+    def prepare(self) -> None:
+        self.initial_current = self.keithley.get_setted_current()
+
+    def set(self, index: int) -> None:
+        self.keithley.set_current(float(self.values[index]))
+
+    def finish(self) -> None:
+        if self.initial_current is not None:
+            self.keithley.set_current(self.initial_current)
+
+
+class NiCodeAxis(Axis):
+    """Digital YIG DAC code"""
+
+    def __init__(self, ni, values: Sequence, name: str = "point", **kwargs):
+        super().__init__(name, values, **kwargs)
+        self.ni = ni
+        self.codes = self.values
+
+    def set(self, index: int) -> None:
+        self.ni.write_task(int(self.codes[index]))
+
+
+class NiFrequencyAxis(NiCodeAxis):
+    """Digital YIG frequency, GHz. DAC codes for the whole grid are computed at once
+    on the calibration branch of the direction every point is approached from
+    """
+
+    def __init__(self, ni, values: Sequence, **kwargs):
+        super().__init__(ni, values, name="frequency", **kwargs)
+        codes = digital_calibration().control(
+            self.values * 1e9, direction=sweep_direction(self.values)
+        )
+        self.codes = np.clip(
+            np.round(codes),
+            state.DIGITAL_CALIBRATION_POINT_FROM,
+            state.DIGITAL_CALIBRATION_POINT_TO,
+        ).astype(int)
+
+
+class ChopperStateAxis(Axis):
+    """Chopper hot/cold position, every change is a step rotation.
+    The chopper is returned to the first state after the sweep.
+    With the reference (hot position, pulses) the initial state is taken
+    from the actual chopper position, otherwise the chopper is assumed to be hot.
+    """
+
+    def __init__(
+        self,
+        chopper,
+        values: Sequence = ("hot", "cold"),
+        reference: int = None,
+        **kwargs,
+    ):
+        super().__init__("chopper", values, **kwargs)
+        self.chopper = chopper
+        self.reference = reference
+        self.current = 0
+
+    def prepare(self) -> None:
+        self.current = 0
+        if self.reference is not None:
+            sector = chopper_sector(self.chopper.get_actual_pos(), self.reference)
+            self.current = int(sector) % len(self.values)
+
+    def set(self, index: int) -> None:
+        while self.current != index:
+            self.step()
+
+    def step(self) -> None:
+        if not self.chopper.path0():
+            logger.warning(
+                f"[{self.__class__.__name__}] Chopper motion is not completed"
+            )
+        self.current = (self.current + 1) % len(self.values)
+
+    def finish(self) -> None:
+        self.set(0)
@@ -0,0 +1,114 @@
+import logging
+import time
+from typing import Callable, List, Tuple
+
+import numpy as np
+
+from api.sweep.axes import Axis
+from api.sweep.sensors import Sensor
+from store.results import SweepResults
+from utils.classes import ProgressReporter
+
+logger = logging.getLogger(__name__)
+
+
+class SweepEngine:
+    """N-dimensional sweep over declarative axes with pluggable sensors.
+    Axes are nested in the given order (the first one is the outermost),
+    an axis is set only when its index changes.
+    Every sensor channel and the sample time are streamed into columnar results.
+    """
+
+    def __init__(
+        self,
+        axes: List[Axis],
+        sensors: List[Sensor],
+        samples: int = 1,
+        results: SweepResults = None,
+        is_running: Callable[[], bool] = None,
+        on_point: Callable[[Tuple, SweepResults], None] = None,
+        progress: Callable[[int], None] = None,
+        name: str = "Sweep",
+    ):
+        self.axes = axes
+        self.sensors = sensors
+        self.samples = samples
+        self.channels = [channel for sensor in sensors for channel in sensor.channels]
+        if results is None:
+            results = SweepResults(
+                axes={axis.name: axis.values for axis in axes},
+                samples=samples,
+                channels=self.channels + ["time"],
+            )
+        self.results = results
+        self.is_running = is_running or (lambda: True)
+        self.on_point = on_point
+        self.progress = ProgressReporter(
+            total=self.results.size, emit=progress, name=name
+        )
+
+    def run(self) -> SweepResults:
+        for axis in self.axes:
+            axis.prepare()
+        for sensor in self.sensors:
+            sensor.prepare()
+        try:
+            self.sweep()
+        finally:
+            for sensor in self.sensors:
+                sensor.finish()
+            for axis in reversed(self.axes):
+                axis.finish()
+        return self.results
+
+    def sweep(self) -> None:
+        current = [None] * len(self.axes)
+        for step, index in enumerate(np.ndindex(*self.results.shape), 1):
+            if not self.is_running():
+                break
+            if self.results.completed[index]:
+                # restored from a journal
+                continue
+            settle = 0
+            for axis_ind, (axis, value_ind) in enumerate(zip(self.axes, index)):
+                if current[axis_ind] == value_ind:
+                    continue
+                if current[axis_ind] is None:
+                    settle = max(settle, axis.settle + axis.first_settle)
+                else:
+                    settle = max(settle, axis.settle_time(value_ind))
+                axis.set(value_ind)
+                current[axis_ind] = value_ind
+            if settle:
+                time.sleep(settle)
+            self.measure_point(index)
+            self.results.complete(index)
+            if self.on_point is not None:
+                self.on_point(index, self.results)
+            self.progress.update(step, Point=index)
+
+    def measure_point(self, index: Tuple) -> None:
+        for sensor in self.sensors:
+            sensor.begin_point()
+        data = self.results.data
+        sample_sensors = [sensor for sensor in self.sensors if not sensor.per_point]
+        start = time.time()
+        for sample in range(self.point_samples(index)):
+            for sensor in sample_sensors:
+                self.store(index + (sample,), sensor.channels, sensor.read())
+            if "time" in data:
+                data["time"][index + (sample,)] = time.time() - start
+        for sensor in self.sensors:
+            if sensor.per_point:
+                self.store(index + (0,), sensor.channels, sensor.end_point())
+
+    def store(self, index: Tuple, channels: Tuple[str, ...], values: Tuple) -> None:
+        for channel, value in zip(channels, values):
+            self.results.data[channel][index] = np.nan if value is None else value
+
+    def point_samples(self, index: Tuple) -> int:
+        samples = [
+            axis.point_samples(value_ind) for axis, value_ind in zip(self.axes, index)
+        ]
+        samples = [count for count in samples if count is not None]
+        return min(samples + [self.samples, self.results.samples])
@@ -0,0 +1,98 @@
+import logging
+from typing import List, Sequence, Union
+
+import numpy as np
+import pandas as pd
+
+from api.sweep.axes import NiFrequencyAxis
+from store.state import state
+
+logger = logging.getLogger(__name__)
+
+
+class SweepSegment:
+    """Frequency range with its own point density, NRX averaging and aperture"""
+
+    COLUMNS = ("start", "stop", "points", "nrx_points", "aperture_time")
+
+    def __init__(
+        self,
+        start: float,
+        stop: float,
+        points: int,
+        nrx_points: int = state.NRX_POINTS,
+        aperture_time: float = state.NRX_APER_TIME,
+    ):
+        self.start = float(start)
+        self.stop = float(stop)
+        self.points = int(points)
+        self.nrx_points = int(nrx_points)
+        self.aperture_time = float(aperture_time)
+
+    def __repr__(self) -> str:
+        return (
+            f"{self.__class__.__name__}({self.start}-{self.stop} GHz, "
+            f"{self.points} points, {self.nrx_points} x {self.aperture_time} s)"
+        )
+
+    def frequencies(self) -> np.ndarray:
+        return np.linspace(self.start, self.stop, self.points)
+
+
+def load_segments(filepath: str) -> List[SweepSegment]:
+    """Segments from CSV with columns start, stop (GHz), points,
+    nrx_points and aperture_time (s), the last two are optional
+    """
+    table = pd.read_csv(filepath)
+    missing = {"start", "stop", "points"} - set(table.columns)
+    if missing:
+        raise ValueError(f"Segments file has no columns {', '.join(sorted(missing))}")
+    columns = [column for column in SweepSegment.COLUMNS if column in table.columns]
+    return [SweepSegment(**row) for row in table[columns].to_dict("records")]
+
+
+class SegmentedFrequencyAxis(NiFrequencyAxis):
+    """Digital YIG frequency over a table of segments.
+    NRX aperture is changed only when a new segment starts,
+    a point shared by adjacent segments is measured once.
+    """
+
+    def __init__(self, ni, segments: Sequence[SweepSegment], nrx=None, **kwargs):
+        values = []
+        segment_index = []
+        for ind, segment in enumerate(segments):
+            frequencies = segment.frequencies()
+            if values and len(frequencies) and np.isclose(frequencies[0], values[-1]):
+                frequencies = frequencies[1:]
+            values.extend(frequencies)
+            segment_index.extend([ind] * len(frequencies))
+        super().__init__(ni, values, **kwargs)
+        self.segments = list(segments)
+        self.segment_index = np.array(segment_index, dtype=int)
+        self.samples = np.array(
+            [self.segments[ind].nrx_points for ind in self.segment_index], dtype=int
+        )
+        self.nrx = nrx
+        self.current_segment = None
+
+    @property
+    def max_samples(self) -> Union[int, None]:
+        return int(self.samples.max()) if len(self.samples) else None
+
+    def point_samples(self, index: int) -> Union[int, None]:
+        return int(self.samples[index])
+
+    def prepare(self) -> None:
+        self.current_segment = None
+
+    def set(self, index: int) -> None:
+        segment = self.segment_index[index]
+        if segment != self.current_segment and self.nrx is not None:
+            self.nrx.set_aperture_time(self.segments[segment].aperture_time)
+            logger.info(f"[{self.__class__.__name__}.set] {self.segments[segment]}")
+        self.current_segment = segment
+        super().set(index)
+
+    def finish(self) -> None:
+        if self.nrx is not None and self.current_segment is not None:
+            self.nrx.set_aperture_time(state.NRX_APER_TIME)
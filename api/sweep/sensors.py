@@ -0,0 +1,137 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Tuple
+
+import numpy as np
+
+from api.Chopper.telemetry import chopper_telemetry
+from store.state import state
+
+
+class Sensor:
+    """Instrument readout, read() returns one value per channel.
+    A per_point sensor isn't read per sample, end_point() returns its values once
+    per point instead.
+    """
+
+    channels: Tuple[str, ...] = ()
+    per_point = False
+
+    def prepare(self) -> None:
+        pass
+
+    def begin_point(self) -> None:
+        pass
+
+    def read(self) -> Tuple:
+        raise NotImplementedError
+
+    def end_point(self) -> Tuple:
+        return ()
+
+    def finish(self) -> None:
+        pass
+
+
+class NRXSensor(Sensor):
+    """NRX power, optionally averaged over several readouts"""
+
+    channels = ("power",)
+
+    def __init__(self, nrx, points: int = 1):
+        self.nrx = nrx
+        self.points = int(points)
+
+    def read(self) -> Tuple:
+        if self.points == 1:
+            return (self.nrx.get_power(),)
+        power = [self.nrx.get_power() for _ in range(self.points)]
+        power = np.array(power, dtype=float)
+        if np.isnan(power).all():
+            return (None,)
+        return (float(np.nanmean(power)),)
+
+
+class SpectrumPeakSensor(Sensor):
+    channels = ("peak_power", "peak_freq")
+
+    def __init__(self, spectrum):
+        self.spectrum = spectrum
+
+    def read(self) -> Tuple:
+        self.spectrum.peak_search()
+        return self.spectrum.get_peak_power(), self.spectrum.get_peak_freq()
+
+
+class KeithleyReadbackSensor(Sensor):
+    channels = ("current_get", "voltage_get")
+
+    def __init__(self, keithley):
+        self.keithley = keithley
+
+    def read(self) -> Tuple:
+        return self.keithley.get_current(), self.keithley.get_voltage()
+
+
+class ChopperLockInSensor(Sensor):
+    """NRX power with chopper positions at the start and the stop of every sample.
+    Positions are taken from the chopper telemetry while it's running.
+    """
+
+    channels = ("power", "position_start", "position_stop")
+
+    def __init__(self, nrx, chopper):
+        self.nrx = nrx
+        self.chopper = chopper
+        self.position = None
+
+    def begin_point(self) -> None:
+        if not state.CHOPPER_MONITOR:
+            self.position = self.chopper.get_actual_pos()
+
+    def read(self) -> Tuple:
+        t_start = time.time()
+        power = self.nrx.get_power()
+        t_stop = time.time()
+        if state.CHOPPER_MONITOR:
+            start, stop = chopper_telemetry.position_at([t_start, t_stop])
+        else:
+            start = self.position
+            stop = self.chopper.get_actual_pos()
+            self.position = stop
+        return power, start, stop
+
+
+class BackgroundPointSensor(Sensor):
+    """Reads a sensor once per point in its own I/O worker: the read is started
+    at begin_point and joined at end_point, so it overlaps the sample block
+    of the other sensors and a point takes as long as the slowest instrument.
+    Values are stored in the first sample of the point.
+    """
+
+    per_point = True
+
+    def __init__(self, sensor: Sensor):
+        self.sensor = sensor
+        self.channels = sensor.channels
+        self.executor = None
+        self.future = None
+
+    def prepare(self) -> None:
+        self.sensor.prepare()
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="sensor")
+
+    def begin_point(self) -> None:
+        self.sensor.begin_point()
+        self.future = self.executor.submit(self.sensor.read)
+
+    def end_point(self) -> Tuple:
+        future, self.future = self.future, None
+        return future.result()
+
+    def finish(self) -> None:
+        if self.executor is not None:
+            self.executor.shutdown(wait=True)
+            self.executor = None
+        self.future = None
+        self.sensor.finish()
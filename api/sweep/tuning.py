@@ -0,0 +1,176 @@
+import json
+import logging
+import os
+import time
+from typing import Callable, Dict, List, Tuple
+
+import numpy as np
+
+from api.sweep.sensors import SpectrumPeakSensor
+from store.state import state
+
+logger = logging.getLogger(__name__)
+
+
+class TuningCorrections:
+    """Converged control value corrections (actual - predicted) per frequency.
+    The correction for a new frequency is interpolated between the cached ones,
+    corrections are kept in a JSON file when a path is given.
+    """
+
+    def __init__(self, path: str = None):
+        self.path = path
+        self.frequency = np.empty(0)
+        self.correction = np.empty(0)
+        if path and os.path.exists(path):
+            self.load()
+
+    def __len__(self) -> int:
+        return len(self.frequency)
+
+    def __call__(self, frequency: float) -> float:
+        if not len(self):
+            return 0.0
+        return float(np.interp(frequency, self.frequency, self.correction))
+
+    def add(self, frequency: float, correction: float) -> None:
+        """Insert or replace the correction at frequency"""
+        index = np.searchsorted(self.frequency, frequency)
+        if index < len(self) and self.frequency[index] == frequency:
+            self.correction[index] = correction
+        else:
+            self.frequency = np.insert(self.frequency, index, frequency)
+            self.correction = np.insert(self.correction, index, correction)
+        if self.path:
+            self.save()
+
+    def clear(self) -> None:
+        self.frequency = np.empty(0)
+        self.correction = np.empty(0)
+        if self.path and os.path.exists(self.path):
+            os.remove(self.path)
+
+    def load(self) -> None:
+        with open(self.path, "r", encoding="utf-8") as file:
+            data = json.load(file)
+        self.frequency = np.asarray(data["frequency"], dtype=float)
+        self.correction = np.asarray(data["correction"], dtype=float)
+
+    def save(self) -> None:
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(self.path, "w", encoding="utf-8") as file:
+            json.dump(
+                {
+                    "frequency": self.frequency.tolist(),
+                    "correction": self.correction.tolist(),
+                },
+                file,
+            )
+
+
+class YigTuner:
+    """Closed loop YIG tuning with spectrum peak feedback.
+    The predicted control value (calibration plus cached correction) is set first,
+    then the value is updated with secant steps on the measured peak frequency
+    until it is within tolerance. The first step uses the calibration slope.
+    Every value is approached from below (from approach Hz lower when moving down),
+    so all steps stay on the same hysteresis branch.
+    Control values are rounded to quantum (1 for DAC codes) and clipped to limits.
+    """
+
+    def __init__(
+        self,
+        set_value: Callable[[float], None],
+        sensor: SpectrumPeakSensor,
+        predict: Callable[[float], float],
+        slope: float,
+        corrections: TuningCorrections = None,
+        tolerance: float = state.YIG_TUNE_TOLERANCE,
+        max_steps: int = state.YIG_TUNE_MAX_STEPS,
+        settle: float = state.YIG_TUNE_SETTLE,
+        quantum: float = None,
+        limits: Tuple[float, float] = (-np.inf, np.inf),
+        approach: float = state.YIG_TUNE_APPROACH,
+    ):
+        self.set_value = set_value
+        self.sensor = sensor
+        self.predict = predict
+        self.slope = slope
+        self.corrections = TuningCorrections() if corrections is None else corrections
+        self.tolerance = tolerance
+        self.max_steps = max_steps
+        self.settle = settle
+        self.quantum = quantum
+        self.limits = limits
+        self.approach = approach
+        self.last_value = None
+
+    def control(self, value: float) -> float:
+        value = float(np.clip(value, *self.limits))
+        if self.quantum:
+            value = round(value / self.quantum) * self.quantum
+        return value
+
+    def set(self, value: float) -> None:
+        if self.last_value is None or value < self.last_value:
+            self.set_value(self.control(value - self.approach * self.slope))
+            time.sleep(self.settle)
+        self.set_value(value)
+        self.last_value = value
+
+    def measure(self, value: float) -> float:
+        self.set(value)
+        time.sleep(self.settle)
+        _, frequency = self.sensor.read()
+        return np.nan if frequency is None else float(frequency)
+
+    def tune(self, frequency: float) -> Dict:
+        """Tune to frequency, Hz. History holds (control value, peak frequency) steps.
+        Without convergence the control value closest to the target is left set.
+        """
+        predicted = self.predict(frequency)
+        value = self.control(predicted + self.corrections(frequency))
+        history: List[Tuple[float, float]] = []
+        converged = False
+        for step in range(self.max_steps):
+            measured = self.measure(value)
+            history.append((value, measured))
+            logger.info(
+                f"[{self.__class__.__name__}.tune][Step {step + 1}] "
+                f"value {value}; peak {measured}; target {frequency}"
+            )
+            if np.isnan(measured):
+                break
+            error = frequency - measured
+            if abs(error) <= self.tolerance:
+                converged = True
+                break
+            slope = self.slope
+            if len(history) > 1:
+                prev_value, prev_measured = history[-2]
+                if measured != prev_measured and not np.isnan(prev_measured):
+                    slope = (value - prev_value) / (measured - prev_measured)
+                if not slope > 0:
+                    slope = self.slope
+            next_value = self.control(value + slope * error)
+            if next_value == value:
+                break
+            value = next_value
+
+        errors = [abs(frequency - measured) for _, measured in history]
+        best = history[int(np.nanargmin(errors))] if np.isfinite(errors).any() else None
+        if converged:
+            self.corrections.add(frequency, best[0] - predicted)
+        elif best is not None and best[0] != history[-1][0]:
+            self.set(best[0])
+        value, measured = best if best is not None else (value, np.nan)
+        return {
+            "frequency": frequency,
+            "value": value,
+            "peak_freq": measured,
+            "steps": len(history),
+            "converged": converged,
+            "history": history,
+        }
@@ -0,0 +1,156 @@
+from typing import Sequence, Tuple, Union
+
+import numpy as np
+import pyqtgraph as pg
+from PyQt6.QtCore import QPointF, QRectF, Qt, pyqtSignal
+
+
+class MultiCurveItem(pg.GraphicsObject):
+    """Many curves drawn by a few PlotCurveItems.
+    Curves are colour mapped by index into bins, the curves of one bin are
+    concatenated into one array with a connect mask breaking the line between curves.
+    The curve nearest to the mouse is highlighted, a click isolates it.
+    """
+
+    sigCurveHovered = pyqtSignal(object)
+
+    def __init__(
+        self,
+        colormap: str = "viridis",
+        bins: int = 32,
+        tolerance: float = 8,
+        parent=None,
+    ):
+        super().__init__(parent)
+        self.bins = int(bins)
+        self.tolerance = tolerance
+        self.colors = pg.colormap.get(colormap).map(
+            np.linspace(0, 1, self.bins), mode="qcolor"
+        )
+        self.items = []
+        for color in self.colors:
+            item = pg.PlotCurveItem(pen=pg.mkPen(color))
+            item.setParentItem(self)
+            self.items.append(item)
+        self.highlight = pg.PlotCurveItem()
+        self.highlight.setParentItem(self)
+        self.highlight.setZValue(1)
+        self.x = np.empty(0)
+        self.y = np.empty(0)
+        self.index = np.empty(0, dtype=int)
+        self.count = 0
+        self.rect = QRectF()
+        self.highlighted = None
+        self.isolated = False
+        self.setAcceptHoverEvents(True)
+
+    def boundingRect(self) -> QRectF:
+        return QRectF(self.rect)
+
+    def paint(self, *args) -> None:
+        pass
+
+    def dataBounds(self, ax: int, frac: float = 1.0, orthoRange=None):
+        values = self.x if ax == 0 else self.y
+        if not len(values):
+            return None, None
+        return float(values.min()), float(values.max())
+
+    def curveBins(self) -> np.ndarray:
+        return np.round(
+            np.arange(self.count) / max(self.count - 1, 1) * (self.bins - 1)
+        ).astype(int)
+
+    def setCurves(self, curves: Sequence[Tuple[Sequence, Sequence]]) -> None:
+        xs, ys, indexes = [], [], []
+        for index, (x, y) in enumerate(curves):
+            x = np.asarray(x, dtype=float)
+            y = np.asarray(y, dtype=float)
+            finite = np.isfinite(x) & np.isfinite(y)
+            xs.append(x[finite])
+            ys.append(y[finite])
+            indexes.append(np.full(np.count_nonzero(finite), index))
+        self.count = len(curves)
+        self.x = np.concatenate(xs) if xs else np.empty(0)
+        self.y = np.concatenate(ys) if ys else np.empty(0)
+        self.index = np.concatenate(indexes) if indexes else np.empty(0, dtype=int)
+
+        point_bins = self.curveBins()[self.index]
+        order = np.argsort(point_bins, kind="stable")
+        edges = np.searchsorted(point_bins[order], np.arange(self.bins + 1))
+        for color_bin, item in enumerate(self.items):
+            points = order[edges[color_bin] : edges[color_bin + 1]]
+            index = self.index[points]
+            connect = np.append(index[1:] == index[:-1], False)
+            item.setData(self.x[points], self.y[points], connect=connect)
+
+        self.prepareGeometryChange()
+        if len(self.x):
+            self.rect = QRectF(
+                self.x.min(),
+                self.y.min(),
+                self.x.max() - self.x.min(),
+                self.y.max() - self.y.min(),
+            )
+        else:
+            self.rect = QRectF()
+        highlighted = self.highlighted
+        self.highlighted = None
+        if highlighted is not None and highlighted < self.count:
+            self.setHighlighted(highlighted)
+        else:
+            self.setIsolated(False)
+            self.sigCurveHovered.emit(None)
+
+    def curveAt(self, pos: QPointF) -> Union[int, None]:
+        """Index of the curve with a point within tolerance pixels of pos"""
+        pixel_width, pixel_height = self.pixelWidth(), self.pixelHeight()
+        if not len(self.x) or not pixel_width or not pixel_height:
+            return None
+        distance = ((self.x - pos.x()) / pixel_width) ** 2 + (
+            (self.y - pos.y()) / pixel_height
+        ) ** 2
+        nearest = int(np.argmin(distance))
+        if distance[nearest] > self.tolerance**2:
+            return None
+        return int(self.index[nearest])
+
+    def setHighlighted(self, index: Union[int, None]) -> None:
+        if index == self.highlighted:
+            return
+        self.highlighted = index
+        if index is None:
+            self.highlight.setData([], [])
+        else:
+            curve = self.index == index
+            color = self.colors[self.curveBins()[index]]
+            self.highlight.setPen(pg.mkPen(color, width=3))
+            self.highlight.setData(self.x[curve], self.y[curve])
+        self.sigCurveHovered.emit(index)
+
+    def setIsolated(self, isolated: bool) -> None:
+        self.isolated = isolated
+        for item in self.items:
+            item.setOpacity(0.1 if isolated else 1)
+
+    def hoverEvent(self, ev) -> None:
+        if self.isolated:
+            return
+        if ev.isExit():
+            self.setHighlighted(None)
+            return
+        self.setHighlighted(self.curveAt(ev.pos()))
+
+    def mouseClickEvent(self, ev) -> None:
+        if ev.button() != Qt.MouseButton.LeftButton:
+            ev.ignore()
+            return
+        if self.isolated:
+            self.setIsolated(False)
+            self.setHighlighted(self.curveAt(ev.pos()))
+        elif self.highlighted is not None:
+            self.setIsolated(True)
+        else:
+            ev.ignore()
+            return
+        ev.accept()
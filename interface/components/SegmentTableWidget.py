@@ -0,0 +1,69 @@
+import logging
+from typing import List
+
+from PyQt6 import QtWidgets
+from PyQt6.QtWidgets import QTableWidgetItem
+
+from api.sweep.segments import SweepSegment
+from store.state import state
+
+logger = logging.getLogger(__name__)
+
+
+class SegmentTableWidget(QtWidgets.QTableWidget):
+    """Editable table of frequency sweep segments"""
+
+    HEADERS = ("Start, GHz", "Stop, GHz", "Points", "Power points", "Aperture, s")
+
+    def __init__(self, parent: QtWidgets.QWidget = None):
+        super().__init__(0, len(self.HEADERS), parent)
+        self.setHorizontalHeaderLabels(self.HEADERS)
+        self.horizontalHeader().setSectionResizeMode(
+            QtWidgets.QHeaderView.ResizeMode.Stretch
+        )
+        self.setMinimumHeight(150)
+
+    def addSegment(self, segment: SweepSegment = None) -> None:
+        if segment is None:
+            segment = SweepSegment(
+                start=state.NI_FREQ_FROM,
+                stop=state.NI_FREQ_TO,
+                points=state.NI_FREQ_POINTS,
+                nrx_points=state.NRX_POINTS,
+                aperture_time=state.NRX_APER_TIME,
+            )
+        row = self.rowCount()
+        self.insertRow(row)
+        values = (
+            segment.start,
+            segment.stop,
+            segment.points,
+            segment.nrx_points,
+            segment.aperture_time,
+        )
+        for column, value in enumerate(values):
+            self.setItem(row, column, QTableWidgetItem(str(value)))
+
+    def removeSelectedSegments(self) -> None:
+        rows = sorted({index.row() for index in self.selectedIndexes()}, reverse=True)
+        for row in rows:
+            self.removeRow(row)
+
+    def setSegments(self, segments: List[SweepSegment]) -> None:
+        self.setRowCount(0)
+        for segment in segments:
+            self.addSegment(segment)
+
+    def segments(self) -> List[SweepSegment]:
+        """Segments from the table, invalid rows are skipped"""
+        segments = []
+        for row in range(self.rowCount()):
+            values = [
+                self.item(row, column).text() if self.item(row, column) else ""
+                for column in range(self.columnCount())
+            ]
+            try:
+                segments.append(SweepSegment(*(float(value) for value in values)))
+            except ValueError as e:
+                logger.error(f"[{self.__class__.__name__}.segments][Row {row + 1}] {e}")
+        return segments
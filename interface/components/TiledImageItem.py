@@ -0,0 +1,97 @@
+from typing import Sequence, Tuple
+
+import numpy as np
+import pyqtgraph as pg
+from PyQt6.QtCore import QRectF, pyqtSignal
+
+
+def axis_span(values: Sequence) -> Tuple[float, float]:
+    """Start and width of an image axis with half a step margin at both sides"""
+    values = np.asarray(values, dtype=float)
+    step = (values[-1] - values[0]) / (len(values) - 1) if len(values) > 1 else 1
+    return values[0] - step / 2, step * len(values)
+
+
+class TiledImageItem(pg.GraphicsObject):
+    """Image split into bands of rows, every band is a separate ImageItem.
+    Updating rows re-renders only the bands they belong to,
+    so a large image is filled progressively without re-uploading the whole frame.
+    Color levels only grow, a level change re-renders all bands.
+    """
+
+    sigLevelsChanged = pyqtSignal(tuple)
+
+    def __init__(
+        self,
+        shape: Tuple[int, int],
+        rect: QRectF = None,
+        tile_rows: int = 32,
+        colormap: str = "viridis",
+        parent=None,
+    ):
+        super().__init__(parent)
+        self.shape = tuple(int(size) for size in shape)
+        self.tile_rows = int(tile_rows)
+        self.data = np.full(self.shape, np.nan, dtype=np.float32)
+        self.tiles = {}
+        self.colormap = pg.colormap.get(colormap)
+        self.lut = self.colormap.getLookupTable(nPts=256)
+        self.levels = None
+        self.rect = QRectF(0, 0, self.shape[1], self.shape[0]) if rect is None else rect
+
+    def boundingRect(self) -> QRectF:
+        return QRectF(self.rect)
+
+    def paint(self, *args) -> None:
+        pass
+
+    def setRows(self, start: int, rows: Sequence) -> None:
+        rows = np.asarray(rows, dtype=np.float32).reshape(-1, self.shape[1])
+        stop = start + len(rows)
+        self.data[start:stop] = rows
+        if self.updateLevels(rows):
+            tiles = set(self.tiles.keys())
+        else:
+            tiles = set()
+        tiles.update(range(start // self.tile_rows, (stop - 1) // self.tile_rows + 1))
+        for tile in sorted(tiles):
+            self.renderTile(tile)
+
+    def updateLevels(self, rows: np.ndarray) -> bool:
+        finite = rows[np.isfinite(rows)]
+        if not finite.size:
+            return False
+        low, high = float(finite.min()), float(finite.max())
+        if self.levels is not None:
+            if low >= self.levels[0] and high <= self.levels[1]:
+                return False
+            low = min(low, self.levels[0])
+            high = max(high, self.levels[1])
+        # margin to avoid re-rendering all bands on every slightly larger value
+        margin = 0.05 * (high - low) or 0.5
+        self.levels = (low - margin, high + margin)
+        self.sigLevelsChanged.emit(self.levels)
+        return True
+
+    def tileRect(self, tile: int) -> QRectF:
+        row_height = self.rect.height() / self.shape[0]
+        start = tile * self.tile_rows
+        stop = min(start + self.tile_rows, self.shape[0])
+        return QRectF(
+            self.rect.x(),
+            self.rect.y() + start * row_height,
+            self.rect.width(),
+            (stop - start) * row_height,
+        )
+
+    def renderTile(self, tile: int) -> None:
+        start = tile * self.tile_rows
+        image = self.data[start : start + self.tile_rows]
+        item = self.tiles.get(tile)
+        if item is None:
+            item = pg.ImageItem(axisOrder="row-major")
+            item.setParentItem(self)
+            item.setLookupTable(self.lut)
+            self.tiles[tile] = item
+        item.setImage(image, autoLevels=False, levels=self.levels)
+        item.setRect(self.tileRect(tile))
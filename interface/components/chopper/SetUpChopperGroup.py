@@ -1,7 +1,17 @@
+import time
+
 from PyQt6.QtCore import QThread, pyqtSignal
-from PyQt6.QtWidgets import QGroupBox, QFormLayout, QLineEdit, QLabel, QComboBox
+from PyQt6.QtWidgets import (
+    QGroupBox,
+    QFormLayout,
+    QLineEdit,
+    QLabel,
+    QComboBox,
+    QCheckBox,
+)
 
 from api.Chopper import chopper_manager
+from api.Chopper.telemetry import chopper_telemetry
 from interface.components.ui.Button import Button
 from settings import NOT_INITIALIZED, WAVESHARE_ETHERNET, SERIAL_USB
 from store.state import state
@@ -21,6 +31,39 @@ class ChopperThread(QThread):
         self.finished.emit()
 
 
+class ChopperMonitorThread(QThread):
+    telemetry = pyqtSignal(dict)
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.running = True
+
+    def run(self):
+        chopper = chopper_manager.chopper
+        chopper_telemetry.clear()
+        last_emit = 0
+        while self.running and state.CHOPPER_MONITOR:
+            position = chopper_telemetry.poll(chopper)
+            now = time.time()
+            if position is not None and now - last_emit >= (
+                state.CHOPPER_MONITOR_EMIT_INTERVAL
+            ):
+                self.telemetry.emit(
+                    {
+                        "position": position,
+                        "speed": chopper_telemetry.speed(),
+                        "phase": chopper_telemetry.phase(now),
+                    }
+                )
+                last_emit = now
+            time.sleep(state.CHOPPER_MONITOR_INTERVAL)
+        self.finished.emit()
+
+    def stop(self) -> None:
+        self.running = False
+        self.wait()
+
+
 class SetupChopperGroup(QGroupBox):
     def __init__(self, parent):
         super().__init__(parent)
@@ -37,12 +80,24 @@ class SetupChopperGroup(QGroupBox):
         self.chopperStatus.setText(NOT_INITIALIZED)
         self.btnInitChopper = Button("Initialize", animate=True)
         self.btnInitChopper.clicked.connect(self.initializeChopper)
+        self.chopperMonitor = QCheckBox(self)
+        self.chopperMonitor.setText("Monitor position")
+        self.chopperMonitor.setChecked(state.CHOPPER_MONITOR)
+        self.chopperMonitor.stateChanged.connect(self.monitorChanged)
+        self.chopperSpeed = QLabel(self)
+        self.chopperSpeed.setText("0.0")
+        self.chopperPhase = QLabel(self)
+        self.chopperPhase.setText("0.0")
+        self.chopper_monitor_thread = None
 
         layout.addRow("Adapter:", self.adapter)
         layout.addRow("Host:", self.chopperHost)
         layout.addRow("Port:", self.chopperPort)
         layout.addRow("Status:", self.chopperStatus)
         layout.addRow(self.btnInitChopper)
+        layout.addRow(self.chopperMonitor)
+        layout.addRow("Speed, Hz:", self.chopperSpeed)
+        layout.addRow("Angle, deg:", self.chopperPhase)
 
         self.setLayout(layout)
 
@@ -57,6 +112,22 @@ class SetupChopperGroup(QGroupBox):
         self.chopper_thread.status.connect(self.setStatus)
         self.chopper_thread.start()
 
+    def monitorChanged(self):
+        state.CHOPPER_MONITOR = self.chopperMonitor.isChecked()
+        if not state.CHOPPER_MONITOR:
+            return
+        if self.chopper_monitor_thread is not None:
+            # the previous poller may still be in its last request after unchecking,
+            # only one thread polls the shared Modbus link
+            self.chopper_monitor_thread.stop()
+        self.chopper_monitor_thread = ChopperMonitorThread()
+        self.chopper_monitor_thread.telemetry.connect(self.setTelemetry)
+        self.chopper_monitor_thread.start()
+
+    def setTelemetry(self, telemetry: dict):
+        self.chopperSpeed.setText(f"{round(telemetry.get('speed'), 3)}")
+        self.chopperPhase.setText(f"{round(telemetry.get('phase'), 1)}")
+
     def setStatus(self, status: bool = False):
         if status:
             self.chopperStatus.setText("Ok")
@@ -1,5 +1,6 @@
+import json
 import logging
-import time
+from typing import Tuple
 
 import numpy as np
 import pandas as pd
@@ -16,12 +17,21 @@ from PyQt6.QtWidgets import (
 
 from api.keithley_power_supply import KeithleyBlock
 from api.rs_fsek30 import SpectrumBlock
+from api.sweep import (
+    KeithleyCurrentAxis,
+    KeithleyReadbackSensor,
+    SpectrumPeakSensor,
+    SweepEngine,
+)
 from interface.components.ui.Button import Button
 from interface.components.ui.DoubleSpinBox import DoubleSpinBox
 from interface.components.ui.GroupBox import GroupBox
+from store.calibration import analog_calibration
+from store.results import SweepResults
 from store.state import state
 from interface.windows.calibrationGraphWindow import CalibrationGraphWindow
-from utils.functions import linear, linear_fit, truncate_path
+from utils.calibration import CalibrationModel
+from utils.functions import linear_fit, truncate_path
 
 logger = logging.getLogger(__name__)
 
@@ -38,139 +48,56 @@ class CalibrateWorker(QObject):
         s_block = SpectrumBlock(
             prologix_ip=state.PROLOGIX_IP, address=state.SPECTRUM_ADDRESS
         )
-
-        results = {
-            "current_set": [],
-            "current_get": [],
-            "voltage_get": [],
-            "power": [],
-            "freq": [],
-        }
-        current_range = list(
-            np.linspace(
-                state.KEITHLEY_CURRENT_FROM,
-                state.KEITHLEY_CURRENT_TO,
-                int(state.KEITHLEY_CURRENT_POINTS),
-            )
-        )
-        current_range.extend(
-            list(
+        current_range = np.concatenate(
+            (
                 np.linspace(
-                    state.KEITHLEY_CURRENT_TO,
                     state.KEITHLEY_CURRENT_FROM,
+                    state.KEITHLEY_CURRENT_TO,
                     int(state.KEITHLEY_CURRENT_POINTS),
-                )
-            )
-        )
-
-        initial_current = dc_block.get_setted_current()
-
-        for step, current in enumerate(current_range, 1):
-            if not state.CALIBRATION_MEAS:
-                break
-            dc_block.set_current(current)
-            time.sleep(state.CALIBRATION_STEP_DELAY)
-            if step == 1:
-                time.sleep(0.4)
-            current_get = dc_block.get_current()
-            voltage_get = dc_block.get_voltage()
-            s_block.peak_search()
-            power = s_block.get_peak_power()
-            freq = s_block.get_peak_freq()
-            results["current_set"].append(current)
-            results["current_get"].append(current_get)
-            results["voltage_get"].append(voltage_get)
-            results["power"].append(power)
-            results["freq"].append(freq)
-
-            self.stream_result.emit(
-                {
-                    "x": [current_get],
-                    "y": [freq],
-                    "new_plot": step == 1,
-                }
-            )
-
-            proc = round(step / state.KEITHLEY_CURRENT_POINTS * 100, 2)
-            logger.info(f"[{proc} %]")
-
-        dc_block.set_current(initial_current)
-        self.results.emit(results)
-        self.finished.emit()
-
-
-class CalibrateDigitalWorker(QObject):
-    finished = pyqtSignal()
-    results = pyqtSignal(dict)
-    stream_result = pyqtSignal(dict)
-
-    def run(self):
-        dc_block = KeithleyBlock(
-            prologix_ip=state.PROLOGIX_IP, address=state.KEITHLEY_ADDRESS
-        )
-        s_block = SpectrumBlock(
-            prologix_ip=state.PROLOGIX_IP, address=state.SPECTRUM_ADDRESS
-        )
-
-        results = {
-            "current_set": [],
-            "current_get": [],
-            "voltage_get": [],
-            "power": [],
-            "freq": [],
-        }
-        current_range = list(
-            np.linspace(
-                state.KEITHLEY_CURRENT_FROM,
-                state.KEITHLEY_CURRENT_TO,
-                int(state.KEITHLEY_CURRENT_POINTS),
-            )
-        )
-        current_range.extend(
-            list(
+                ),
                 np.linspace(
                     state.KEITHLEY_CURRENT_TO,
                     state.KEITHLEY_CURRENT_FROM,
                     int(state.KEITHLEY_CURRENT_POINTS),
-                )
+                ),
             )
         )
-
-        initial_current = dc_block.get_setted_current()
-
-        for step, current in enumerate(current_range, 1):
-            if not state.CALIBRATION_MEAS:
-                break
-            dc_block.set_current(current)
-            time.sleep(state.CALIBRATION_STEP_DELAY)
-            if step == 1:
-                time.sleep(0.4)
-            current_get = dc_block.get_current()
-            voltage_get = dc_block.get_voltage()
-            s_block.peak_search()
-            power = s_block.get_peak_power()
-            freq = s_block.get_peak_freq()
-            results["current_set"].append(current)
-            results["current_get"].append(current_get)
-            results["voltage_get"].append(voltage_get)
-            results["power"].append(power)
-            results["freq"].append(freq)
-
-            self.stream_result.emit(
-                {
-                    "x": [current_get],
-                    "y": [freq],
-                    "new_plot": step == 1,
-                }
-            )
-
-            proc = round(step / state.KEITHLEY_CURRENT_POINTS * 100, 2)
-            logger.info(f"[{proc} %]")
-
-        dc_block.set_current(initial_current)
-        self.results.emit(results)
+        engine = SweepEngine(
+            axes=[
+                KeithleyCurrentAxis(
+                    dc_block,
+                    current_range,
+                    settle=state.CALIBRATION_STEP_DELAY,
+                    first_settle=0.4,
+                )
+            ],
+            sensors=[KeithleyReadbackSensor(dc_block), SpectrumPeakSensor(s_block)],
+            is_running=lambda: state.CALIBRATION_MEAS,
+            on_point=self.emit_point,
+            name=self.__class__.__name__,
+        )
+        results = engine.run()
+        done = results.completed
+        self.results.emit(
+            {
+                "current_set": current_range[done].tolist(),
+                "current_get": results.data["current_get"][done, 0].tolist(),
+                "voltage_get": results.data["voltage_get"][done, 0].tolist(),
+                "power": results.data["peak_power"][done, 0].tolist(),
+                "freq": results.data["peak_freq"][done, 0].tolist(),
+            }
+        )
         self.finished.emit()
 
+    def emit_point(self, index: Tuple, results: SweepResults):
+        self.stream_result.emit(
+            {
+                "x": [results.data["current_get"][index + (0,)]],
+                "y": [results.data["peak_freq"][index + (0,)]],
+                "new_plot": index[0] == 0,
+            }
+        )
+
 
 class CalibrationTabWidget(QScrollArea):
     def __init__(self, parent):
@@ -268,9 +195,14 @@ class CalibrationTabWidget(QScrollArea):
         self.btnCalibrate = Button("Apply calibration")
         self.btnCalibrate.clicked.connect(self.apply_calibration)
 
+        self.btnCalibrateDigital = Button("Apply digital calibration")
+        self.btnCalibrateDigital.setToolTip(f"{state.CALIBRATION_DIGITAL_FILE}")
+        self.btnCalibrateDigital.clicked.connect(self.apply_digital_calibration)
+
         layout.addWidget(self.calibrationFilePath, 1, 0)
         layout.addWidget(self.btnChooseCalibrationFile, 1, 1)
         layout.addWidget(self.btnCalibrate, 2, 0, 2, 0)
+        layout.addWidget(self.btnCalibrateDigital, 4, 0, 1, 2)
 
         self.groupCalibrationFiles.setLayout(layout)
 
@@ -308,17 +240,35 @@ class CalibrationTabWidget(QScrollArea):
     def stop_calibration(self):
         state.CALIBRATION_MEAS = False
 
+    @staticmethod
+    def fit_model(control, frequency, commanded=None):
+        """Calibration model of points in measured order, None if they don't fit.
+        Hysteresis branches follow the commanded values order if they are given.
+        """
+        try:
+            return CalibrationModel.fit(control, frequency, commanded=commanded)
+        except ValueError as e:
+            logger.error(f"[CalibrationTabWidget.fit_model] {e}")
+            return None
+
     def save_calibration(self, results: dict):
         opt_1 = linear_fit(results["freq"], results["current_get"])
         opt_2 = linear_fit(results["current_get"], results["freq"])
         state.CALIBRATION_FREQ_2_CURR = list(opt_1)
         state.CALIBRATION_CURR_2_FREQ = list(opt_2)
+        state.CALIBRATION_ANALOG_MODEL = self.fit_model(
+            results["current_get"], results["freq"], commanded=results["current_set"]
+        )
         try:
             filepath = QFileDialog.getSaveFileName(
                 caption="Save calibration file", filter=".csv"
             )[0]
             df = pd.DataFrame(
-                {"frequency": results["freq"], "current": results["current_get"]}
+                {
+                    "frequency": results["freq"],
+                    "current": results["current_get"],
+                    "current_set": results["current_set"],
+                }
             )
             df.to_csv(filepath)
         except (IndexError, FileNotFoundError):
@@ -341,6 +291,27 @@ class CalibrationTabWidget(QScrollArea):
         opt_2 = linear_fit(calibration["current"], calibration["frequency"])
         state.CALIBRATION_FREQ_2_CURR = list(opt_1)
         state.CALIBRATION_CURR_2_FREQ = list(opt_2)
+        state.CALIBRATION_ANALOG_MODEL = self.fit_model(
+            calibration["current"],
+            calibration["frequency"],
+            commanded=calibration.get("current_set"),
+        )
+        self.curr2freq()
+
+    def apply_digital_calibration(self):
+        try:
+            with open(state.CALIBRATION_DIGITAL_FILE, "r", encoding="utf-8") as file:
+                calibration = json.load(file)
+        except (OSError, ValueError) as e:
+            logger.error(f"[{self.__class__.__name__}.apply_digital_calibration] {e}")
+            return
+        opt_1 = linear_fit(calibration["freq"], calibration["point"])
+        opt_2 = linear_fit(calibration["point"], calibration["freq"])
+        state.CALIBRATION_DIGITAL_FREQ_2_POINT = list(opt_1)
+        state.CALIBRATION_DIGITAL_POINT_2_FREQ = list(opt_2)
+        state.CALIBRATION_DIGITAL_MODEL = self.fit_model(
+            calibration["point"], calibration["freq"]
+        )
 
     def show_calibration_graph_window(self, results: dict):
         if self.calibrationGraphWindow is None:
@@ -353,9 +324,8 @@ class CalibrationTabWidget(QScrollArea):
         self.calibrationGraphWindow.show()
 
     def curr2freq(self):
-        freq_from = linear(
-            self.keithleyCurrentFrom.value(), *state.CALIBRATION_CURR_2_FREQ
+        freq_from, freq_to = analog_calibration().frequency(
+            [self.keithleyCurrentFrom.value(), self.keithleyCurrentTo.value()]
         )
         self.keithleyFreqFrom.setText(f"~ {round(freq_from / 1e9, 2)} [GHz]")
-        freq_to = linear(self.keithleyCurrentTo.value(), *state.CALIBRATION_CURR_2_FREQ)
         self.keithleyFreqTo.setText(f"~ {round(freq_to / 1e9, 2)} [GHz]")
@@ -1,5 +1,7 @@
 import logging
+import os
 import time
+from typing import Dict, List, Tuple
 
 import numpy as np
 from PyQt6.QtCore import pyqtSignal, QThread, Qt
@@ -12,21 +14,52 @@ from PyQt6.QtWidgets import (
     QScrollArea,
     QCheckBox,
     QProgressBar,
+    QFileDialog,
 )
 
 from api.Chopper import chopper_manager
+from api.keithley_power_supply import KeithleyBlock
 from api.ni import NiYIGManager
+from api.rs_fsek30 import SpectrumBlock
 from api.rs_nrx import NRXBlock
+from api.sweep import (
+    Axis,
+    BackgroundPointSensor,
+    ChopperLockInSensor,
+    ChopperStateAxis,
+    KeithleyCurrentAxis,
+    NiFrequencyAxis,
+    NRXSensor,
+    SegmentedFrequencyAxis,
+    Sensor,
+    SpectrumPeakSensor,
+    SweepEngine,
+    SweepSegment,
+    load_segments,
+    refinement_points,
+)
+from interface.components.SegmentTableWidget import SegmentTableWidget
 from interface.components.ui.Button import Button
 from interface.components.ui.DoubleSpinBox import DoubleSpinBox
 from interface.components.ui.GroupBox import GroupBox
 from store.state import state
 from store.base import MeasureModel
+from store.journal import SweepJournal
+from store.results import (
+    IFPowerResults,
+    LockInResults,
+    RepeatedIFPowerResults,
+    TuningMapResults,
+)
 from interface.windows.stabilityMeasureGraphWindow import (
     StabilityMeasureGraphWindow,
     IFPowerDiffGraphWindow,
+    NoiseTemperatureGraphWindow,
+    RunningAverageGraphWindow,
 )
-from utils.functions import linear
+from interface.windows.tuningMapWindow import TuningMapWindow
+from utils.functions import noise_temperature, y_factor
+from utils.lockin import demodulate
 
 logger = logging.getLogger(__name__)
 
@@ -35,16 +68,15 @@ class MeasureThread(QThread):
     results = pyqtSignal(list)
     stream_result = pyqtSignal(dict)
     stream_diff_results = pyqtSignal(dict)
+    stream_noise_temperature = pyqtSignal(dict)
+    stream_average = pyqtSignal(dict)
     progress = pyqtSignal(int)
 
-    def get_results_format(self):
-        if not state.CHOPPER_SWITCH:
-            return []
-        return {
-            "hot": {"data": [], "power": [], "frequency": []},
-            "cold": {"data": [], "power": [], "frequency": []},
-            "diff": [],
-        }
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.chopper_spinning = False
+        self.spectrum = None
+        self.journal = None
 
     def run(self):
         ni = NiYIGManager()
@@ -53,6 +85,15 @@ class MeasureThread(QThread):
             filter_time=state.NRX_FILTER_TIME,
             aperture_time=state.NRX_APER_TIME,
         )
+        if state.CHOPPER_SWITCH and state.CHOPPER_LOCKIN:
+            self.run_lockin(ni)
+            return
+        if state.NI_FREQ_RESUME_JOURNAL:
+            self.run_resume(ni)
+            return
+        if state.NI_FREQ_REPEATS > 1:
+            self.run_repeated(ni)
+            return
         if state.CHOPPER_SWITCH:
             self.measure = MeasureModel.objects.create(
                 measure_type=MeasureModel.type_class.CHOPPER_IF_POWER, data=[]
@@ -62,96 +103,499 @@ class MeasureThread(QThread):
                 measure_type=MeasureModel.type_class.IF_POWER, data=[]
             )
 
-        results = self.get_results_format()
+        frequency_axis = self.frequency_axis(ni)
+        if state.NI_FREQ_ADAPTIVE:
+            results = self.sweep_adaptive(ni, frequency_axis)
+        else:
+            chopper_reference = None
+            if state.CHOPPER_SWITCH:
+                chopper_reference = chopper_manager.chopper.get_actual_pos()
+            if state.NI_FREQ_JOURNAL:
+                self.open_journal(frequency_axis, chopper_reference)
+            results = self.sweep(
+                frequency_axis,
+                progress=self.progress.emit,
+                chopper_reference=chopper_reference,
+            )
+
+        self.pre_exit()
+        self.results.emit(results.to_dict())
+        self.finished.emit()
+
+    def open_journal(self, frequency_axis: NiFrequencyAxis, chopper_reference=None):
+        path = os.path.join(
+            state.DATA_DIR,
+            "journals",
+            f"{self.measure.started:%Y%m%d_%H%M%S}_{self.measure.id[:8]}.jsonl",
+        )
+        self.journal = SweepJournal(path)
+        segments = None
+        if isinstance(frequency_axis, SegmentedFrequencyAxis):
+            segments = [vars(segment) for segment in frequency_axis.segments]
+        self.journal.write_header(
+            measure_type=self.measure.measure_type,
+            frequency=frequency_axis.values.tolist(),
+            segments=segments,
+            samples=frequency_axis.max_samples or state.NRX_POINTS,
+            chopper=state.CHOPPER_SWITCH,
+            chopper_reference=chopper_reference,
+            t_hot=state.CHOPPER_T_HOT,
+            t_cold=state.CHOPPER_T_COLD,
+            spectrum_verify=state.NI_FREQ_SPECTRUM_VERIFY,
+        )
+        logger.info(f"[{self.__class__.__name__}.open_journal] {path}")
+
+    def run_resume(self, ni: NiYIGManager):
+        """Continue the sweep recorded in state.NI_FREQ_RESUME_JOURNAL
+        from the first not completed point, appending to the same journal
+        """
+        path = state.NI_FREQ_RESUME_JOURNAL
+        state.NI_FREQ_RESUME_JOURNAL = ""
+        header, points = SweepJournal.read(path)
+        state.CHOPPER_SWITCH = header["chopper"]
+        state.CHOPPER_T_HOT = header["t_hot"]
+        state.CHOPPER_T_COLD = header["t_cold"]
+        state.NI_FREQ_SPECTRUM_VERIFY = header["spectrum_verify"]
+        state.NRX_POINTS = header["samples"]
+        self.measure = MeasureModel.objects.create(
+            measure_type=header["measure_type"], data=[]
+        )
+        if header["segments"]:
+            frequency_axis = SegmentedFrequencyAxis(
+                ni,
+                [SweepSegment(**segment) for segment in header["segments"]],
+                nrx=self.nrx,
+                settle=0.01,
+                first_settle=0.4,
+            )
+        else:
+            frequency_axis = NiFrequencyAxis(
+                ni, header["frequency"], settle=0.01, first_settle=0.4
+            )
+        logger.info(
+            f"[{self.__class__.__name__}.run_resume] {path}, "
+            f"{len(points)} completed points"
+        )
+        self.journal = SweepJournal(path)
+        results = self.sweep(
+            frequency_axis,
+            progress=self.progress.emit,
+            restore=points,
+            chopper_reference=header["chopper_reference"],
+        )
+
+        self.pre_exit()
+        self.results.emit(results.to_dict())
+        self.finished.emit()
+
+    def frequency_axis(self, ni: NiYIGManager) -> NiFrequencyAxis:
+        """Segments table axis if the segmented sweep is enabled, else uniform one"""
+        if state.NI_FREQ_SEGMENTED and state.NI_FREQ_SEGMENTS:
+            return SegmentedFrequencyAxis(
+                ni,
+                state.NI_FREQ_SEGMENTS,
+                nrx=self.nrx,
+                settle=0.01,
+                first_settle=0.4,
+            )
         freq_range = np.linspace(
             state.NI_FREQ_FROM,
             state.NI_FREQ_TO,
             int(state.NI_FREQ_POINTS),
         )
-        start_time = time.time()
-        chopper_range = list(range(1, 3) if state.CHOPPER_SWITCH else range(1, 2))
-        total_steps = state.NI_FREQ_POINTS * state.NRX_POINTS * len(chopper_range)
-        for chopper_step in chopper_range:
-            chop_state = "hot" if chopper_step == 1 else "cold"
-
-            for freq_step, freq in enumerate(freq_range, 1):
-                result = {
-                    "frequency": freq,
-                    "power": [],
-                    "power_mean": 0,
-                    "time": [],
-                }
-                if not state.NI_STABILITY_MEAS:
-                    break
-                freq_point = linear(freq * 1e9, *state.CALIBRATION_DIGITAL_FREQ_2_POINT)
-                ni.write_task(freq_point)
-                time.sleep(0.01)
-                if freq_step == 1:
-                    time.sleep(0.4)
-                tm = time.time()
-                for power_step in range(1, state.NRX_POINTS + 1):
-                    power = self.nrx.get_power()
-                    result["power"].append(power)
-                    result["time"].append(time.time() - tm)
-                    step = (
-                        (chopper_step - 1) * state.NI_FREQ_POINTS + freq_step - 1
-                    ) * state.NRX_POINTS + power_step
-                    proc = round(step / total_steps * 100, 2)
-                    logger.info(
-                        f"[{proc} %][Time {round(time.time() - start_time, 1)} s][Freq {freq}]"
-                    )
-                    self.progress.emit(int(proc))
-
-                power_mean = np.mean(result["power"])
-                result["power_mean"] = power_mean
-                self.stream_result.emit(
-                    {
-                        "x": [freq],
-                        "y": [power_mean],
-                        "new_plot": freq_step == 1,
-                    }
-                )
+        return NiFrequencyAxis(ni, freq_range, settle=0.01, first_settle=0.4)
 
-                if state.CHOPPER_SWITCH:
-                    results[chop_state]["data"].append(result)
-                    results[chop_state]["power"].append(power_mean)
-                    results[chop_state]["frequency"].append(freq)
-                else:
-                    results.append(result)
-
-                self.measure.data = results
+    def sensors(self) -> List[Sensor]:
+        """NRX power, in verification mode with the spectrum peak read once per point
+        in the background while the NRX samples are taken
+        """
+        if not state.NI_FREQ_SPECTRUM_VERIFY:
+            return [NRXSensor(self.nrx)]
+        if self.spectrum is None:
+            self.spectrum = SpectrumBlock(
+                prologix_ip=state.PROLOGIX_IP, address=state.SPECTRUM_ADDRESS
+            )
+        return [
+            NRXSensor(self.nrx),
+            BackgroundPointSensor(SpectrumPeakSensor(self.spectrum)),
+        ]
 
-            if state.CHOPPER_SWITCH:
-                chopper_manager.chopper.path0()
-                if not chopper_step == 2:
-                    time.sleep(2)
+    def sweep(
+        self,
+        frequency_axis: NiFrequencyAxis,
+        progress=None,
+        restore: List[Dict] = None,
+        chopper_reference: int = None,
+        measure_data: bool = True,
+    ) -> IFPowerResults:
+        """Single pass over frequency_axis, the pass results become the measure data
+        unless measure_data is False (a part of a larger result)
+        """
+        samples = frequency_axis.max_samples or state.NRX_POINTS
+        sensors = self.sensors()
+        channels = [channel for sensor in sensors for channel in sensor.channels]
+        results = IFPowerResults(
+            frequency=frequency_axis.values,
+            samples=samples,
+            chopper=state.CHOPPER_SWITCH,
+            t_hot=state.CHOPPER_T_HOT,
+            t_cold=state.CHOPPER_T_COLD,
+            extra_channels=[channel for channel in channels if channel != "power"],
+        )
+        if restore:
+            SweepJournal.restore(restore, results)
+            results.update_diff()
+        if measure_data:
+            self.measure.data = results
+        self.diff_new_plot = True
+        if state.CHOPPER_SWITCH:
+            chopper_axis = ChopperStateAxis(
+                chopper_manager.chopper, reference=chopper_reference
+            )
+        else:
+            chopper_axis = Axis("chopper", results.axis("chopper"))
+        engine = SweepEngine(
+            axes=[chopper_axis, frequency_axis],
+            sensors=sensors,
+            samples=samples,
+            results=results,
+            is_running=lambda: state.NI_STABILITY_MEAS,
+            on_point=self.emit_point,
+            progress=progress,
+            name=self.__class__.__name__,
+        )
+        return engine.run()
 
+    def sweep_adaptive(
+        self, ni: NiYIGManager, frequency_axis: NiFrequencyAxis
+    ) -> IFPowerResults:
+        """Coarse pass over frequency_axis, then passes over the midpoints of the intervals
+        where hot power slope or curvature exceeds state.NI_FREQ_ADAPTIVE_TOLERANCE,
+        until the tolerance or state.NI_FREQ_ADAPTIVE_BUDGET points is met.
+        Every pass is plotted as a separate curve, the result is merged and sorted.
+        """
+        budget = max(int(state.NI_FREQ_ADAPTIVE_BUDGET), len(frequency_axis))
+        chopper_reference = None
         if state.CHOPPER_SWITCH:
-            hot = np.array(results["hot"]["power"])
-            cold = np.array(results["cold"]["power"])
-            if len(hot) and len(cold):
-
-                min_ind = min([len(cold), len(hot)])
-                power_diff = hot[:min_ind] - cold[:min_ind]
-                self.stream_diff_results.emit(
-                    {
-                        "x": results["hot"]["frequency"],
-                        "y": power_diff.tolist(),
-                    }
+            chopper_reference = chopper_manager.chopper.get_actual_pos()
+        passes = [
+            self.sweep(
+                frequency_axis,
+                progress=self.pass_progress(0, len(frequency_axis), budget),
+                chopper_reference=chopper_reference,
+            )
+        ]
+        results = passes[0]
+        while state.NI_STABILITY_MEAS:
+            completed = results.completed.all(axis=0)
+            new_range = refinement_points(
+                results.axis("frequency")[completed],
+                results.mean()[0, completed],
+                tolerance=state.NI_FREQ_ADAPTIVE_TOLERANCE,
+                budget=budget - results.shape[1],
+                min_step=state.NI_FREQ_ADAPTIVE_MIN_STEP,
+            )
+            if not len(new_range):
+                break
+            logger.info(
+                f"[{self.__class__.__name__}.sweep_adaptive] "
+                f"Pass {len(passes) + 1}, {len(new_range)} new points"
+            )
+            passes.append(
+                self.sweep(
+                    NiFrequencyAxis(ni, new_range, settle=0.01, first_settle=0.4),
+                    progress=self.pass_progress(
+                        results.shape[1], len(new_range), budget
+                    ),
+                    chopper_reference=chopper_reference,
+                    measure_data=False,
                 )
-                self.measure.data["diff"] = power_diff.tolist()
+            )
+            results = IFPowerResults.merge(passes)
+            self.measure.data = results
+        return results
+
+    def pass_progress(self, done: int, points: int, total: int):
+        """Progress callback of a pass over points frequencies,
+        as a part of total frequencies with done already measured
+        """
+        return lambda percent: self.progress.emit(
+            int((done + percent / 100 * points) / total * 100)
+        )
+
+    def run_repeated(self, ni: NiYIGManager):
+        """The same sweep repeated state.NI_FREQ_REPEATS times.
+        Per frequency statistics are updated after every pass,
+        raw passes are written to disk and aren't kept in memory.
+        """
+        self.measure = MeasureModel.objects.create(
+            measure_type=MeasureModel.type_class.REPEATED_IF_POWER, data=[]
+        )
+        frequency_axis = self.frequency_axis(ni)
+        directory = os.path.join(
+            state.DATA_DIR,
+            f"repeats_{self.measure.started:%Y%m%d_%H%M%S}_{self.measure.id[:8]}",
+        )
+        repeats = RepeatedIFPowerResults(
+            frequency=frequency_axis.values,
+            chopper=state.CHOPPER_SWITCH,
+            directory=directory,
+        )
+        self.measure.data = repeats
+        start = time.time()
+        for pass_ind in range(int(state.NI_FREQ_REPEATS)):
+            if not state.NI_STABILITY_MEAS:
+                break
+            pass_start = time.time()
+            results = self.sweep(frequency_axis, measure_data=False)
+            if not results.completed.any():
+                break
+            repeats.add_pass(results, t=(pass_start - start) / 3600)
+            self.progress.emit(int((pass_ind + 1) / state.NI_FREQ_REPEATS * 100))
+            self.emit_average(repeats)
+        self.measure.data = repeats
+        logger.info(
+            f"[{self.__class__.__name__}.run_repeated] {repeats.passes} passes "
+            f"saved to {directory}"
+        )
+        self.pre_exit()
+        self.results.emit(repeats.to_dict())
+        self.finished.emit()
+
+    def emit_average(self, repeats: RepeatedIFPowerResults):
+        statistics = repeats.statistics
+        self.stream_average.emit(
+            {
+                "x": [
+                    repeats.frequency[count > 0].tolist() for count in statistics.count
+                ],
+                "y": [
+                    mean[count > 0].tolist()
+                    for mean, count in zip(statistics.mean, statistics.count)
+                ],
+            }
+        )
+
+    def emit_point(self, index: Tuple, results: IFPowerResults):
+        if self.journal is not None:
+            self.journal.append_point(index, results)
+        freq_ind = index[-1]
+        self.stream_result.emit(
+            {
+                "x": [results.axis("frequency")[freq_ind]],
+                "y": [results.mean(index=index)],
+                "new_plot": freq_ind == 0,
+            }
+        )
+        if results.chopper and index[0] == 1:
+            self.emit_diff(freq_ind, results)
+
+    def emit_diff(self, freq_ind: int, results: IFPowerResults):
+        """Diff, Y-factor and noise temperature as soon as the cold point
+        matching the hot one by frequency is measured
+        """
+        results.update_diff(freq_ind)
+        diff = results.diff[freq_ind]
+        if np.isnan(diff):
+            return
+        freq = results.axis("frequency")[freq_ind]
+        self.stream_diff_results.emit(
+            {"x": [freq], "y": [diff], "new_plot": self.diff_new_plot}
+        )
+        self.stream_noise_temperature.emit(
+            {
+                "x": [freq],
+                "y": [results.noise_temperature[freq_ind]],
+                "new_plot": self.diff_new_plot,
+            }
+        )
+        self.diff_new_plot = False
+
+    def run_lockin(self, ni: NiYIGManager):
+        """Single pass hot/cold measurement with continuously rotating chopper"""
+        self.measure = MeasureModel.objects.create(
+            measure_type=MeasureModel.type_class.CHOPPER_LOCKIN_IF_POWER, data=[]
+        )
+        frequency_axis = self.frequency_axis(ni)
+        samples = frequency_axis.max_samples or state.NRX_POINTS
+        results = LockInResults(
+            frequency=frequency_axis.values,
+            samples=samples,
+            t_hot=state.CHOPPER_T_HOT,
+            t_cold=state.CHOPPER_T_COLD,
+        )
+        self.measure.data = results
+        chopper = chopper_manager.chopper
+        chopper.align()
+        self.lockin_reference = chopper.get_actual_pos()
+        chopper.set_frequency(state.CHOPPER_FREQ)
+        chopper.path1()
+        self.chopper_spinning = True
+        time.sleep(state.CHOPPER_SPIN_UP_DELAY)
 
+        engine = SweepEngine(
+            axes=[frequency_axis],
+            sensors=[ChopperLockInSensor(self.nrx, chopper)],
+            samples=samples,
+            results=results,
+            is_running=lambda: state.NI_STABILITY_MEAS,
+            on_point=self.demodulate_point,
+            progress=self.progress.emit,
+            name=self.__class__.__name__,
+        )
+        try:
+            engine.run()
+        finally:
+            chopper.path2()
+            self.chopper_spinning = False
         self.pre_exit()
-        self.results.emit(results)
+        self.results.emit(results.to_dict())
         self.finished.emit()
 
+    def demodulate_point(self, index: Tuple, results: LockInResults):
+        hot, cold, hot_count, cold_count = demodulate(
+            results.data["power"][index],
+            results.data["position_start"][index],
+            results.data["position_stop"][index],
+            reference=self.lockin_reference,
+            guard=state.CHOPPER_LOCKIN_GUARD,
+        )
+        results.hot[index] = hot
+        results.cold[index] = cold
+        results.hot_count[index] = hot_count
+        results.cold_count[index] = cold_count
+        freq_ind = index[-1]
+        freq = results.axis("frequency")[freq_ind]
+        self.stream_result.emit({"x": [freq], "y": [hot], "new_plot": freq_ind == 0})
+        self.stream_diff_results.emit(
+            {"x": [freq], "y": [hot - cold], "new_plot": freq_ind == 0}
+        )
+        self.stream_noise_temperature.emit(
+            {
+                "x": [freq],
+                "y": [
+                    noise_temperature(
+                        y_factor(hot, cold), results.t_hot, results.t_cold
+                    )
+                ],
+                "new_plot": freq_ind == 0,
+            }
+        )
+
     def pre_exit(self):
         self.nrx.close()
+        if self.journal is not None:
+            self.journal.close()
+            self.journal = None
+        if self.spectrum is not None:
+            self.spectrum.close()
+            self.spectrum = None
         self.measure.save()
 
-    def terminate(self) -> None:
+    def stop(self) -> None:
+        """Stop the sweep at the next point and wait for the thread to finish.
+        The thread isn't terminated, so it never dies holding the chopper lock.
+        """
+        state.NI_STABILITY_MEAS = False
+        self.wait()
+        if self.chopper_spinning:
+            chopper_manager.chopper.emergency_stop()
+            self.chopper_spinning = False
+
+
+class TuningMapThread(QThread):
+    """NRX power map over analog YIG current (rows) and digital YIG frequency (columns).
+    Changed rows are emitted not more often than state.TUNING_MAP_EMIT_INTERVAL.
+    """
+
+    results = pyqtSignal(dict)
+    rows = pyqtSignal(dict)
+    progress = pyqtSignal(int)
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.dirty_row = None
+        self.last_emit = 0
+
+    def run(self):
+        self.measure = MeasureModel.objects.create(
+            measure_type=MeasureModel.type_class.TUNING_MAP, data=[]
+        )
+        keithley = KeithleyBlock(
+            prologix_ip=state.PROLOGIX_IP, address=state.KEITHLEY_ADDRESS
+        )
+        ni = NiYIGManager()
+        self.nrx = NRXBlock(
+            ip=state.NRX_IP,
+            filter_time=state.NRX_FILTER_TIME,
+            aperture_time=state.NRX_APER_TIME,
+        )
+        current_range = np.linspace(
+            state.TUNING_MAP_CURRENT_FROM,
+            state.TUNING_MAP_CURRENT_TO,
+            int(state.TUNING_MAP_CURRENT_POINTS),
+        )
+        freq_range = np.linspace(
+            state.TUNING_MAP_FREQ_FROM,
+            state.TUNING_MAP_FREQ_TO,
+            int(state.TUNING_MAP_FREQ_POINTS),
+        )
+        results = TuningMapResults(current=current_range, frequency=freq_range)
+        self.measure.data = results
+        engine = SweepEngine(
+            axes=[
+                KeithleyCurrentAxis(
+                    keithley,
+                    current_range,
+                    settle=state.CALIBRATION_STEP_DELAY,
+                    first_settle=0.4,
+                ),
+                NiFrequencyAxis(ni, freq_range, settle=0.01, first_settle=0.4),
+            ],
+            sensors=[NRXSensor(self.nrx, points=state.TUNING_MAP_NRX_POINTS)],
+            results=results,
+            is_running=lambda: state.TUNING_MAP_MEAS,
+            on_point=self.update_rows,
+            progress=self.progress.emit,
+            name=self.__class__.__name__,
+        )
+        try:
+            engine.run()
+        finally:
+            self.emit_rows(results)
         self.pre_exit()
-        super().terminate()
+        self.results.emit(results.to_dict())
+        self.finished.emit()
+
+    def update_rows(self, index: Tuple, results: TuningMapResults):
+        if self.dirty_row is None:
+            self.dirty_row = index[0]
+        if time.time() - self.last_emit >= state.TUNING_MAP_EMIT_INTERVAL:
+            self.emit_rows(results, stop=index[0] + 1)
+
+    def emit_rows(self, results: TuningMapResults, stop: int = None):
+        if self.dirty_row is None:
+            return
+        completed_rows = np.flatnonzero(results.completed.any(axis=1))
+        if stop is None:
+            stop = int(completed_rows[-1]) + 1 if len(completed_rows) else 0
+        self.rows.emit(
+            {
+                "start": self.dirty_row,
+                "data": results.image[self.dirty_row : stop].copy(),
+            }
+        )
+        self.dirty_row = None
+        self.last_emit = time.time()
+
+    def pre_exit(self):
+        self.nrx.close()
+        self.measure.save()
+
+    def stop(self) -> None:
+        """Stop the map at the next point and wait for the thread to finish"""
+        state.TUNING_MAP_MEAS = False
+        self.wait()
 
 
 class MeasureTabWidget(QScrollArea):
@@ -161,8 +605,13 @@ class MeasureTabWidget(QScrollArea):
         self.layout = QVBoxLayout(self)
         self.stabilityMeasureGraphWindow = None
         self.ifPowerDiffGraphWindow = None
+        self.runningAverageGraphWindow = None
+        self.noiseTemperatureGraphWindow = None
+        self.tuningMapWindow = None
         self.createGroupMeas()
+        self.createGroupTuningMap()
         self.layout.addWidget(self.groupMeas)
+        self.layout.addWidget(self.groupTuningMap)
         self.layout.addStretch()
         self.widget.setLayout(self.layout)
 
@@ -210,6 +659,76 @@ class MeasureTabWidget(QScrollArea):
         self.chopperSwitch.setText("Enable chopper Hot/Cold switching")
         self.chopperSwitch.setChecked(state.CHOPPER_SWITCH)
 
+        self.chopperLockIn = QCheckBox(self)
+        self.chopperLockIn.setText("Continuous rotation (lock-in)")
+        self.chopperLockIn.setChecked(state.CHOPPER_LOCKIN)
+
+        self.chopperFreqLabel = QLabel(self)
+        self.chopperFreqLabel.setText("Chopper frequency, Hz")
+        self.chopperFreq = DoubleSpinBox(self)
+        self.chopperFreq.setRange(0.1, 20)
+        self.chopperFreq.setDecimals(1)
+        self.chopperFreq.setValue(state.CHOPPER_FREQ)
+
+        self.niFreqAdaptive = QCheckBox(self)
+        self.niFreqAdaptive.setText("Adaptive frequency refinement")
+        self.niFreqAdaptive.setChecked(state.NI_FREQ_ADAPTIVE)
+
+        self.niFreqToleranceLabel = QLabel(self)
+        self.niFreqToleranceLabel.setText("Refinement tolerance, dB")
+        self.niFreqTolerance = DoubleSpinBox(self)
+        self.niFreqTolerance.setRange(0.01, 20)
+        self.niFreqTolerance.setDecimals(2)
+        self.niFreqTolerance.setValue(state.NI_FREQ_ADAPTIVE_TOLERANCE)
+
+        self.niFreqBudgetLabel = QLabel(self)
+        self.niFreqBudgetLabel.setText("Refinement max points")
+        self.niFreqBudget = DoubleSpinBox(self)
+        self.niFreqBudget.setRange(1, 10001)
+        self.niFreqBudget.setDecimals(0)
+        self.niFreqBudget.setValue(state.NI_FREQ_ADAPTIVE_BUDGET)
+
+        self.niFreqRepeatsLabel = QLabel(self)
+        self.niFreqRepeatsLabel.setText("Repeats")
+        self.niFreqRepeats = DoubleSpinBox(self)
+        self.niFreqRepeats.setRange(1, 10000)
+        self.niFreqRepeats.setDecimals(0)
+        self.niFreqRepeats.setValue(state.NI_FREQ_REPEATS)
+
+        self.niFreqSpectrumVerify = QCheckBox(self)
+        self.niFreqSpectrumVerify.setText("Read spectrum peak concurrently")
+        self.niFreqSpectrumVerify.setChecked(state.NI_FREQ_SPECTRUM_VERIFY)
+
+        self.niFreqSegmented = QCheckBox(self)
+        self.niFreqSegmented.setText("Segmented sweep (table below)")
+        self.niFreqSegmented.setChecked(state.NI_FREQ_SEGMENTED)
+
+        self.segmentsTable = SegmentTableWidget(self)
+        self.segmentsTable.setSegments(state.NI_FREQ_SEGMENTS)
+
+        self.btnAddSegment = Button("Add segment")
+        self.btnAddSegment.clicked.connect(lambda: self.segmentsTable.addSegment())
+
+        self.btnRemoveSegment = Button("Remove segment")
+        self.btnRemoveSegment.clicked.connect(self.segmentsTable.removeSelectedSegments)
+
+        self.btnLoadSegments = Button("Load segments CSV")
+        self.btnLoadSegments.clicked.connect(self.chooseSegmentsFile)
+
+        self.chopperTHotLabel = QLabel(self)
+        self.chopperTHotLabel.setText("Hot load temperature, K")
+        self.chopperTHot = DoubleSpinBox(self)
+        self.chopperTHot.setRange(0, 1000)
+        self.chopperTHot.setDecimals(1)
+        self.chopperTHot.setValue(state.CHOPPER_T_HOT)
+
+        self.chopperTColdLabel = QLabel(self)
+        self.chopperTColdLabel.setText("Cold load temperature, K")
+        self.chopperTCold = DoubleSpinBox(self)
+        self.chopperTCold.setRange(0, 1000)
+        self.chopperTCold.setDecimals(1)
+        self.chopperTCold.setValue(state.CHOPPER_T_COLD)
+
         self.progress = QProgressBar(self)
         self.progress.setValue(0)
 
@@ -219,6 +738,13 @@ class MeasureTabWidget(QScrollArea):
         self.btnStopMeas = Button("Stop Measure")
         self.btnStopMeas.clicked.connect(self.stop_meas)
 
+        self.niFreqJournal = QCheckBox(self)
+        self.niFreqJournal.setText("Journal sweep to disk")
+        self.niFreqJournal.setChecked(state.NI_FREQ_JOURNAL)
+
+        self.btnResumeMeas = Button("Resume from journal")
+        self.btnResumeMeas.clicked.connect(self.resume_meas)
+
         layout.addWidget(self.niFreqStartLabel, 1, 0)
         layout.addWidget(self.niFreqStart, 1, 1)
         layout.addWidget(self.niFreqStopLabel, 2, 0)
@@ -227,13 +753,120 @@ class MeasureTabWidget(QScrollArea):
         layout.addWidget(self.niFreqPoints, 3, 1)
         layout.addWidget(self.nrxPointsLabel, 4, 0)
         layout.addWidget(self.nrxPoints, 4, 1)
-        layout.addWidget(self.chopperSwitch, 5, 0)
-        layout.addWidget(self.progress, 6, 0, 1, 2)
-        layout.addWidget(self.btnStartMeas, 7, 0)
-        layout.addWidget(self.btnStopMeas, 7, 1)
+        layout.addWidget(self.niFreqAdaptive, 5, 0, 1, 2)
+        layout.addWidget(self.niFreqToleranceLabel, 6, 0)
+        layout.addWidget(self.niFreqTolerance, 6, 1)
+        layout.addWidget(self.niFreqBudgetLabel, 7, 0)
+        layout.addWidget(self.niFreqBudget, 7, 1)
+        layout.addWidget(self.niFreqRepeatsLabel, 8, 0)
+        layout.addWidget(self.niFreqRepeats, 8, 1)
+        layout.addWidget(self.niFreqSpectrumVerify, 9, 0, 1, 2)
+        layout.addWidget(self.niFreqSegmented, 10, 0)
+        layout.addWidget(self.btnLoadSegments, 10, 1)
+        layout.addWidget(self.segmentsTable, 11, 0, 1, 2)
+        layout.addWidget(self.btnAddSegment, 12, 0)
+        layout.addWidget(self.btnRemoveSegment, 12, 1)
+        layout.addWidget(self.chopperSwitch, 13, 0)
+        layout.addWidget(self.chopperLockIn, 13, 1)
+        layout.addWidget(self.chopperFreqLabel, 14, 0)
+        layout.addWidget(self.chopperFreq, 14, 1)
+        layout.addWidget(self.chopperTHotLabel, 15, 0)
+        layout.addWidget(self.chopperTHot, 15, 1)
+        layout.addWidget(self.chopperTColdLabel, 16, 0)
+        layout.addWidget(self.chopperTCold, 16, 1)
+        layout.addWidget(self.progress, 17, 0, 1, 2)
+        layout.addWidget(self.btnStartMeas, 18, 0)
+        layout.addWidget(self.btnStopMeas, 18, 1)
+        layout.addWidget(self.niFreqJournal, 19, 0)
+        layout.addWidget(self.btnResumeMeas, 19, 1)
 
         self.groupMeas.setLayout(layout)
 
+    def createGroupTuningMap(self):
+        self.groupTuningMap = GroupBox("Tuning map Power(current, frequency)")
+        self.groupTuningMap.setSizePolicy(
+            QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Fixed
+        )
+        layout = QGridLayout()
+
+        self.mapCurrentStartLabel = QLabel(self)
+        self.mapCurrentStartLabel.setText("Current start, A")
+        self.mapCurrentStart = DoubleSpinBox(self)
+        self.mapCurrentStart.setRange(0, 5)
+        self.mapCurrentStart.setDecimals(5)
+        self.mapCurrentStart.setValue(state.TUNING_MAP_CURRENT_FROM)
+
+        self.mapCurrentStopLabel = QLabel(self)
+        self.mapCurrentStopLabel.setText("Current stop, A")
+        self.mapCurrentStop = DoubleSpinBox(self)
+        self.mapCurrentStop.setRange(0, 5)
+        self.mapCurrentStop.setDecimals(5)
+        self.mapCurrentStop.setValue(state.TUNING_MAP_CURRENT_TO)
+
+        self.mapCurrentPointsLabel = QLabel(self)
+        self.mapCurrentPointsLabel.setText("Current points")
+        self.mapCurrentPoints = DoubleSpinBox(self)
+        self.mapCurrentPoints.setRange(1, 5001)
+        self.mapCurrentPoints.setDecimals(0)
+        self.mapCurrentPoints.setValue(state.TUNING_MAP_CURRENT_POINTS)
+
+        self.mapFreqStartLabel = QLabel(self)
+        self.mapFreqStartLabel.setText("Frequency start, GHz")
+        self.mapFreqStart = DoubleSpinBox(self)
+        self.mapFreqStart.setRange(0, 20)
+        self.mapFreqStart.setDecimals(3)
+        self.mapFreqStart.setValue(state.TUNING_MAP_FREQ_FROM)
+
+        self.mapFreqStopLabel = QLabel(self)
+        self.mapFreqStopLabel.setText("Frequency stop, GHz")
+        self.mapFreqStop = DoubleSpinBox(self)
+        self.mapFreqStop.setRange(0, 20)
+        self.mapFreqStop.setDecimals(3)
+        self.mapFreqStop.setValue(state.TUNING_MAP_FREQ_TO)
+
+        self.mapFreqPointsLabel = QLabel(self)
+        self.mapFreqPointsLabel.setText("Freq points")
+        self.mapFreqPoints = DoubleSpinBox(self)
+        self.mapFreqPoints.setRange(1, 5001)
+        self.mapFreqPoints.setDecimals(0)
+        self.mapFreqPoints.setValue(state.TUNING_MAP_FREQ_POINTS)
+
+        self.mapNrxPointsLabel = QLabel(self)
+        self.mapNrxPointsLabel.setText("Power points")
+        self.mapNrxPoints = DoubleSpinBox(self)
+        self.mapNrxPoints.setRange(1, 1001)
+        self.mapNrxPoints.setDecimals(0)
+        self.mapNrxPoints.setValue(state.TUNING_MAP_NRX_POINTS)
+
+        self.mapProgress = QProgressBar(self)
+        self.mapProgress.setValue(0)
+
+        self.btnStartMap = Button("Start Map", animate=True)
+        self.btnStartMap.clicked.connect(self.start_map)
+
+        self.btnStopMap = Button("Stop Map")
+        self.btnStopMap.clicked.connect(self.stop_map)
+
+        layout.addWidget(self.mapCurrentStartLabel, 1, 0)
+        layout.addWidget(self.mapCurrentStart, 1, 1)
+        layout.addWidget(self.mapCurrentStopLabel, 2, 0)
+        layout.addWidget(self.mapCurrentStop, 2, 1)
+        layout.addWidget(self.mapCurrentPointsLabel, 3, 0)
+        layout.addWidget(self.mapCurrentPoints, 3, 1)
+        layout.addWidget(self.mapFreqStartLabel, 4, 0)
+        layout.addWidget(self.mapFreqStart, 4, 1)
+        layout.addWidget(self.mapFreqStopLabel, 5, 0)
+        layout.addWidget(self.mapFreqStop, 5, 1)
+        layout.addWidget(self.mapFreqPointsLabel, 6, 0)
+        layout.addWidget(self.mapFreqPoints, 6, 1)
+        layout.addWidget(self.mapNrxPointsLabel, 7, 0)
+        layout.addWidget(self.mapNrxPoints, 7, 1)
+        layout.addWidget(self.mapProgress, 8, 0, 1, 2)
+        layout.addWidget(self.btnStartMap, 9, 0)
+        layout.addWidget(self.btnStopMap, 9, 1)
+
+        self.groupTuningMap.setLayout(layout)
+
     def start_meas(self):
         self.meas_thread = MeasureThread()
 
@@ -242,7 +875,19 @@ class MeasureTabWidget(QScrollArea):
         state.NI_FREQ_FROM = self.niFreqStart.value()
         state.NI_FREQ_POINTS = int(self.niFreqPoints.value())
         state.NRX_POINTS = int(self.nrxPoints.value())
+        state.NI_FREQ_REPEATS = int(self.niFreqRepeats.value())
+        state.NI_FREQ_SPECTRUM_VERIFY = self.niFreqSpectrumVerify.isChecked()
+        state.NI_FREQ_JOURNAL = self.niFreqJournal.isChecked()
+        state.NI_FREQ_SEGMENTED = self.niFreqSegmented.isChecked()
+        state.NI_FREQ_SEGMENTS = self.segmentsTable.segments()
+        state.NI_FREQ_ADAPTIVE = self.niFreqAdaptive.isChecked()
+        state.NI_FREQ_ADAPTIVE_TOLERANCE = self.niFreqTolerance.value()
+        state.NI_FREQ_ADAPTIVE_BUDGET = int(self.niFreqBudget.value())
         state.CHOPPER_SWITCH = self.chopperSwitch.isChecked()
+        state.CHOPPER_LOCKIN = self.chopperLockIn.isChecked()
+        state.CHOPPER_FREQ = self.chopperFreq.value()
+        state.CHOPPER_T_HOT = self.chopperTHot.value()
+        state.CHOPPER_T_COLD = self.chopperTCold.value()
 
         self.meas_thread.stream_result.connect(self.show_measure_graph_window)
         self.meas_thread.progress.connect(lambda x: self.progress.setValue(x))
@@ -251,6 +896,11 @@ class MeasureTabWidget(QScrollArea):
             self.meas_thread.stream_diff_results.connect(
                 self.show_bias_power_diff_graph
             )
+            self.meas_thread.stream_noise_temperature.connect(
+                self.show_noise_temperature_graph
+            )
+        if state.NI_FREQ_REPEATS > 1:
+            self.meas_thread.stream_average.connect(self.show_running_average_graph)
         self.meas_thread.start()
 
         self.btnStartMeas.setEnabled(False)
@@ -259,9 +909,39 @@ class MeasureTabWidget(QScrollArea):
         self.btnStopMeas.setEnabled(True)
         self.meas_thread.finished.connect(lambda: self.btnStopMeas.setEnabled(False))
 
+    def chooseSegmentsFile(self):
+        try:
+            filepath = QFileDialog.getOpenFileName(
+                caption="Choose segments file", filter="*.csv"
+            )[0]
+            if filepath:
+                self.segmentsTable.setSegments(load_segments(filepath))
+                self.niFreqSegmented.setChecked(True)
+        except (IndexError, FileNotFoundError, ValueError, KeyError) as e:
+            logger.error(f"[{self.__class__.__name__}.chooseSegmentsFile] {e}")
+
+    def resume_meas(self):
+        try:
+            filepath = QFileDialog.getOpenFileName(
+                caption="Choose sweep journal",
+                directory=os.path.join(state.DATA_DIR, "journals"),
+                filter="*.jsonl",
+            )[0]
+            if not filepath:
+                return
+            header, _ = SweepJournal.read(filepath)
+        except (IndexError, FileNotFoundError, ValueError) as e:
+            logger.error(f"[{self.__class__.__name__}.resume_meas] {e}")
+            return
+        self.chopperSwitch.setChecked(header["chopper"])
+        self.chopperLockIn.setChecked(False)
+        self.niFreqAdaptive.setChecked(False)
+        self.niFreqRepeats.setValue(1)
+        state.NI_FREQ_RESUME_JOURNAL = filepath
+        self.start_meas()
+
     def stop_meas(self):
-        state.NI_STABILITY_MEAS = False
-        self.meas_thread.terminate()
+        self.meas_thread.stop()
 
     def show_measure_graph_window(self, results: dict):
         if self.stabilityMeasureGraphWindow is None:
@@ -273,11 +953,74 @@ class MeasureTabWidget(QScrollArea):
         )
         self.stabilityMeasureGraphWindow.show()
 
+    def show_running_average_graph(self, results: dict):
+        if self.runningAverageGraphWindow is None:
+            self.runningAverageGraphWindow = RunningAverageGraphWindow()
+        for ds_id, (x, y) in enumerate(zip(results["x"], results["y"]), 1):
+            self.runningAverageGraphWindow.plotAverage(x=x, y=y, ds_id=ds_id)
+        self.runningAverageGraphWindow.show()
+
+    def show_noise_temperature_graph(self, results: dict):
+        if self.noiseTemperatureGraphWindow is None:
+            self.noiseTemperatureGraphWindow = NoiseTemperatureGraphWindow()
+        self.noiseTemperatureGraphWindow.plotNew(
+            x=results.get("x", []),
+            y=results.get("y", []),
+            new_plot=results.get("new_plot", True),
+        )
+        self.noiseTemperatureGraphWindow.show()
+
     def show_bias_power_diff_graph(self, results):
         if self.ifPowerDiffGraphWindow is None:
             self.ifPowerDiffGraphWindow = IFPowerDiffGraphWindow()
         self.ifPowerDiffGraphWindow.plotNew(
             x=results.get("x", []),
             y=results.get("y", []),
+            new_plot=results.get("new_plot", True),
         )
         self.ifPowerDiffGraphWindow.show()
+
+    def start_map(self):
+        self.map_thread = TuningMapThread()
+
+        state.TUNING_MAP_MEAS = True
+        state.TUNING_MAP_CURRENT_FROM = self.mapCurrentStart.value()
+        state.TUNING_MAP_CURRENT_TO = self.mapCurrentStop.value()
+        state.TUNING_MAP_CURRENT_POINTS = int(self.mapCurrentPoints.value())
+        state.TUNING_MAP_FREQ_FROM = self.mapFreqStart.value()
+        state.TUNING_MAP_FREQ_TO = self.mapFreqStop.value()
+        state.TUNING_MAP_FREQ_POINTS = int(self.mapFreqPoints.value())
+        state.TUNING_MAP_NRX_POINTS = int(self.mapNrxPoints.value())
+
+        if self.tuningMapWindow is None:
+            self.tuningMapWindow = TuningMapWindow()
+        self.tuningMapWindow.setAxes(
+            current=np.linspace(
+                state.TUNING_MAP_CURRENT_FROM,
+                state.TUNING_MAP_CURRENT_TO,
+                state.TUNING_MAP_CURRENT_POINTS,
+            ),
+            frequency=np.linspace(
+                state.TUNING_MAP_FREQ_FROM,
+                state.TUNING_MAP_FREQ_TO,
+                state.TUNING_MAP_FREQ_POINTS,
+            ),
+        )
+        self.tuningMapWindow.show()
+
+        self.map_thread.rows.connect(self.show_tuning_map_rows)
+        self.map_thread.progress.connect(lambda x: self.mapProgress.setValue(x))
+        self.map_thread.finished.connect(lambda: self.mapProgress.setValue(0))
+        self.map_thread.start()
+
+        self.btnStartMap.setEnabled(False)
+        self.map_thread.finished.connect(lambda: self.btnStartMap.setEnabled(True))
+
+        self.btnStopMap.setEnabled(True)
+        self.map_thread.finished.connect(lambda: self.btnStopMap.setEnabled(False))
+
+    def stop_map(self):
+        self.map_thread.stop()
+
+    def show_tuning_map_rows(self, rows: dict):
+        self.tuningMapWindow.updateRows(rows.get("start", 0), rows.get("data", []))
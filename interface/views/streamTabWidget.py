@@ -1,7 +1,9 @@
 import logging
+import os
 import time
-from typing import Dict
+from typing import Dict, List, Tuple
 
+import numpy as np
 from PyQt6.QtCore import pyqtSignal, QThread, Qt
 from PyQt6.QtWidgets import (
     QWidget,
@@ -12,19 +14,33 @@ from PyQt6.QtWidgets import (
     QCheckBox,
     QScrollArea,
     QFormLayout,
+    QComboBox,
+    QLineEdit,
 )
 
 from api.keithley_power_supply import KeithleyBlock
 from api.ni import NiYIGManager
 from api.rs_fsek30 import SpectrumBlock
 from api.rs_nrx import NRXBlock
+from api.sweep import SpectrumPeakSensor, TuningCorrections, YigTuner
 from interface.components.ui.Button import Button
 from interface.components.ui.DoubleSpinBox import DoubleSpinBox
 from interface.components.ui.GroupBox import GroupBox
-from interface.windows.nrxStreamGraphWindow import NRXStreamGraphWindow
-from interface.windows.spectrumGraphWindow import SpectrumGraphWindow
+from interface.windows.nrxStreamGraphWindow import (
+    NRXStreamGraphWindow,
+    NRXStreamPSDWindow,
+    NRXStreamStatisticsWindow,
+)
+from interface.windows.spectrumGraphWindow import (
+    SpectrumGraphWindow,
+    SpectrumWaterfallWindow,
+)
+from store.base import MeasureModel
+from store.calibration import analog_calibration, digital_calibration
 from store.state import state
-from utils.functions import linear
+from store.stream import StreamRecorder, StreamRecording
+from utils.statistics import AllanDeviation, StreamStatistics, WelchPSD
+from utils.trace import AVERAGE_MODES, HOLD_MODES, TraceProcessor
 
 logger = logging.getLogger(__name__)
 
@@ -79,6 +95,18 @@ class KeithleySetVoltageThread(QThread):
 
 class NRXBlockStreamThread(QThread):
     meas = pyqtSignal(dict)
+    statistics = pyqtSignal(dict)
+    psd = pyqtSignal(dict)
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.recorder = None
+        self.measure = None
+        self.stream_statistics = StreamStatistics()
+        self.allan = AllanDeviation(max_m=state.ALLAN_MAX_M)
+        self.welch = WelchPSD(segment=state.NRX_STREAM_PSD_SEGMENT)
+        self.pending = []
+        self.last_statistics = 0
 
     def run(self):
         nrx = NRXBlock(
@@ -88,6 +116,8 @@ class NRXBlockStreamThread(QThread):
         )
         i = 0
         start_time = time.time()
+        if state.NRX_STREAM_RECORD:
+            self.start_recording(start_time)
         while state.NRX_STREAM_THREAD:
             power = nrx.get_power()
             meas_time = time.time() - start_time
@@ -95,13 +125,80 @@ class NRXBlockStreamThread(QThread):
                 time.sleep(2)
                 continue
 
+            if self.recorder is not None:
+                self.recorder.append((meas_time, power))
+            if state.NRX_STREAM_STATISTICS or state.NRX_STREAM_PSD:
+                self.update_statistics(meas_time, power)
             self.meas.emit({"power": power, "time": meas_time, "reset": i == 0})
             i += 1
+        self.stop_recording()
         self.finished.emit()
 
+    def update_statistics(self, meas_time: float, power: float):
+        """Statistics and PSD are updated with the readings collected for the last
+        state.NRX_STREAM_STATISTICS_INTERVAL seconds at once
+        """
+        self.pending.append((meas_time, power))
+        now = time.time()
+        if now - self.last_statistics < state.NRX_STREAM_STATISTICS_INTERVAL:
+            return
+        self.last_statistics = now
+        chunk = np.array(self.pending)
+        self.pending = []
+        self.stream_statistics.update(chunk[:, 1], chunk[:, 0])
+        tau0 = meas_time / max(self.stream_statistics.count - 1, 1)
+        if state.NRX_STREAM_STATISTICS:
+            self.allan.update(chunk[:, 1])
+            tau, adev = self.allan.deviation(tau0)
+            self.statistics.emit(
+                {
+                    "tau": tau,
+                    "adev": adev,
+                    "tau0": tau0,
+                    **self.stream_statistics.to_dict(),
+                }
+            )
+        if state.NRX_STREAM_PSD and self.welch.update(chunk[:, 1]):
+            frequency, psd = self.welch.density(1 / tau0)
+            self.psd.emit(
+                {
+                    "frequency": frequency,
+                    "psd": psd,
+                    "fs": 1 / tau0,
+                    "segments": self.welch.segments,
+                }
+            )
+
+    def start_recording(self, start_time: float):
+        """Register a POWER_STREAM measure backed by a binary file"""
+        path = os.path.join(
+            state.DATA_DIR,
+            "streams",
+            f"power_stream_{time.strftime('%Y%m%d_%H%M%S')}.bin",
+        )
+        self.recorder = StreamRecorder(
+            path,
+            columns=("time", "power"),
+            time_origin=start_time,
+            aperture_time=state.NRX_APER_TIME,
+        )
+        self.measure = MeasureModel.objects.create(
+            measure_type=MeasureModel.type_class.POWER_STREAM,
+            data=StreamRecording(path),
+        )
+        logger.info(f"[{self.__class__.__name__}.start_recording] {path}")
+
+    def stop_recording(self):
+        if self.recorder is None:
+            return
+        self.recorder.close()
+        self.recorder = None
+        self.measure.save()
+
     def terminate(self) -> None:
+        """Stop the stream loop and wait for it, run() closes the recording"""
         state.NRX_STREAM_THREAD = False
-        super().terminate()
+        self.wait()
         logger.info(f"[{self.__class__.__name__}.terminate] Terminated")
 
     def exit(self, returnCode: int = ...) -> None:
@@ -119,37 +216,106 @@ class DigitalYigThread(QThread):
     response = pyqtSignal(str)
 
     def run(self):
-        value = int(
-            linear(
-                state.DIGITAL_YIG_FREQ * 1e9, *state.CALIBRATION_DIGITAL_FREQ_2_POINT
-            )
-        )
+        calibration = digital_calibration()
+        value = int(round(float(calibration.control(state.DIGITAL_YIG_FREQ * 1e9))))
         ni_yig = NiYIGManager(host=state.NI_IP)
         resp = ni_yig.write_task(value=value)
         resp_int = resp.get("result", None)
         if resp_int is None:
             self.response.emit("Unable to set frequency")
         else:
-            freq = round(
-                linear(resp_int, *state.CALIBRATION_DIGITAL_POINT_2_FREQ) * 1e-9, 2
-            )
+            freq = round(float(calibration.frequency(resp_int)) * 1e-9, 2)
             self.response.emit(f"{freq} GHz")
         logger.info(f"[setNiYigFreq] {resp}")
 
 
+class YigTuneThread(QThread):
+    """Closed loop tuning of the analog or digital YIG to the spectrum peak"""
+
+    response = pyqtSignal(str)
+
+    def __init__(self, yig: str, frequency: float, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.yig = yig
+        self.frequency = frequency
+
+    def tuner(self, spectrum: SpectrumBlock, device) -> YigTuner:
+        sensor = SpectrumPeakSensor(spectrum)
+        corrections = TuningCorrections(
+            os.path.join(state.DATA_DIR, "yig_tuning", f"{self.yig}.json")
+        )
+        if self.yig == "analog":
+            calibration = analog_calibration()
+            return YigTuner(
+                set_value=device.set_current,
+                sensor=sensor,
+                predict=lambda f: float(calibration.control(f)),
+                slope=calibration.control_slope(self.frequency),
+                corrections=corrections,
+                limits=(state.YIG_TUNE_CURRENT_FROM, state.YIG_TUNE_CURRENT_TO),
+            )
+        calibration = digital_calibration()
+        return YigTuner(
+            set_value=lambda value: device.write_task(value=int(value)),
+            sensor=sensor,
+            predict=lambda f: float(calibration.control(f)),
+            slope=calibration.control_slope(self.frequency),
+            corrections=corrections,
+            quantum=1,
+            limits=(
+                state.DIGITAL_CALIBRATION_POINT_FROM,
+                state.DIGITAL_CALIBRATION_POINT_TO,
+            ),
+        )
+
+    def run(self):
+        """Devices are opened once per tune and closed when it's done"""
+        spectrum = SpectrumBlock(
+            prologix_ip=state.PROLOGIX_IP, address=state.SPECTRUM_ADDRESS
+        )
+        keithley = None
+        try:
+            if self.yig == "analog":
+                keithley = KeithleyBlock(
+                    address=state.KEITHLEY_ADDRESS, prologix_ip=state.PROLOGIX_IP
+                )
+                device = keithley
+            else:
+                device = NiYIGManager(host=state.NI_IP)
+            result = self.tuner(spectrum, device).tune(self.frequency)
+        except Exception as e:
+            logger.error(f"[{self.__class__.__name__}.run] {e}")
+            self.response.emit("Unable to tune frequency")
+            return
+        finally:
+            spectrum.close()
+            if keithley is not None:
+                keithley.close()
+        text = f"{result['peak_freq'] * 1e-9:.4f} GHz ({result['steps']} steps)"
+        if not result["converged"]:
+            text += ", not converged"
+        self.response.emit(text)
+        logger.info(f"[{self.__class__.__name__}.run] {result}")
+
+
 class SpectrumThread(QThread):
     data = pyqtSignal(dict)
 
     def run(self):
         block = SpectrumBlock()
+        processor = TraceProcessor(
+            average=state.SPECTRUM_AVERAGE,
+            count=state.SPECTRUM_AVERAGE_COUNT,
+            hold=state.SPECTRUM_HOLD,
+            smooth_points=state.SPECTRUM_SMOOTH_POINTS,
+            bands=state.SPECTRUM_BANDS,
+        )
         while 1:
             power = block.get_trace_data()
-            self.data.emit(
-                {
-                    "x": list(range(len(power))),
-                    "y": power,
-                }
-            )
+            if not power:
+                time.sleep(0.5)
+                continue
+            self.data.emit(processor.process(np.arange(len(power)), power))
             time.sleep(0.5)
 
 
@@ -159,7 +325,12 @@ class StreamTabWidget(QScrollArea):
         self.widget = QWidget()
         self.layout = QVBoxLayout(self)
         self.powerStreamGraphWindow = None
+        self.powerStreamStatisticsWindow = None
+        self.powerStreamPSDWindow = None
         self.spectrumStreamGraphWindow = None
+        self.spectrumWaterfallWindow = None
+        self.spectrum_thread = None
+        self.yig_tune_thread = None
         self.createGroupNRX()
         self.createGroupKeithley()
         self.createGroupNiYig()
@@ -205,10 +376,22 @@ class StreamTabWidget(QScrollArea):
         self.checkNRXStreamPlot = QCheckBox(self)
         self.checkNRXStreamPlot.setText("Plot stream time line")
 
+        self.checkNRXStreamRecord = QCheckBox(self)
+        self.checkNRXStreamRecord.setText("Record stream to disk")
+        self.checkNRXStreamRecord.setChecked(state.NRX_STREAM_RECORD)
+
+        self.checkNRXStreamStatistics = QCheckBox(self)
+        self.checkNRXStreamStatistics.setText("Plot Allan deviation")
+        self.checkNRXStreamStatistics.setChecked(state.NRX_STREAM_STATISTICS)
+
+        self.checkNRXStreamPSD = QCheckBox(self)
+        self.checkNRXStreamPSD.setText("Plot power spectral density")
+        self.checkNRXStreamPSD.setChecked(state.NRX_STREAM_PSD)
+
         self.nrxStreamPlotPointsLabel = QLabel(self)
         self.nrxStreamPlotPointsLabel.setText("Window points")
         self.nrxStreamPlotPoints = DoubleSpinBox(self)
-        self.nrxStreamPlotPoints.setRange(10, 1000)
+        self.nrxStreamPlotPoints.setRange(10, 1000000)
         self.nrxStreamPlotPoints.setDecimals(0)
         self.nrxStreamPlotPoints.setValue(state.NRX_STREAM_GRAPH_POINTS)
 
@@ -225,12 +408,24 @@ class StreamTabWidget(QScrollArea):
         layout.addWidget(
             self.checkNRXStreamPlot, 3, 0, alignment=Qt.AlignmentFlag.AlignCenter
         )
+        layout.addWidget(
+            self.checkNRXStreamRecord, 3, 1, alignment=Qt.AlignmentFlag.AlignCenter
+        )
         layout.addWidget(
             self.nrxStreamPlotPointsLabel, 4, 0, alignment=Qt.AlignmentFlag.AlignCenter
         )
         layout.addWidget(
             self.nrxStreamPlotPoints, 4, 1, alignment=Qt.AlignmentFlag.AlignCenter
         )
+        layout.addWidget(
+            self.checkNRXStreamStatistics,
+            5,
+            0,
+            alignment=Qt.AlignmentFlag.AlignCenter,
+        )
+        layout.addWidget(
+            self.checkNRXStreamPSD, 5, 1, alignment=Qt.AlignmentFlag.AlignCenter
+        )
         self.groupNRX.setLayout(layout)
 
     def createGroupKeithley(self):
@@ -302,7 +497,12 @@ class StreamTabWidget(QScrollArea):
         self.keithleyFreq.valueChanged.connect(self.freq2curr)
 
         self.btnKeithleyFreqSet = Button("Set frequency", animate=True)
-        self.btnKeithleyFreqSet.clicked.connect(self.keithley_set_current)
+        self.btnKeithleyFreqSet.clicked.connect(self.keithley_set_frequency)
+
+        self.checkKeithleyClosedLoop = QCheckBox(self)
+        self.checkKeithleyClosedLoop.setText("Closed loop (spectrum peak)")
+        self.checkKeithleyClosedLoop.setChecked(state.YIG_TUNE_CLOSED_LOOP)
+        self.keithleyTuneResponse = QLabel(self)
 
         layout.addWidget(
             self.keithleyVoltageGetLabel, 1, 0, alignment=Qt.AlignmentFlag.AlignCenter
@@ -333,6 +533,8 @@ class StreamTabWidget(QScrollArea):
         layout.addWidget(self.keithleyFreqLabel, 6, 0)
         layout.addWidget(self.keithleyFreq, 6, 1)
         layout.addWidget(self.btnKeithleyFreqSet, 6, 2)
+        layout.addWidget(self.checkKeithleyClosedLoop, 7, 0)
+        layout.addWidget(self.keithleyTuneResponse, 7, 1, 1, 2)
 
         self.groupKeithley.setLayout(layout)
 
@@ -358,7 +560,12 @@ class StreamTabWidget(QScrollArea):
         self.btnSetNiYigFreq.clicked.connect(self.setNiYigFreq)
 
         layout.addRow(self.niYigFreqLabel, self.niYigFreq)
+        self.checkNiYigClosedLoop = QCheckBox(self)
+        self.checkNiYigClosedLoop.setText("Closed loop (spectrum peak)")
+        self.checkNiYigClosedLoop.setChecked(state.YIG_TUNE_CLOSED_LOOP)
+
         layout.addRow(self.niDigitalResponseLabel, self.niDigitalResponse)
+        layout.addRow(self.checkNiYigClosedLoop)
         layout.addRow(self.btnSetNiYigFreq)
 
         self.groupNiYig.setLayout(layout)
@@ -374,11 +581,84 @@ class StreamTabWidget(QScrollArea):
         self.btnStopSpectrum.clicked.connect(lambda: self.spectrum_thread.terminate())
         self.btnStopSpectrum.setEnabled(False)
 
+        self.checkSpectrumWaterfall = QCheckBox(self)
+        self.checkSpectrumWaterfall.setText("Plot waterfall")
+        self.checkSpectrumWaterfall.setChecked(state.SPECTRUM_WATERFALL)
+
+        self.spectrumWaterfallDepthLabel = QLabel(self)
+        self.spectrumWaterfallDepthLabel.setText("Waterfall traces")
+        self.spectrumWaterfallDepth = DoubleSpinBox(self)
+        self.spectrumWaterfallDepth.setRange(10, 10000)
+        self.spectrumWaterfallDepth.setDecimals(0)
+        self.spectrumWaterfallDepth.setValue(state.SPECTRUM_WATERFALL_DEPTH)
+
+        self.spectrumAverageLabel = QLabel(self)
+        self.spectrumAverageLabel.setText("Averaging")
+        self.spectrumAverage = QComboBox(self)
+        self.spectrumAverage.addItems(AVERAGE_MODES)
+        self.spectrumAverage.setCurrentText(state.SPECTRUM_AVERAGE)
+
+        self.spectrumAverageCountLabel = QLabel(self)
+        self.spectrumAverageCountLabel.setText("Average traces")
+        self.spectrumAverageCount = DoubleSpinBox(self)
+        self.spectrumAverageCount.setRange(1, 10000)
+        self.spectrumAverageCount.setDecimals(0)
+        self.spectrumAverageCount.setValue(state.SPECTRUM_AVERAGE_COUNT)
+
+        self.spectrumHoldLabel = QLabel(self)
+        self.spectrumHoldLabel.setText("Hold")
+        self.spectrumHold = QComboBox(self)
+        self.spectrumHold.addItems(HOLD_MODES)
+        self.spectrumHold.setCurrentText(state.SPECTRUM_HOLD)
+
+        self.spectrumSmoothLabel = QLabel(self)
+        self.spectrumSmoothLabel.setText("Smoothing points")
+        self.spectrumSmooth = DoubleSpinBox(self)
+        self.spectrumSmooth.setRange(1, 1001)
+        self.spectrumSmooth.setDecimals(0)
+        self.spectrumSmooth.setValue(state.SPECTRUM_SMOOTH_POINTS)
+
+        self.spectrumBandsLabel = QLabel(self)
+        self.spectrumBandsLabel.setText("Band power, points (start-stop; ...)")
+        self.spectrumBands = QLineEdit(self)
+        self.spectrumBands.setText(
+            "; ".join(f"{start:g}-{stop:g}" for start, stop in state.SPECTRUM_BANDS)
+        )
+
         layout.addWidget(self.btnStartSpectrum)
         layout.addWidget(self.btnStopSpectrum)
+        layout.addWidget(self.spectrumAverageLabel)
+        layout.addWidget(self.spectrumAverage)
+        layout.addWidget(self.spectrumAverageCountLabel)
+        layout.addWidget(self.spectrumAverageCount)
+        layout.addWidget(self.spectrumHoldLabel)
+        layout.addWidget(self.spectrumHold)
+        layout.addWidget(self.spectrumSmoothLabel)
+        layout.addWidget(self.spectrumSmooth)
+        layout.addWidget(self.spectrumBandsLabel)
+        layout.addWidget(self.spectrumBands)
+        layout.addWidget(self.checkSpectrumWaterfall)
+        layout.addWidget(self.spectrumWaterfallDepthLabel)
+        layout.addWidget(self.spectrumWaterfallDepth)
         self.groupSpectrum.setLayout(layout)
 
     def startStreamSpectrum(self):
+        state.SPECTRUM_WATERFALL = self.checkSpectrumWaterfall.isChecked()
+        state.SPECTRUM_WATERFALL_DEPTH = int(self.spectrumWaterfallDepth.value())
+        state.SPECTRUM_AVERAGE = self.spectrumAverage.currentText()
+        state.SPECTRUM_AVERAGE_COUNT = int(self.spectrumAverageCount.value())
+        state.SPECTRUM_HOLD = self.spectrumHold.currentText()
+        state.SPECTRUM_SMOOTH_POINTS = int(self.spectrumSmooth.value())
+        try:
+            state.SPECTRUM_BANDS = self.parse_bands(self.spectrumBands.text())
+        except ValueError as e:
+            logger.error(f"[{self.__class__.__name__}.startStreamSpectrum] {e}")
+            return
+        if self.is_running(self.yig_tune_thread):
+            logger.warning(
+                f"[{self.__class__.__name__}.startStreamSpectrum] YIG tuning is running"
+            )
+            return
         self.spectrum_thread = SpectrumThread()
         self.spectrum_thread.data.connect(self.show_spectrum)
         self.spectrum_thread.start()
@@ -391,15 +671,71 @@ class StreamTabWidget(QScrollArea):
             lambda: self.btnStopSpectrum.setEnabled(False)
         )
 
+    @staticmethod
+    def parse_bands(text: str) -> List[Tuple[float, float]]:
+        """'start-stop; start-stop' into [(start, stop), ...]"""
+        bands = []
+        for band in text.split(";"):
+            if not band.strip():
+                continue
+            start, stop = band.split("-")
+            bands.append((float(start), float(stop)))
+        return bands
+
     def show_spectrum(self, data: Dict):
         if self.spectrumStreamGraphWindow is None:
             self.spectrumStreamGraphWindow = SpectrumGraphWindow()
 
-        self.spectrumStreamGraphWindow.plotNew(x=data["x"], y=data["y"])
+        self.spectrumStreamGraphWindow.plotNew(
+            x=data["x"], y=data["y"], hold=data.get("hold"), bands=data.get("bands")
+        )
         self.spectrumStreamGraphWindow.show()
+        if state.SPECTRUM_WATERFALL:
+            self.show_spectrum_waterfall(data)
+
+    def show_spectrum_waterfall(self, data: Dict):
+        if self.spectrumWaterfallWindow is None:
+            self.spectrumWaterfallWindow = SpectrumWaterfallWindow()
+        self.spectrumWaterfallWindow.plotNew(x=data["x"], y=data["y"])
+        if not self.spectrumWaterfallWindow.isVisible():
+            self.spectrumWaterfallWindow.show()
+
+    @staticmethod
+    def is_running(thread: QThread) -> bool:
+        return thread is not None and thread.isRunning()
+
+    def tune_yig(self, yig: str, frequency: float, button: Button, label: QLabel):
+        if self.is_running(self.spectrum_thread):
+            # the tuner reads the spectrum analyzer on the same GPIB bus
+            label.setText("Stop the spectrum stream first")
+            return
+        self.yig_tune_thread = YigTuneThread(yig=yig, frequency=frequency)
+        self.yig_tune_thread.response.connect(label.setText)
+        self.yig_tune_thread.finished.connect(lambda: button.setEnabled(True))
+        self.yig_tune_thread.start()
+        button.setEnabled(False)
+
+    def keithley_set_frequency(self):
+        if not self.checkKeithleyClosedLoop.isChecked():
+            self.keithley_set_current()
+            return
+        self.tune_yig(
+            "analog",
+            self.keithleyFreq.value() * 1e9,
+            self.btnKeithleyFreqSet,
+            self.keithleyTuneResponse,
+        )
 
     def setNiYigFreq(self):
         state.DIGITAL_YIG_FREQ = self.niYigFreq.value()
+        if self.checkNiYigClosedLoop.isChecked():
+            self.tune_yig(
+                "digital",
+                state.DIGITAL_YIG_FREQ * 1e9,
+                self.btnSetNiYigFreq,
+                self.niDigitalResponse,
+            )
+            return
         self.set_digital_yig_freq_thread = DigitalYigThread()
         self.set_digital_yig_freq_thread.finished.connect(
             lambda: self.btnSetNiYigFreq.setEnabled(True)
@@ -423,12 +759,12 @@ class StreamTabWidget(QScrollArea):
         )
 
     def curr2freq(self):
-        freq = linear(self.keithleyCurrentSet.value(), *state.CALIBRATION_CURR_2_FREQ)
+        freq = float(analog_calibration().frequency(self.keithleyCurrentSet.value()))
         value = round(freq / 1e9, 2)
         self.keithleyFreq.setValue(value)
 
     def freq2curr(self):
-        curr = linear(self.keithleyFreq.value() * 1e9, *state.CALIBRATION_FREQ_2_CURR)
+        curr = float(analog_calibration().control(self.keithleyFreq.value() * 1e9))
         value = round(curr, 4)
         self.keithleyCurrentSet.setValue(value)
 
@@ -475,9 +811,14 @@ class StreamTabWidget(QScrollArea):
 
         state.NRX_STREAM_THREAD = True
         state.NRX_STREAM_PLOT_GRAPH = self.checkNRXStreamPlot.isChecked()
+        state.NRX_STREAM_RECORD = self.checkNRXStreamRecord.isChecked()
+        state.NRX_STREAM_STATISTICS = self.checkNRXStreamStatistics.isChecked()
+        state.NRX_STREAM_PSD = self.checkNRXStreamPSD.isChecked()
         state.NRX_STREAM_GRAPH_POINTS = int(self.nrxStreamPlotPoints.value())
 
         self.nrx_stream_thread.meas.connect(self.update_nrx_stream_values)
+        self.nrx_stream_thread.statistics.connect(self.show_power_stream_statistics)
+        self.nrx_stream_thread.psd.connect(self.show_power_stream_psd)
         self.nrx_stream_thread.start()
 
         self.btnStartStreamNRX.setEnabled(False)
@@ -494,7 +835,20 @@ class StreamTabWidget(QScrollArea):
         if self.powerStreamGraphWindow is None:
             self.powerStreamGraphWindow = NRXStreamGraphWindow()
         self.powerStreamGraphWindow.plotNew(x=x, y=y, reset_data=reset)
-        self.powerStreamGraphWindow.show()
+        if not self.powerStreamGraphWindow.isVisible():
+            self.powerStreamGraphWindow.show()
+
+    def show_power_stream_statistics(self, statistics: dict):
+        if self.powerStreamStatisticsWindow is None:
+            self.powerStreamStatisticsWindow = NRXStreamStatisticsWindow()
+        self.powerStreamStatisticsWindow.plotNew(statistics)
+        self.powerStreamStatisticsWindow.show()
+
+    def show_power_stream_psd(self, psd: dict):
+        if self.powerStreamPSDWindow is None:
+            self.powerStreamPSDWindow = NRXStreamPSDWindow()
+        self.powerStreamPSDWindow.plotNew(psd)
+        self.powerStreamPSDWindow.show()
 
     def update_nrx_stream_values(self, measure: dict):
         self.nrxPower.setText(f"{round(measure.get('power'), 3)}")
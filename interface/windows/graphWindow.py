@@ -1,17 +1,29 @@
 import logging
-from collections import defaultdict
-from typing import Iterable
+from typing import Dict, Iterable
 
+import numpy as np
 from PyQt6 import QtGui
-from PyQt6.QtWidgets import QWidget, QVBoxLayout
+from PyQt6.QtCore import QTimer
+from PyQt6.QtWidgets import QWidget, QVBoxLayout, QCheckBox, QLabel
 import pyqtgraph as pg
 
+from interface.components.MultiCurveItem import MultiCurveItem
 from interface.components.ui.Button import Button
+from store.state import state
+from utils.buffers import GrowableArray
+from utils.decimation import MinMaxPyramid
 
 logger = logging.getLogger(__name__)
 
 
 class GraphWindow(QWidget):
+    """Datasets are buffered in growable arrays, incoming points only mark them dirty.
+    Dirty datasets are redrawn on a timer, one setData per dataset per frame.
+    Only the visible part of a dataset is drawn, decimated with a min/max pyramid
+    to about two points per pixel, symbols are dropped for dense curves.
+    In overlay mode all datasets are packed into one MultiCurveItem.
+    """
+
     window_title = "Graph"
     graph_title = "Base Graph"
     y_label = "y label"
@@ -25,9 +37,23 @@ class GraphWindow(QWidget):
         self.graphWidget = pg.PlotWidget()
         self.btnRemoveGraphs = Button("Remove hidden graphs")
         self.btnRemoveGraphs.clicked.connect(self.remove_hidden_graphs)
+        self.checkOverlay = QCheckBox("Overlay curves (hover to highlight)")
+        self.checkOverlay.toggled.connect(self.setOverlay)
+        self.overlayLabel = QLabel(self)
         layout.addWidget(self.btnRemoveGraphs)
+        layout.addWidget(self.checkOverlay)
+        layout.addWidget(self.overlayLabel)
         layout.addWidget(self.graphWidget)
-        self.datasets = defaultdict(dict)
+        self.datasets: Dict[int, GrowableArray] = {}
+        self.curves: Dict[int, pg.PlotDataItem] = {}
+        self.pyramids: Dict[int, MinMaxPyramid] = {}
+        self.dirty = set()
+        self.last_ds_id = 0
+        self.overlay = None
+        self.overlay_ids = []
+        self.timer = QTimer(self)
+        self.timer.timeout.connect(self.redraw)
+        self.timer.start(state.GRAPH_REDRAW_INTERVAL)
         self.prepare()
         self.setLayout(layout)
 
@@ -39,53 +65,111 @@ class GraphWindow(QWidget):
         self.graphWidget.setLabel("bottom", self.x_label, **styles)
         self.graphWidget.addLegend()
         self.graphWidget.showGrid(x=True, y=True)
+        self.graphWidget.getPlotItem().getViewBox().sigXRangeChanged.connect(
+            lambda: self.dirty.update(self.datasets)
+        )
 
     def plotGraph(self, ds_id: int = 1):
-        try:
-            x = self.datasets[ds_id]["x"]
-            y = self.datasets[ds_id]["y"]
-        except (IndexError, KeyError) as e:
-            logger.error(f"Plot graph Error: {e}")
+        dataset = self.datasets.get(ds_id)
+        if dataset is None:
+            logger.error(f"Plot graph Error: no dataset {ds_id}")
             return
+        curve = self.curves.get(ds_id)
+        if curve is None:
+            pen = pg.mkPen(color=pg.intColor(ds_id * 10, 100))
+            curve = self.graphWidget.plot(
+                [], [], name=f"{ds_id}", pen=pen, symbolSize=5, symbolBrush=pen.color()
+            )
+            self.curves[ds_id] = curve
+        x, y, dense = self.visiblePoints(ds_id)
+        curve.setData(x, y)
+        symbol = None if dense else "o"
+        if curve.opts["symbol"] != symbol:
+            curve.setSymbol(symbol)
 
-        plotItem = self.graphWidget.getPlotItem()
-        items = {int(item.name()): item for item in plotItem.items}
-        if items.get(ds_id):
-            items.get(ds_id).setData(x, y)
-            return
+    def visiblePoints(self, ds_id: int):
+        """Points of the dataset in the visible x range decimated to the plot width,
+        dense means too many points to draw symbols
+        """
+        data = self.datasets[ds_id].view()
+        x, y = data[:, 0], data[:, 1]
+        pyramid = self.pyramids.setdefault(ds_id, MinMaxPyramid())
+        pyramid.update(x, y)
+        viewBox = self.graphWidget.getPlotItem().getViewBox()
+        lo, hi = -np.inf, np.inf
+        if not viewBox.autoRangeEnabled()[0]:
+            lo, hi = viewBox.viewRange()[0]
+        max_points = 2 * max(int(viewBox.width()), state.GRAPH_MIN_WIDTH)
+        x, y, decimated = pyramid.decimate(x, y, lo, hi, max_points)
+        return x, y, decimated or len(x) > state.GRAPH_SYMBOL_MAX_POINTS
 
-        pen = pg.mkPen(color=pg.intColor(ds_id * 10, 100))
-        self.graphWidget.plot(
-            x, y, name=f"{ds_id}", pen=pen, symbolSize=5, symbolBrush=pen.color()
+    def plotOverlay(self) -> None:
+        """All datasets as one MultiCurveItem colour mapped by dataset order"""
+        if self.overlay is None:
+            self.overlay = MultiCurveItem()
+            self.overlay.sigCurveHovered.connect(self.showHovered)
+            self.graphWidget.addItem(self.overlay)
+        self.overlay_ids = sorted(self.datasets)
+        self.overlay.setCurves(
+            [self.visiblePoints(ds_id)[:2] for ds_id in self.overlay_ids]
         )
 
+    def showHovered(self, index) -> None:
+        if index is None:
+            self.overlayLabel.setText("")
+            return
+        self.overlayLabel.setText(f"Dataset {self.overlay_ids[index]}")
+
+    def setOverlay(self, enabled: bool) -> None:
+        """Switch between one curve per dataset and a single overlay item"""
+        plotItem = self.graphWidget.getPlotItem()
+        for curve in self.curves.values():
+            plotItem.removeItem(curve)
+        self.curves = {}
+        if self.overlay is not None:
+            plotItem.removeItem(self.overlay)
+            self.overlay = None
+        self.showHovered(None)
+        self.dirty.update(self.datasets)
+
+    def redraw(self) -> None:
+        dirty, self.dirty = self.dirty, set()
+        if self.checkOverlay.isChecked():
+            if dirty:
+                self.plotOverlay()
+            return
+        for ds_id in sorted(dirty):
+            self.plotGraph(ds_id)
+
     def addData(self, x: Iterable, y: Iterable, new_plot: bool = True) -> int:
-        ds_id = max(self.datasets.keys(), default=0)
         if new_plot:
-            ds_id += 1
-        if not self.datasets[ds_id].get("x"):
-            self.datasets[ds_id]["x"] = x
-        else:
-            self.datasets[ds_id]["x"].extend(x)
-        if not self.datasets[ds_id].get("y"):
-            self.datasets[ds_id]["y"] = y
-        else:
-            self.datasets[ds_id]["y"].extend(y)
+            self.last_ds_id += 1
+        ds_id = self.last_ds_id
+        if ds_id not in self.datasets:
+            self.datasets[ds_id] = GrowableArray(columns=2)
+        self.datasets[ds_id].extend(np.column_stack((x, y)))
+        self.dirty.add(ds_id)
         return ds_id
 
+    def setData(self, x: Iterable, y: Iterable, ds_id: int = 1) -> None:
+        """Replace dataset ds_id"""
+        self.last_ds_id = max(self.last_ds_id, ds_id)
+        dataset = self.datasets.setdefault(ds_id, GrowableArray(columns=2))
+        dataset.clear()
+        self.pyramids.pop(ds_id, None)
+        dataset.extend(np.column_stack((x, y)))
+        self.dirty.add(ds_id)
+
     def plotNew(self, x: Iterable, y: Iterable, new_plot: bool = True) -> int:
-        ds_id = self.addData(x, y, new_plot)
-        self.plotGraph(ds_id)
-        return ds_id
+        return self.addData(x, y, new_plot)
 
     def remove_hidden_graphs(self):
         plotItem = self.graphWidget.getPlotItem()
-        items_to_remove = {
-            int(item.name()): item for item in plotItem.items if not item.isVisible()
-        }
-        for item in items_to_remove.values():
-            plotItem.removeItem(item)
-        self.datasets = defaultdict(dict)
-        for ds_id, ds in self.datasets.items():
-            if ds_id not in items_to_remove.keys():
-                self.datasets[ds_id] = ds
+        for ds_id, curve in list(self.curves.items()):
+            if curve.isVisible():
+                continue
+            plotItem.removeItem(curve)
+            del self.curves[ds_id]
+            del self.datasets[ds_id]
+            self.pyramids.pop(ds_id, None)
+            self.dirty.discard(ds_id)
@@ -1,12 +1,19 @@
+import numpy as np
 from PyQt6 import QtGui
-from PyQt6.QtWidgets import QWidget, QVBoxLayout
+from PyQt6.QtCore import QTimer
+from PyQt6.QtWidgets import QWidget, QVBoxLayout, QLabel
 import pyqtgraph as pg
 
 from store.state import state
-from utils.logger import logger
+from utils.buffers import RingBuffer
 
 
 class NRXStreamGraphWindow(QWidget):
+    """Stream time line backed by a fixed size ring buffer.
+    Samples are only appended on arrival, the curve is redrawn on a timer
+    with a contiguous view of the buffer, so the redraw rate doesn't follow the NRX rate.
+    """
+
     window_title = "Power Meter Stream Graph"
     graph_title = "Power (time)"
     y_label = "Power, dBm"
@@ -19,7 +26,11 @@ class NRXStreamGraphWindow(QWidget):
         layout = QVBoxLayout()
         self.graphWidget = pg.PlotWidget()
         layout.addWidget(self.graphWidget)
-        self.dataset = {"y": [], "x": []}
+        self.buffer = RingBuffer(state.NRX_STREAM_GRAPH_POINTS, columns=2)  # x, y
+        self.dirty = False
+        self.timer = QTimer(self)
+        self.timer.timeout.connect(self.plotGraph)
+        self.timer.start(state.GRAPH_REDRAW_INTERVAL)
         self.prepare()
         self.setLayout(layout)
 
@@ -31,39 +42,98 @@ class NRXStreamGraphWindow(QWidget):
         self.graphWidget.setLabel("bottom", self.x_label, **styles)
         self.graphWidget.addLegend()
         self.graphWidget.showGrid(x=True, y=True)
+        plotItem = self.graphWidget.getPlotItem()
+        plotItem.setClipToView(True)
+        plotItem.setDownsampling(auto=True, mode="peak")
+        pen = pg.mkPen(color="#0000FF")
+        self.curve = self.graphWidget.plot([], [], name="Stream", pen=pen)
 
     def plotGraph(self) -> None:
-        try:
-            x = self.dataset["x"]
-            y = self.dataset["y"]
-        except (IndexError, KeyError) as e:
-            logger.error(f"Plot graph Error: {e}")
+        if not self.dirty:
             return
+        self.dirty = False
+        data = self.buffer.view()
+        self.curve.setData(data[:, 0], data[:, 1])
 
-        plotItem = self.graphWidget.getPlotItem()
-        items = {item.name(): item for item in plotItem.items}
-        if items.get("Stream"):
-            items.get("Stream").setData(x, y)
-            return
+    def addData(self, x: float, y: float, reset_data: bool = True) -> None:
+        if reset_data:
+            if self.buffer.capacity != state.NRX_STREAM_GRAPH_POINTS:
+                self.buffer = RingBuffer(state.NRX_STREAM_GRAPH_POINTS, columns=2)
+            self.buffer.clear()
+        self.buffer.append((x, y))
+        self.dirty = True
+
+    def plotNew(self, x: float, y: float, reset_data: bool = True) -> None:
+        self.addData(x=x, y=y, reset_data=reset_data)
 
+
+class NRXStreamStatisticsWindow(QWidget):
+    window_title = "Power Meter Stream Statistics"
+    graph_title = "Allan deviation"
+    y_label = "Allan deviation, dB"
+    x_label = "Averaging time, s"
+
+    def __init__(self):
+        super().__init__()
+        self.setWindowIcon(QtGui.QIcon("./assets/logo_small.ico"))
+        self.setWindowTitle(self.window_title)
+        layout = QVBoxLayout()
+        self.summary = QLabel(self)
+        self.graphWidget = pg.PlotWidget()
+        layout.addWidget(self.summary)
+        layout.addWidget(self.graphWidget)
+        self.prepare()
+        self.setLayout(layout)
+
+    def prepare(self) -> None:
+        self.graphWidget.setBackground("w")
+        self.graphWidget.setTitle(self.graph_title, color="#413C58", size="20pt")
+        styles = {"color": "#413C58", "font-size": "15px"}
+        self.graphWidget.setLabel("left", self.y_label, **styles)
+        self.graphWidget.setLabel("bottom", self.x_label, **styles)
+        self.graphWidget.setLogMode(x=True, y=True)
+        self.graphWidget.showGrid(x=True, y=True)
         pen = pg.mkPen(color="#0000FF")
-        self.graphWidget.plot(
-            x, y, name="Stream", pen=pen, symbolSize=5, symbolBrush=pen.color()
+        self.curve = self.graphWidget.plot(
+            [], [], pen=pen, symbolSize=5, symbolBrush=pen.color()
         )
 
-    def addData(self, x: float, y: float, reset_data: bool = True) -> None:
-        if reset_data:
-            self.dataset["y"] = [y]
-            self.dataset["x"] = [x]
-            return
+    def plotNew(self, statistics: dict) -> None:
+        tau = statistics.get("tau", [])
+        adev = statistics.get("adev", [])
+        positive = adev > 0
+        self.curve.setData(tau[positive], adev[positive])
+        self.summary.setText(
+            f"Points: {statistics['count']}; "
+            f"Mean: {statistics['mean']:.4f} dBm; "
+            f"Std: {statistics['std']:.4f} dB; "
+            f"Min/Max: {statistics['min']:.4f}/{statistics['max']:.4f} dBm; "
+            f"Drift: {statistics['drift'] * 3600:.4f} dB/h"
+        )
 
-        if len(self.dataset["y"]) == state.NRX_STREAM_GRAPH_POINTS:
-            del self.dataset["y"][0]
-            del self.dataset["x"][0]
 
-        self.dataset["y"].append(y)
-        self.dataset["x"].append(x)
+class NRXStreamPSDWindow(NRXStreamStatisticsWindow):
+    window_title = "Power Meter Stream Spectrum"
+    graph_title = "Power spectral density"
+    y_label = "PSD, dB^2/Hz"
+    x_label = "Frequency, Hz"
 
-    def plotNew(self, x: float, y: float, reset_data: bool = True) -> None:
-        self.addData(x=x, y=y, reset_data=reset_data)
-        self.plotGraph()
+    def prepare(self) -> None:
+        super().prepare()
+        self.graphWidget.setLogMode(x=False, y=True)
+        self.curve.setSymbol(None)
+
+    def plotNew(self, psd: dict) -> None:
+        frequency = psd["frequency"][1:]
+        density = psd["psd"][1:]
+        positive = density > 0
+        self.curve.setData(frequency[positive], density[positive])
+        if not positive.any():
+            return
+        peak = np.argmax(np.where(positive, density, 0))
+        self.summary.setText(
+            f"Segments: {psd['segments']}; "
+            f"Sample rate: {psd['fs']:.3f} Hz; "
+            f"Strongest tone: {frequency[peak]:.4f} Hz "
+            f"({density[peak]:.3e} dB^2/Hz)"
+        )
@@ -1,9 +1,13 @@
 from typing import List
 
+import numpy as np
 from PyQt6 import QtGui
-from PyQt6.QtWidgets import QWidget, QVBoxLayout
+from PyQt6.QtCore import QRectF
+from PyQt6.QtWidgets import QWidget, QVBoxLayout, QLabel
 import pyqtgraph as pg
 
+from interface.components.TiledImageItem import TiledImageItem, axis_span
+from store.state import state
 from utils.logger import logger
 
 
@@ -18,9 +22,12 @@ class SpectrumGraphWindow(QWidget):
         self.setWindowIcon(QtGui.QIcon("./assets/logo_small.ico"))
         self.setWindowTitle(self.window_title)
         layout = QVBoxLayout()
+        self.summary = QLabel(self)
         self.graphWidget = pg.PlotWidget()
+        layout.addWidget(self.summary)
         layout.addWidget(self.graphWidget)
         self.dataset = {"y": [], "x": []}
+        self.holdCurve = None
         self.prepare()
         self.setLayout(layout)
 
@@ -56,6 +63,90 @@ class SpectrumGraphWindow(QWidget):
         self.dataset["y"] = y
         self.dataset["x"] = x
 
-    def plotNew(self, x: List, y: List) -> None:
+    def plotHold(self, x: List, hold: List = None) -> None:
+        if hold is None:
+            if self.holdCurve is not None:
+                self.holdCurve.setData([], [])
+            return
+        if self.holdCurve is None:
+            self.holdCurve = self.graphWidget.plot(
+                [], [], name="Hold", pen=pg.mkPen(color="#FF0000")
+            )
+        self.holdCurve.setData(x, hold)
+
+    def plotNew(self, x: List, y: List, hold: List = None, bands: List = None) -> None:
         self.addData(x=x, y=y)
         self.plotGraph()
+        self.plotHold(x, hold)
+        if bands is not None:
+            self.summary.setText(
+                "Band power: "
+                + "; ".join(f"{power:.2f} dBm" for power in np.asarray(bands))
+            )
+
+
+class SpectrumWaterfallWindow(QWidget):
+    """Spectrum traces over time in a circular image of state.SPECTRUM_WATERFALL_DEPTH rows.
+    A new trace overwrites the oldest row and only the band of rows holding it
+    is re-rendered, the line marks the newest trace.
+    """
+
+    window_title = "Spectrum waterfall"
+    graph_title = "Spectrum (trace)"
+    y_label = "Trace slot"
+    x_label = "Frequency, Hz"
+
+    def __init__(self):
+        super().__init__()
+        self.setWindowIcon(QtGui.QIcon("./assets/logo_small.ico"))
+        self.setWindowTitle(self.window_title)
+        layout = QVBoxLayout()
+        self.graphWidget = pg.PlotWidget()
+        layout.addWidget(self.graphWidget)
+        self.image = None
+        self.x = None
+        self.count = 0
+        self.colorBar = pg.ColorBarItem(
+            colorMap="viridis", interactive=False, label="Power, dB"
+        )
+        self.newest = pg.InfiniteLine(angle=0, pen=pg.mkPen(color="#FF0000"))
+        self.prepare()
+        self.setLayout(layout)
+
+    def prepare(self) -> None:
+        self.graphWidget.setBackground("w")
+        self.graphWidget.setTitle(self.graph_title, color="#413C58", size="20pt")
+        styles = {"color": "#413C58", "font-size": "15px"}
+        self.graphWidget.setLabel("left", self.y_label, **styles)
+        self.graphWidget.setLabel("bottom", self.x_label, **styles)
+        self.colorBar.setImageItem([], insert_in=self.graphWidget.getPlotItem())
+        self.graphWidget.addItem(self.newest)
+
+    def setAxis(self, x: List) -> None:
+        plotItem = self.graphWidget.getPlotItem()
+        if self.image is not None:
+            plotItem.removeItem(self.image)
+        self.x = np.asarray(x, dtype=float)
+        self.count = 0
+        depth = state.SPECTRUM_WATERFALL_DEPTH
+        start, width = axis_span(self.x)
+        self.image = TiledImageItem(
+            shape=(depth, len(self.x)),
+            rect=QRectF(start, 0, width, depth),
+        )
+        self.image.sigLevelsChanged.connect(self.colorBar.setLevels)
+        plotItem.addItem(self.image)
+        plotItem.setRange(rect=self.image.rect, padding=0)
+
+    def plotNew(self, x: List, y: List) -> None:
+        if (
+            self.image is None
+            or len(x) != len(self.x)
+            or self.image.shape[0] != state.SPECTRUM_WATERFALL_DEPTH
+            or not np.array_equal(x, self.x)
+        ):
+            self.setAxis(x)
+        row = self.count % self.image.shape[0]
+        self.image.setRows(row, y)
+        self.newest.setValue(row + 1)
+        self.count += 1
@@ -1,3 +1,5 @@
+from typing import Iterable
+
 from interface.windows.graphWindow import GraphWindow
 
 
@@ -13,3 +15,21 @@ class IFPowerDiffGraphWindow(GraphWindow):
     graph_title = "Power (IF)"
     x_label = "IF, GHz"
     y_label = "Power, dBm"
+
+
+class NoiseTemperatureGraphWindow(GraphWindow):
+    window_title = "Noise temperature Graphs"
+    graph_title = "Noise temperature (IF)"
+    x_label = "IF, GHz"
+    y_label = "Noise temperature, K"
+
+
+class RunningAverageGraphWindow(GraphWindow):
+    window_title = "Running average P-IF Graphs"
+    graph_title = "Running average power (IF)"
+    x_label = "IF, GHz"
+    y_label = "Power, dBm"
+
+    def plotAverage(self, x: Iterable, y: Iterable, ds_id: int = 1) -> None:
+        """Replace dataset ds_id with the actual running average"""
+        self.setData(x, y, ds_id)
@@ -0,0 +1,56 @@
+from typing import Sequence
+
+import pyqtgraph as pg
+from PyQt6 import QtGui
+from PyQt6.QtCore import QRectF
+from PyQt6.QtWidgets import QWidget, QVBoxLayout
+
+from interface.components.TiledImageItem import TiledImageItem, axis_span
+
+
+class TuningMapWindow(QWidget):
+    window_title = "Tuning map"
+    graph_title = "Power (current, frequency)"
+    y_label = "Current, A"
+    x_label = "Frequency, GHz"
+
+    def __init__(self):
+        super().__init__()
+        self.setWindowIcon(QtGui.QIcon("./assets/logo_small.ico"))
+        self.setWindowTitle(self.window_title)
+        layout = QVBoxLayout()
+        self.graphWidget = pg.PlotWidget()
+        layout.addWidget(self.graphWidget)
+        self.image = None
+        self.colorBar = pg.ColorBarItem(
+            colorMap="viridis", interactive=False, label="Power, dBm"
+        )
+        self.prepare()
+        self.setLayout(layout)
+
+    def prepare(self) -> None:
+        self.graphWidget.setBackground("w")
+        self.graphWidget.setTitle(self.graph_title, color="#413C58", size="20pt")
+        styles = {"color": "#413C58", "font-size": "15px"}
+        self.graphWidget.setLabel("left", self.y_label, **styles)
+        self.graphWidget.setLabel("bottom", self.x_label, **styles)
+        self.colorBar.setImageItem([], insert_in=self.graphWidget.getPlotItem())
+
+    def setAxes(self, current: Sequence, frequency: Sequence) -> None:
+        plotItem = self.graphWidget.getPlotItem()
+        if self.image is not None:
+            plotItem.removeItem(self.image)
+        x, width = axis_span(frequency)
+        y, height = axis_span(current)
+        self.image = TiledImageItem(
+            shape=(len(current), len(frequency)),
+            rect=QRectF(x, y, width, height),
+        )
+        self.image.sigLevelsChanged.connect(self.colorBar.setLevels)
+        plotItem.addItem(self.image)
+        plotItem.setRange(rect=self.image.rect, padding=0)
+
+    def updateRows(self, start: int, data: Sequence) -> None:
+        if self.image is None:
+            return
+        self.image.setRows(start, data)
@@ -10,14 +10,20 @@ from PyQt6.QtWidgets import QFileDialog
 
 class MeasureType:
     CHOPPER_IF_POWER = "chopper_if_power"
+    CHOPPER_LOCKIN_IF_POWER = "chopper_lockin_if_power"
     IF_POWER = "if_power"
     POWER_STREAM = "power_stream"
+    REPEATED_IF_POWER = "repeated_if_power"
+    TUNING_MAP = "tuning_map"
 
     CHOICES = dict(
         (
             (CHOPPER_IF_POWER, "Chopper IF power"),
+            (CHOPPER_LOCKIN_IF_POWER, "Chopper lock-in IF power"),
             (IF_POWER, "IF power"),
             (POWER_STREAM, "Power stream"),
+            (REPEATED_IF_POWER, "Repeated IF power"),
+            (TUNING_MAP, "Tuning map"),
         )
     )
 
@@ -95,6 +101,8 @@ class MeasureManager:
     def save_by_index(cls, index: int) -> None:
         measure = cls.all()[index]
         results = measure.data
+        if hasattr(results, "to_dict"):
+            results = results.to_dict()
         caption = f"Saving {measure.type_display}_{measure.finished.__str__()}"
         try:
             filepath = QFileDialog.getSaveFileName(filter="*.json", caption=caption)[0]
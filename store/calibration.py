@@ -0,0 +1,20 @@
+from store.state import state
+from utils.calibration import CalibrationModel
+
+
+def analog_calibration() -> CalibrationModel:
+    """Fitted analog YIG (current, A) model, the linear fits otherwise"""
+    if state.CALIBRATION_ANALOG_MODEL is not None:
+        return state.CALIBRATION_ANALOG_MODEL
+    return CalibrationModel.linear(
+        state.CALIBRATION_CURR_2_FREQ, state.CALIBRATION_FREQ_2_CURR
+    )
+
+
+def digital_calibration() -> CalibrationModel:
+    """Fitted digital YIG (DAC code) model, the linear fits otherwise"""
+    if state.CALIBRATION_DIGITAL_MODEL is not None:
+        return state.CALIBRATION_DIGITAL_MODEL
+    return CalibrationModel.linear(
+        state.CALIBRATION_DIGITAL_POINT_2_FREQ, state.CALIBRATION_DIGITAL_FREQ_2_POINT
+    )
@@ -0,0 +1,132 @@
+import json
+import logging
+import os
+import time
+from typing import Dict, List, Tuple
+
+from store.results import SweepResults
+from store.state import state
+
+logger = logging.getLogger(__name__)
+
+
+class SweepJournal:
+    """Append-only JSON lines journal of a sweep.
+    The first record is a header with the sweep configuration,
+    every next one is a completed point with all its samples.
+    Records are flushed and fsync'ed in batches (every sync_points records
+    or sync_interval seconds), so a crash loses at most one batch.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        sync_interval: float = state.JOURNAL_SYNC_INTERVAL,
+        sync_points: int = state.JOURNAL_SYNC_POINTS,
+    ):
+        self.path = path
+        self.sync_interval = sync_interval
+        self.sync_points = sync_points
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.repair(path)
+        self.file = open(path, "a", encoding="utf-8")
+        self.pending = 0
+        self.last_sync = time.time()
+
+    @staticmethod
+    def repair(path: str) -> None:
+        """Truncate a torn last line (crash while writing), so appending
+        starts on a new line
+        """
+        if not os.path.exists(path):
+            return
+        with open(path, "rb+") as file:
+            size = file.seek(0, os.SEEK_END)
+            if not size:
+                return
+            file.seek(size - 1)
+            if file.read(1) == b"\n":
+                return
+            position = size
+            while position > 0:
+                chunk = min(4096, position)
+                file.seek(position - chunk)
+                end = file.read(chunk).rfind(b"\n")
+                if end >= 0:
+                    position = position - chunk + end + 1
+                    break
+                position -= chunk
+            logger.warning(
+                f"[SweepJournal.repair] Truncated torn last record of '{path}'"
+            )
+            file.truncate(position)
+
+    def write(self, record: Dict) -> None:
+        self.file.write(json.dumps(record) + "\n")
+        self.pending += 1
+        if (
+            self.pending >= self.sync_points
+            or time.time() - self.last_sync >= self.sync_interval
+        ):
+            self.sync()
+
+    def write_header(self, **config) -> None:
+        self.write({"type": "header", **config})
+        self.sync()
+
+    def append_point(self, index: Tuple, results: SweepResults) -> None:
+        self.write(
+            {
+                "type": "point",
+                "index": [int(ind) for ind in index],
+                "values": {
+                    channel: values[index].tolist()
+                    for channel, values in results.data.items()
+                },
+            }
+        )
+
+    def sync(self) -> None:
+        if self.file.closed:
+            return
+        self.file.flush()
+        os.fsync(self.file.fileno())
+        self.pending = 0
+        self.last_sync = time.time()
+
+    def close(self) -> None:
+        self.sync()
+        self.file.close()
+
+    @staticmethod
+    def read(path: str) -> Tuple[Dict, List[Dict]]:
+        """Header and points, a truncated last record (crash while writing) is skipped"""
+        header = None
+        points = []
+        with open(path, "r", encoding="utf-8") as file:
+            for line_ind, line in enumerate(file, 1):
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError as e:
+                    logger.warning(f"[SweepJournal.read][Line {line_ind}] {e}")
+                    continue
+                if record.get("type") == "header":
+                    header = record
+                elif record.get("type") == "point":
+                    points.append(record)
+        if header is None:
+            raise ValueError(f"Journal '{path}' has no header")
+        return header, points
+
+    @staticmethod
+    def restore(points: List[Dict], results: SweepResults) -> int:
+        """Fill results with journaled points, returns restored points count"""
+        for point in points:
+            index = tuple(point["index"])
+            for channel, values in point["values"].items():
+                if channel in results.data:
+                    results.data[channel][index][: len(values)] = values
+            results.complete(index)
+        return len(points)
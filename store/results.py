@@ -0,0 +1,309 @@
+import json
+import os
+from typing import Dict, List, Sequence, Tuple, Union
+
+import numpy as np
+
+from utils.functions import noise_temperature, y_factor
+from utils.statistics import RunningStatistics
+
+
+class SweepResults:
+    """Columnar sweep storage.
+    Every channel is one preallocated array shaped (*axes, samples) filled with NaN,
+    so a measurement loop only writes numbers into existing memory.
+    """
+
+    def __init__(
+        self,
+        axes: Dict[str, Sequence],
+        samples: int = 1,
+        channels: Sequence[str] = ("power",),
+        dtype=float,
+    ):
+        self.axes = {name: np.asarray(values) for name, values in axes.items()}
+        self.shape = tuple(len(values) for values in self.axes.values())
+        self.samples = int(samples)
+        self.data = {
+            channel: np.full(self.shape + (self.samples,), np.nan, dtype=dtype)
+            for channel in channels
+        }
+        self.completed = np.zeros(self.shape, dtype=bool)
+
+    @property
+    def size(self) -> int:
+        return int(np.prod(self.shape))
+
+    def axis(self, name: str) -> np.ndarray:
+        return self.axes[name]
+
+    def set(self, index: Tuple, sample: int = 0, **values) -> None:
+        for channel, value in values.items():
+            self.data[channel][index + (sample,)] = np.nan if value is None else value
+
+    def complete(self, index: Tuple) -> None:
+        self.completed[index] = True
+
+    def mean(
+        self, channel: str = "power", index: Tuple = ()
+    ) -> Union[float, np.ndarray]:
+        """Mean over samples ignoring missing (NaN) samples"""
+        values = self.data[channel][index]
+        count = np.sum(~np.isnan(values), axis=-1)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return np.nansum(values, axis=-1) / count
+
+    def to_dict(self) -> Dict:
+        return {
+            "axes": {name: values.tolist() for name, values in self.axes.items()},
+            "completed": self.completed.tolist(),
+            "data": {channel: values.tolist() for channel, values in self.data.items()},
+        }
+
+
+class IFPowerResults(SweepResults):
+    """IF power (frequency) sweep, axes: chopper state, frequency; channels: power, time"""
+
+    CHOPPER_STATES = ("hot", "cold")
+
+    def __init__(
+        self,
+        frequency: Sequence,
+        samples: int,
+        chopper: bool = False,
+        t_hot: float = 293,
+        t_cold: float = 77,
+        extra_channels: Sequence[str] = (),
+    ):
+        self.chopper = chopper
+        self.t_hot = t_hot
+        self.t_cold = t_cold
+        self.extra_channels = tuple(extra_channels)
+        super().__init__(
+            axes={
+                "chopper": self.CHOPPER_STATES if chopper else self.CHOPPER_STATES[:1],
+                "frequency": frequency,
+            },
+            samples=samples,
+            channels=("power", "time") + self.extra_channels,
+        )
+        self.diff = np.full(self.shape[1], np.nan)
+        self.y_factor = np.full(self.shape[1], np.nan)
+        self.noise_temperature = np.full(self.shape[1], np.nan)
+
+    @property
+    def diff_completed(self) -> np.ndarray:
+        """Frequencies with both hot and cold points measured"""
+        if not self.chopper:
+            return np.zeros(self.shape[1], dtype=bool)
+        return self.completed[0] & self.completed[1]
+
+    def update_diff(self, freq_ind: Union[int, slice] = slice(None)) -> None:
+        """Hot - cold difference, Y-factor and noise temperature at the frequencies
+        where both hot and cold points are measured
+        """
+        if not self.chopper:
+            return
+        power = self.mean("power", (slice(None), freq_ind))
+        diff = np.where(self.diff_completed[freq_ind], power[0] - power[1], np.nan)
+        y = y_factor(diff, 0)
+        self.diff[freq_ind] = diff
+        self.y_factor[freq_ind] = y
+        with np.errstate(invalid="ignore", divide="ignore"):
+            self.noise_temperature[freq_ind] = noise_temperature(
+                y, self.t_hot, self.t_cold
+            )
+
+    @classmethod
+    def merge(cls, results: Sequence["IFPowerResults"]) -> "IFPowerResults":
+        """One result sorted by frequency from several sweeps (e.g. refinement passes).
+        Sweeps with less samples are padded with NaN.
+        """
+        frequency = np.concatenate([result.axis("frequency") for result in results])
+        order = np.argsort(frequency, kind="stable")
+        merged = cls(
+            frequency=frequency[order],
+            samples=max(result.samples for result in results),
+            chopper=results[0].chopper,
+            t_hot=results[0].t_hot,
+            t_cold=results[0].t_cold,
+            extra_channels=results[0].extra_channels,
+        )
+        for channel, values in merged.data.items():
+            stacked = np.full_like(values, np.nan)
+            start = 0
+            for result in results:
+                stop = start + result.shape[1]
+                stacked[:, start:stop, : result.samples] = result.data[channel]
+                start = stop
+            values[:] = stacked[:, order]
+        merged.completed[:] = np.concatenate(
+            [result.completed for result in results], axis=1
+        )[:, order]
+        merged.update_diff()
+        return merged
+
+    def state_results(self, state_ind: int) -> List[Dict]:
+        results = []
+        power_mean = self.mean("power")
+        for freq_ind in np.flatnonzero(self.completed[state_ind]):
+            power = self.data["power"][state_ind, freq_ind]
+            result = {
+                "frequency": float(self.axes["frequency"][freq_ind]),
+                "power": power.tolist(),
+                "power_mean": float(power_mean[state_ind, freq_ind]),
+                "time": self.data["time"][state_ind, freq_ind].tolist(),
+            }
+            for channel in self.extra_channels:
+                result[channel] = self.data[channel][state_ind, freq_ind].tolist()
+            results.append(result)
+        return results
+
+    def to_dict(self) -> Union[Dict, List]:
+        if not self.chopper:
+            return self.state_results(0)
+        results = {}
+        for state_ind, chop_state in enumerate(self.CHOPPER_STATES):
+            data = self.state_results(state_ind)
+            results[chop_state] = {
+                "data": data,
+                "power": [result["power_mean"] for result in data],
+                "frequency": [result["frequency"] for result in data],
+            }
+        completed = self.diff_completed
+        results["diff"] = self.diff[completed].tolist()
+        results["y_factor"] = self.y_factor[completed].tolist()
+        results["noise_temperature"] = self.noise_temperature[completed].tolist()
+        return results
+
+
+class RepeatedIFPowerResults:
+    """Running statistics of repeated IF power sweeps over the same frequencies.
+    Only the statistics are kept in memory, raw passes are written to directory.
+    """
+
+    def __init__(
+        self, frequency: Sequence, chopper: bool = False, directory: str = None
+    ):
+        self.frequency = np.asarray(frequency)
+        self.chopper = chopper
+        self.states = IFPowerResults.CHOPPER_STATES if chopper else ("hot",)
+        self.statistics = RunningStatistics((len(self.states), len(self.frequency)))
+        self.diff_statistics = RunningStatistics(len(self.frequency))
+        self.directory = directory
+        self.files = []
+
+    @property
+    def passes(self) -> int:
+        return self.statistics.passes
+
+    def add_pass(self, results: IFPowerResults, t: float = None) -> None:
+        """Update statistics with the pass mean power, t is the pass time, hours"""
+        power = np.where(results.completed, results.mean(), np.nan)
+        self.statistics.update(power, t)
+        if self.chopper:
+            self.diff_statistics.update(power[0] - power[1], t)
+        if self.directory:
+            self.write_pass(results)
+
+    def write_pass(self, results: IFPowerResults) -> None:
+        os.makedirs(self.directory, exist_ok=True)
+        filepath = os.path.join(self.directory, f"pass_{self.passes:04d}.json")
+        with open(filepath, "w", encoding="utf-8") as file:
+            json.dump(results.to_dict(), file, ensure_ascii=False)
+        self.files.append(filepath)
+
+    def to_dict(self) -> Dict:
+        results = {"frequency": self.frequency.tolist(), "passes": self.files}
+        statistics = self.statistics.to_dict()
+        for state_ind, chop_state in enumerate(self.states):
+            results[chop_state] = {
+                key: value[state_ind] if isinstance(value, list) else value
+                for key, value in statistics.items()
+            }
+        if self.chopper:
+            results["diff"] = self.diff_statistics.to_dict()
+        return results
+
+
+class LockInResults(SweepResults):
+    """Continuous rotation chopper sweep: raw NRX samples with chopper positions
+    and demodulated hot/cold power per frequency
+    """
+
+    def __init__(
+        self,
+        frequency: Sequence,
+        samples: int,
+        t_hot: float = 293,
+        t_cold: float = 77,
+    ):
+        super().__init__(
+            axes={"frequency": frequency},
+            samples=samples,
+            channels=("power", "position_start", "position_stop", "time"),
+        )
+        self.t_hot = t_hot
+        self.t_cold = t_cold
+        self.hot = np.full(self.shape, np.nan)
+        self.cold = np.full(self.shape, np.nan)
+        self.hot_count = np.zeros(self.shape, dtype=int)
+        self.cold_count = np.zeros(self.shape, dtype=int)
+
+    @property
+    def noise_temperature(self) -> np.ndarray:
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return noise_temperature(
+                y_factor(self.hot, self.cold), self.t_hot, self.t_cold
+            )
+
+    def to_dict(self) -> Dict:
+        done = self.completed
+        frequency = self.axes["frequency"][done].tolist()
+        hot = self.hot[done]
+        cold = self.cold[done]
+        return {
+            "hot": {"power": hot.tolist(), "frequency": frequency},
+            "cold": {"power": cold.tolist(), "frequency": frequency},
+            "diff": (hot - cold).tolist(),
+            "y_factor": y_factor(hot, cold).tolist(),
+            "noise_temperature": self.noise_temperature[done].tolist(),
+            "data": [
+                {
+                    "frequency": float(self.axes["frequency"][ind]),
+                    "power": self.data["power"][ind].tolist(),
+                    "position_start": self.data["position_start"][ind].tolist(),
+                    "position_stop": self.data["position_stop"][ind].tolist(),
+                    "time": self.data["time"][ind].tolist(),
+                    "hot_count": int(self.hot_count[ind]),
+                    "cold_count": int(self.cold_count[ind]),
+                }
+                for ind in np.flatnonzero(done)
+            ],
+        }
+
+
+class TuningMapResults(SweepResults):
+    """Analog YIG current x digital YIG frequency map of averaged NRX power.
+    Power is kept as one compact float32 (current, frequency) image.
+    """
+
+    def __init__(self, current: Sequence, frequency: Sequence):
+        super().__init__(
+            axes={"current": current, "frequency": frequency},
+            samples=1,
+            channels=("power",),
+            dtype=np.float32,
+        )
+
+    @property
+    def image(self) -> np.ndarray:
+        return self.data["power"][..., 0]
+
+    def to_dict(self) -> Dict:
+        return {
+            "current": self.axes["current"].tolist(),
+            "frequency": self.axes["frequency"].tolist(),
+            "power": self.image.tolist(),
+            "completed": self.completed.tolist(),
+        }
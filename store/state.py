@@ -6,6 +6,14 @@ from settings import WAVESHARE_ETHERNET
 class State:
     # Base
     BASE_DIR = os.getcwd()
+    DATA_DIR = os.path.join(BASE_DIR, "data")
+    JOURNAL_SYNC_INTERVAL = 2
+    JOURNAL_SYNC_POINTS = 50
+    STREAM_CHUNK_POINTS = 4096
+    STREAM_FLUSH_INTERVAL = 5
+    GRAPH_REDRAW_INTERVAL = 50  # ms
+    GRAPH_SYMBOL_MAX_POINTS = 500
+    GRAPH_MIN_WIDTH = 500  # px
     # Icons
     WINDOW_ICON = os.path.join(BASE_DIR, "assets", "logo_small.ico")
     UP_ARROW = os.path.join(BASE_DIR, "assets", "up-arrow.png")
@@ -17,6 +25,12 @@ class State:
     NRX_STREAM_THREAD = False
     NRX_STREAM_PLOT_GRAPH = False
     NRX_STREAM_GRAPH_POINTS = 150
+    NRX_STREAM_RECORD = False
+    NRX_STREAM_STATISTICS = False
+    NRX_STREAM_STATISTICS_INTERVAL = 1
+    ALLAN_MAX_M = 2**14
+    NRX_STREAM_PSD = False
+    NRX_STREAM_PSD_SEGMENT = 256
     PROLOGIX_IP = "169.254.156.103"
     NI_PREFIX = "http://"
     NI_IP = "169.254.0.86"
@@ -25,10 +39,43 @@ class State:
     NI_FREQ_FROM = 3
     NI_FREQ_POINTS = 300
     NI_STABILITY_MEAS = False
+    NI_FREQ_ADAPTIVE = False
+    NI_FREQ_ADAPTIVE_TOLERANCE = 0.5
+    NI_FREQ_ADAPTIVE_BUDGET = 300
+    NI_FREQ_ADAPTIVE_MIN_STEP = 0.001
+    NI_FREQ_REPEATS = 1
+    NI_FREQ_SPECTRUM_VERIFY = False
+    NI_FREQ_JOURNAL = False
+    NI_FREQ_RESUME_JOURNAL = ""
+    NI_FREQ_SEGMENTED = False
+    NI_FREQ_SEGMENTS = []
     DIGITAL_YIG_FREQ = 8
+    TUNING_MAP_MEAS = False
+    TUNING_MAP_CURRENT_FROM = 0.02
+    TUNING_MAP_CURRENT_TO = 0.35
+    TUNING_MAP_CURRENT_POINTS = 100
+    TUNING_MAP_FREQ_FROM = 3
+    TUNING_MAP_FREQ_TO = 13
+    TUNING_MAP_FREQ_POINTS = 500
+    TUNING_MAP_NRX_POINTS = 1
+    TUNING_MAP_EMIT_INTERVAL = 0.2
     NRX_POINTS = 20
 
     SPECTRUM_ADDRESS = 20
+    SPECTRUM_WATERFALL = False
+    SPECTRUM_WATERFALL_DEPTH = 500
+    SPECTRUM_AVERAGE = "none"
+    SPECTRUM_AVERAGE_COUNT = 10
+    SPECTRUM_HOLD = "none"
+    SPECTRUM_SMOOTH_POINTS = 1
+    SPECTRUM_BANDS = []
+    YIG_TUNE_TOLERANCE = 2e6  # Hz
+    YIG_TUNE_MAX_STEPS = 6
+    YIG_TUNE_SETTLE = 0.4
+    YIG_TUNE_APPROACH = 100e6  # Hz
+    YIG_TUNE_CURRENT_FROM = 0  # A
+    YIG_TUNE_CURRENT_TO = 5  # A
+    YIG_TUNE_CLOSED_LOOP = False
 
     KEITHLEY_MEAS = False
     CALIBRATION_MEAS = False
@@ -73,10 +120,17 @@ class State:
     CALIBRATION_CURR_2_FREQ = [3.49015508e10, 1.14176903e08]
     CALIBRATION_FREQ_2_CURR = [2.86513427e-11, -3.26694024e-03]
     CALIBRATION_FILE = os.path.join(os.getcwd(), "calibration.csv")
+    CALIBRATION_ANALOG_MODEL = None
     CALIBRATION_STEP_DELAY = 0.1
 
+    DIGITAL_CALIBRATION_POINT_FROM = 0
+    DIGITAL_CALIBRATION_POINT_TO = 4095
+    DIGITAL_CALIBRATION_POINTS = 4096
+
     CALIBRATION_DIGITAL_POINT_2_FREQ = [2478826.8559771227, 2937630021.5301304]
     CALIBRATION_DIGITAL_FREQ_2_POINT = [4.03405867562004e-07, -1185.002515827086]
+    CALIBRATION_DIGITAL_FILE = os.path.join(os.getcwd(), "calibration_digital.json")
+    CALIBRATION_DIGITAL_MODEL = None
 
     # WaveShare
     WAVESHARE_HOST = "169.254.54.24"
@@ -87,9 +141,24 @@ class State:
     CHOPPER_PORT = WAVESHARE_PORT
     CHOPPER_ADAPTER = WAVESHARE_ETHERNET
     CHOPPER_DEFAULT_SERIAL_PORT = "COM16"
+    CHOPPER_ETHERNET_TIMEOUT = 0.5
+    CHOPPER_ETHERNET_RETRIES = 1
     CHOPPER_FREQ = 1
     CHOPPER_SWITCH = True
+    CHOPPER_LOCKIN = False
+    CHOPPER_LOCKIN_GUARD = 0.1
+    CHOPPER_T_HOT = 293
+    CHOPPER_T_COLD = 77
+    CHOPPER_SPIN_UP_DELAY = 3
+    CHOPPER_MOTION_TIMEOUT = 5
+    CHOPPER_STOP_TIMEOUT = 30
+    CHOPPER_MOTION_POLL_INTERVAL = 0.01
+    CHOPPER_POSITION_TOLERANCE = 5
     CHOPPER_MONITOR = False
+    CHOPPER_MONITOR_POINTS = 10000
+    CHOPPER_MONITOR_INTERVAL = 0.005
+    CHOPPER_MONITOR_EMIT_INTERVAL = 0.2
+    CHOPPER_SPEED_WINDOW = 0.3
 
 
 state = State()
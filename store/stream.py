@@ -0,0 +1,138 @@
+import json
+import os
+import time
+from typing import Dict, Sequence
+
+import numpy as np
+
+from store.state import state
+from utils.statistics import AllanDeviation, StreamStatistics
+
+
+class StreamRecorder:
+    """Writes rows of a stream (e.g. time, power) to a raw binary file in chunks.
+    Only one chunk is kept in memory, it's written when full or older than
+    flush_interval seconds. Layout is described in a JSON sidecar next to the file,
+    so the data is readable with np.memmap without this class.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        columns: Sequence[str] = ("time", "power"),
+        dtype=np.float64,
+        chunk_size: int = state.STREAM_CHUNK_POINTS,
+        flush_interval: float = state.STREAM_FLUSH_INTERVAL,
+        **meta,
+    ):
+        self.path = path
+        self.columns = tuple(columns)
+        self.dtype = np.dtype(dtype)
+        self.flush_interval = flush_interval
+        self.chunk = np.empty((int(chunk_size), len(self.columns)), dtype=self.dtype)
+        self.size = 0
+        self.points = 0
+        self.last_flush = time.time()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.file = open(path, "ab")
+        self.meta = {
+            "columns": self.columns,
+            "dtype": self.dtype.str,
+            "started": time.time(),
+            **meta,
+        }
+        self.write_meta()
+
+    def write_meta(self) -> None:
+        with open(f"{self.path}.json", "w", encoding="utf-8") as file:
+            json.dump({**self.meta, "points": self.points}, file, indent=4)
+
+    def append(self, row: Sequence) -> None:
+        self.chunk[self.size] = row
+        self.size += 1
+        self.points += 1
+        if (
+            self.size == len(self.chunk)
+            or time.time() - self.last_flush >= self.flush_interval
+        ):
+            self.flush()
+
+    def flush(self) -> None:
+        if self.size:
+            self.file.write(self.chunk[: self.size].tobytes())
+            self.size = 0
+        self.file.flush()
+        self.last_flush = time.time()
+
+    def close(self) -> None:
+        if self.file.closed:
+            return
+        self.flush()
+        os.fsync(self.file.fileno())
+        self.file.close()
+        self.meta["finished"] = time.time()
+        self.write_meta()
+
+
+class StreamRecording:
+    """Lazy view of a recorded stream, the file is memory-mapped on access only"""
+
+    def __init__(self, path: str):
+        self.path = path
+
+    @property
+    def meta(self) -> Dict:
+        with open(f"{self.path}.json", "r", encoding="utf-8") as file:
+            return json.load(file)
+
+    @property
+    def data(self) -> np.ndarray:
+        """(points, columns) read-only memmap, a partially written last row is ignored"""
+        meta = self.meta
+        dtype = np.dtype(meta["dtype"])
+        columns = len(meta["columns"])
+        if not os.path.exists(self.path):
+            return np.empty((0, columns), dtype=dtype)
+        points = os.path.getsize(self.path) // (dtype.itemsize * columns)
+        if not points:
+            return np.empty((0, columns), dtype=dtype)
+        return np.memmap(
+            self.path, dtype=dtype, mode="r", shape=(points, columns), order="C"
+        )
+
+    def __len__(self) -> int:
+        return len(self.data)
+
+    def column(self, name: str) -> np.ndarray:
+        return self.data[:, list(self.meta["columns"]).index(name)]
+
+    def analyze(self, chunk_size: int = state.STREAM_CHUNK_POINTS * 64):
+        """Power statistics and Allan deviation computed chunk by chunk"""
+        statistics = StreamStatistics()
+        allan = AllanDeviation(max_m=state.ALLAN_MAX_M)
+        data = self.data
+        columns = list(self.meta["columns"])
+        power_ind = columns.index("power")
+        time_ind = columns.index("time")
+        for start in range(0, len(data), chunk_size):
+            chunk = np.asarray(data[start : start + chunk_size])
+            statistics.update(chunk[:, power_ind], chunk[:, time_ind])
+            allan.update(chunk[:, power_ind])
+        tau0 = 1
+        if len(data) > 1:
+            tau0 = float(data[-1, time_ind] - data[0, time_ind]) / (len(data) - 1)
+        return statistics, allan, tau0
+
+    def to_dict(self) -> Dict:
+        """File description with power statistics and Allan deviation"""
+        meta = self.meta
+        result = {**meta, "data_file": self.path, "points": len(self)}
+        if "power" not in meta["columns"] or not result["points"]:
+            return result
+        statistics, allan, tau0 = self.analyze()
+        tau, adev = allan.deviation(tau0)
+        result["power_statistics"] = statistics.to_dict()
+        result["allan_deviation"] = {"tau": tau.tolist(), "adev": adev.tolist()}
+        return result
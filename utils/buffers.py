@@ -0,0 +1,108 @@
+from typing import Iterable
+
+import numpy as np
+
+
+class RingBuffer:
+    """Fixed size FIFO of rows with O(1) append.
+    Every row is stored twice (at i and i + capacity),
+    so the buffer content is always available as one contiguous view.
+    """
+
+    def __init__(self, capacity: int, columns: int = 1, dtype=float):
+        self.capacity = int(capacity)
+        self.columns = int(columns)
+        self._data = np.zeros((2 * self.capacity, self.columns), dtype=dtype)
+        self._start = 0
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    @property
+    def full(self) -> bool:
+        return self._size == self.capacity
+
+    def clear(self) -> None:
+        self._start = 0
+        self._size = 0
+
+    def append(self, row: Iterable) -> None:
+        end = (self._start + self._size) % self.capacity
+        self._data[end] = row
+        self._data[end + self.capacity] = row
+        if self._size < self.capacity:
+            self._size += 1
+        else:
+            self._start = (self._start + 1) % self.capacity
+
+    def extend(self, rows) -> None:
+        rows = np.asarray(rows, dtype=self._data.dtype).reshape(-1, self.columns)
+        if len(rows) > self.capacity:
+            rows = rows[-self.capacity :]
+        count = len(rows)
+        end = (self._start + self._size) % self.capacity
+        index = (end + np.arange(count)) % self.capacity
+        self._data[index] = rows
+        self._data[index + self.capacity] = rows
+        overflow = max(self._size + count - self.capacity, 0)
+        self._size = min(self._size + count, self.capacity)
+        self._start = (self._start + overflow) % self.capacity
+
+    def view(self) -> np.ndarray:
+        """Contiguous (size, columns) view ordered from the oldest row to the newest"""
+        return self._data[self._start : self._start + self._size]
+
+    def last(self, count: int) -> np.ndarray:
+        count = min(int(count), self._size)
+        end = self._start + self._size
+        return self._data[end - count : end]
+
+
+class GrowableArray:
+    """Append-only array of rows with amortized O(1) append.
+    Capacity doubles when full, the content is always one contiguous view.
+    """
+
+    def __init__(self, columns: int = 1, capacity: int = 1024, dtype=float):
+        self.columns = int(columns)
+        self._data = np.empty((max(int(capacity), 1), self.columns), dtype=dtype)
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    @property
+    def capacity(self) -> int:
+        return len(self._data)
+
+    def clear(self) -> None:
+        self._size = 0
+
+    def truncate(self, size: int) -> None:
+        self._size = min(max(int(size), 0), self._size)
+
+    def reserve(self, size: int) -> None:
+        if size <= self.capacity:
+            return
+        capacity = self.capacity
+        while capacity < size:
+            capacity *= 2
+        data = np.empty((capacity, self.columns), dtype=self._data.dtype)
+        data[: self._size] = self._data[: self._size]
+        self._data = data
+
+    def append(self, row: Iterable) -> None:
+        self.reserve(self._size + 1)
+        self._data[self._size] = row
+        self._size += 1
+
+    def extend(self, rows) -> None:
+        rows = np.asarray(rows, dtype=self._data.dtype).reshape(-1, self.columns)
+        self.reserve(self._size + len(rows))
+        self._data[self._size : self._size + len(rows)] = rows
+        self._size += len(rows)
+
+    def view(self) -> np.ndarray:
+        """Contiguous (size, columns) view, invalidated by the next append"""
+        return self._data[: self._size]
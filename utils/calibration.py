@@ -0,0 +1,194 @@
+from typing import Dict, Sequence, Tuple
+
+import numpy as np
+
+BRANCHES = ("up", "down")
+
+
+def interp(x, xp: np.ndarray, fp: np.ndarray) -> np.ndarray:
+    """np.interp extrapolated linearly with the end segments"""
+    x = np.asarray(x, dtype=float)
+    result = np.array(np.interp(x, xp, fp), dtype=float)
+    below = x < xp[0]
+    above = x > xp[-1]
+    if below.any():
+        slope = (fp[1] - fp[0]) / (xp[1] - xp[0])
+        result[below] = fp[0] + slope * (x[below] - xp[0])
+    if above.any():
+        slope = (fp[-1] - fp[-2]) / (xp[-1] - xp[-2])
+        result[above] = fp[-1] + slope * (x[above] - xp[-1])
+    return result
+
+
+def isotonic(y: np.ndarray, weights: np.ndarray) -> np.ndarray:
+    """Non decreasing weighted least squares fit of y (pool adjacent violators)"""
+    values, counts, sizes = [], [], []
+    for value, weight in zip(y, weights):
+        values.append(value)
+        counts.append(weight)
+        sizes.append(1)
+        while len(values) > 1 and values[-2] > values[-1]:
+            weight = counts[-2] + counts[-1]
+            values[-2] = (values[-2] * counts[-2] + values[-1] * counts[-1]) / weight
+            counts[-2] = weight
+            sizes[-2] += sizes[-1]
+            del values[-1], counts[-1], sizes[-1]
+    return np.repeat(values, sizes)
+
+
+def pchip(x: np.ndarray, y: np.ndarray, xq) -> np.ndarray:
+    """Monotone piecewise cubic Hermite interpolation (Fritsch-Carlson slopes)"""
+    h = np.diff(x)
+    delta = np.diff(y) / h
+    slopes = np.zeros(len(x))
+    if len(x) == 2:
+        slopes[:] = delta[0]
+    else:
+        w1 = 2 * h[1:] + h[:-1]
+        w2 = h[1:] + 2 * h[:-1]
+        same_sign = delta[:-1] * delta[1:] > 0
+        with np.errstate(divide="ignore", invalid="ignore"):
+            harmonic = (w1 + w2) / (w1 / delta[:-1] + w2 / delta[1:])
+        slopes[1:-1] = np.where(same_sign, harmonic, 0)
+        for end, (h0, h1, d0, d1) in (
+            (0, (h[0], h[1], delta[0], delta[1])),
+            (-1, (h[-1], h[-2], delta[-1], delta[-2])),
+        ):
+            slope = ((2 * h0 + h1) * d0 - h0 * d1) / (h0 + h1)
+            if np.sign(slope) != np.sign(d0):
+                slope = 0
+            elif np.sign(d0) != np.sign(d1) and abs(slope) > abs(3 * d0):
+                slope = 3 * d0
+            slopes[end] = slope
+    xq = np.asarray(xq, dtype=float)
+    index = np.clip(np.searchsorted(x, xq, "right") - 1, 0, len(x) - 2)
+    t = (xq - x[index]) / h[index]
+    t2, t3 = t * t, t * t * t
+    return (
+        (2 * t3 - 3 * t2 + 1) * y[index]
+        + (t3 - 2 * t2 + t) * h[index] * slopes[index]
+        + (-2 * t3 + 3 * t2) * y[index + 1]
+        + (t3 - t2) * h[index] * slopes[index + 1]
+    )
+
+
+def sweep_direction(values) -> np.ndarray:
+    """+1 for values approached from below, -1 from above, the first one is +1"""
+    values = np.asarray(values, dtype=float)
+    direction = np.sign(np.diff(values, prepend=-np.inf))
+    direction[direction == 0] = 1
+    return direction
+
+
+class CalibrationModel:
+    """Monotone YIG control (current, DAC code) <-> frequency calibration.
+    A branch (up or down control sweep, to follow the hysteresis) is a monotone cubic
+    through isotonic binned means of the measured points, tabulated into dense
+    forward and inverse lookup tables, so any grid is converted with one np.interp.
+    Values outside the tables are extrapolated linearly.
+    """
+
+    def __init__(self, tables: Dict[str, Dict[str, Tuple[np.ndarray, np.ndarray]]]):
+        self.tables = tables
+
+    @property
+    def branches(self) -> Tuple[str, ...]:
+        return tuple(self.tables.keys())
+
+    @classmethod
+    def linear(cls, forward: Sequence[float], inverse: Sequence[float]):
+        """Model of the linear fits frequency = a * control + b
+        and control = c * frequency + d
+        """
+        (a, b), (c, d) = forward, inverse
+        control = np.array([0.0, 1.0])
+        frequency = np.array([0.0, 1e10])
+        return cls(
+            {
+                "up": {
+                    "forward": (control, a * control + b),
+                    "inverse": (frequency, c * frequency + d),
+                }
+            }
+        )
+
+    @staticmethod
+    def fit_branch(
+        control: np.ndarray, frequency: np.ndarray, knots: int, lut_points: int
+    ) -> Dict[str, Tuple[np.ndarray, np.ndarray]]:
+        order = np.argsort(control, kind="stable")
+        chunks = np.array_split(order, min(knots, len(order)))
+        knot_x = np.array([control[chunk].mean() for chunk in chunks])
+        knot_y = np.array([frequency[chunk].mean() for chunk in chunks])
+        knot_y = isotonic(knot_y, np.array([len(chunk) for chunk in chunks]))
+        # plateaus (e.g. a saturated peak) are merged into one knot
+        _, start = np.unique(knot_y, return_index=True)
+        knot_x = np.add.reduceat(knot_x, start) / np.diff(np.append(start, len(knot_x)))
+        knot_y = knot_y[start]
+        keep = np.append(True, np.diff(knot_x) > 0)
+        knot_x, knot_y = knot_x[keep], knot_y[keep]
+        if len(knot_x) < 2:
+            raise ValueError("Calibration needs at least two distinct points")
+        grid = np.linspace(knot_x[0], knot_x[-1], lut_points)
+        values = pchip(knot_x, knot_y, grid)
+        return {"forward": (grid, values), "inverse": (values, grid)}
+
+    @classmethod
+    def fit(
+        cls,
+        control: Sequence,
+        frequency: Sequence,
+        commanded: Sequence = None,
+        knots: int = 32,
+        lut_points: int = 4096,
+        min_points: int = 8,
+    ) -> "CalibrationModel":
+        """Fit measured (control, frequency) points in the order they were measured,
+        increasing and decreasing control runs make the up and down branches.
+        The sweep direction is taken from the commanded control values if given,
+        so readback jitter near turning points doesn't switch branches.
+        """
+        control = np.asarray(control, dtype=float)
+        frequency = np.asarray(frequency, dtype=float)
+        direction = sweep_direction(control if commanded is None else commanded)
+        if len(direction) > 1:
+            direction[0] = direction[1]
+        finite = np.isfinite(control) & np.isfinite(frequency)
+        tables = {}
+        for branch, sign in zip(BRANCHES, (1, -1)):
+            selected = finite & (direction == sign)
+            if np.count_nonzero(selected) >= min_points:
+                tables[branch] = cls.fit_branch(
+                    control[selected], frequency[selected], knots, lut_points
+                )
+        if not tables:
+            raise ValueError("Not enough calibration points")
+        return cls(tables)
+
+    def table(self, branch: str, kind: str) -> Tuple[np.ndarray, np.ndarray]:
+        tables = self.tables.get(branch) or next(iter(self.tables.values()))
+        return tables[kind]
+
+    def evaluate(self, values, kind: str, direction=None) -> np.ndarray:
+        if direction is None:
+            return interp(values, *self.table("up", kind))
+        direction = np.broadcast_to(direction, np.shape(values))
+        return np.where(
+            direction < 0,
+            interp(values, *self.table("down", kind)),
+            interp(values, *self.table("up", kind)),
+        )
+
+    def frequency(self, control, direction=None) -> np.ndarray:
+        """Frequency, Hz, for control values reached in direction (+1 up, -1 down)"""
+        return self.evaluate(control, "forward", direction)
+
+    def control(self, frequency, direction=None) -> np.ndarray:
+        """Control values for frequencies, Hz, reached in direction (+1 up, -1 down)"""
+        return self.evaluate(frequency, "inverse", direction)
+
+    def control_slope(self, frequency: float, branch: str = "up") -> float:
+        """d control / d frequency at frequency"""
+        xp, fp = self.table(branch, "inverse")
+        index = np.clip(np.searchsorted(xp, frequency), 1, len(xp) - 1)
+        return float((fp[index] - fp[index - 1]) / (xp[index] - xp[index - 1]))
@@ -1,3 +1,6 @@
+import time
+from typing import Callable
+
 from utils.logger import logger
 
 
@@ -44,3 +47,40 @@ class InstrumentAdapterInterface:
 
     def close(self, *args, **kwargs):
         raise NotImplementedError
+
+
+class ProgressReporter:
+    """Throttled progress: emits only when the integer percent changes
+    and logs not more often than once per log_interval seconds
+    """
+
+    def __init__(
+        self,
+        total: int,
+        emit: Callable[[int], None] = None,
+        log_interval: float = 1,
+        name: str = "Progress",
+    ):
+        self.total = max(int(total), 1)
+        self.emit = emit
+        self.log_interval = log_interval
+        self.name = name
+        self.start_time = time.time()
+        self.last_log = 0
+        self.last_percent = -1
+
+    def update(self, step: int, **info) -> None:
+        percent = int(step / self.total * 100)
+        if percent != self.last_percent:
+            self.last_percent = percent
+            if self.emit is not None:
+                self.emit(percent)
+        now = time.time()
+        if now - self.last_log < self.log_interval and step < self.total:
+            return
+        self.last_log = now
+        details = "".join(f"[{key} {value}]" for key, value in info.items())
+        logger.info(
+            f"[{self.name}][{round(step / self.total * 100, 2)} %]"
+            f"[Time {round(now - self.start_time, 1)} s]{details}"
+        )
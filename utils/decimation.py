@@ -0,0 +1,81 @@
+from typing import List, Tuple
+
+import numpy as np
+
+from utils.buffers import GrowableArray
+
+
+class MinMaxPyramid:
+    """Min/max envelopes of a growing series at bin sizes factor ** k, k >= 1.
+    Appended points only recompute the tail bins of every level,
+    NaN values are ignored.
+    """
+
+    def __init__(self, factor: int = 4, min_bins: int = 64):
+        self.factor = int(factor)
+        self.min_bins = int(min_bins)
+        self.levels: List[GrowableArray] = []
+        self.size = 0
+        self.ascending = True
+
+    def clear(self) -> None:
+        self.levels = []
+        self.size = 0
+        self.ascending = True
+
+    def update(self, x, y) -> None:
+        """Follow x, y after points were appended, shorter data resets the pyramid"""
+        x = np.asarray(x, dtype=float)
+        y = np.asarray(y, dtype=float)
+        if len(y) < self.size:
+            self.clear()
+        if len(y) == self.size:
+            return
+        if self.ascending:
+            self.ascending = bool(np.all(np.diff(x[max(self.size - 1, 0) :]) >= 0))
+        first = self.size
+        mins = maxs = y
+        level = 0
+        while len(mins) > self.min_bins:
+            if level == len(self.levels):
+                self.levels.append(GrowableArray(columns=2))
+                first = 0
+            first //= self.factor
+            bins = self.levels[level]
+            bins.truncate(first)
+            edges = np.arange(first * self.factor, len(mins), self.factor)
+            bins.extend(
+                np.column_stack(
+                    (np.fmin.reduceat(mins, edges), np.fmax.reduceat(maxs, edges))
+                )
+            )
+            data = bins.view()
+            mins, maxs = data[:, 0], data[:, 1]
+            level += 1
+        del self.levels[level:]
+        self.size = len(y)
+
+    def decimate(
+        self, x, y, lo: float = -np.inf, hi: float = np.inf, max_points: int = 2000
+    ) -> Tuple[np.ndarray, np.ndarray, bool]:
+        """Points of x, y within [lo, hi] with one neighbour on each side.
+        More than max_points are replaced by min/max pairs of the finest level
+        that fits, the last value tells if the points were decimated.
+        Ranges apply to ascending x only, otherwise the whole series is used.
+        """
+        i0, i1 = 0, len(y)
+        if self.ascending:
+            i0 = max(int(np.searchsorted(x, lo, "left")) - 1, 0)
+            i1 = min(int(np.searchsorted(x, hi, "right")) + 1, len(y))
+        if i1 - i0 <= max_points or not self.levels:
+            return x[i0:i1], y[i0:i1], False
+        bin_size = self.factor
+        for bins in self.levels:
+            if 2 * (i1 - i0) / bin_size <= max_points:
+                break
+            bin_size *= self.factor
+        b0 = i0 // bin_size
+        b1 = -(-i1 // bin_size)
+        envelope = bins.view()[b0:b1]
+        x_bins = x[np.arange(b0, b1) * bin_size]
+        return np.repeat(x_bins, 2), envelope.ravel(), True
@@ -6,6 +6,16 @@ def linear(x: float, a: float, b: float):
     return a * x + b
 
 
+def y_factor(hot: float, cold: float) -> float:
+    """Linear Y-factor from hot and cold power in dBm"""
+    return 10 ** ((hot - cold) / 10)
+
+
+def noise_temperature(y: float, t_hot: float, t_cold: float) -> float:
+    """Receiver noise temperature, K, from linear Y-factor and load temperatures, K"""
+    return (t_hot - y * t_cold) / (y - 1)
+
+
 def linear_fit(x, y):
     def mean(xs):
         return sum(xs) / len(xs)
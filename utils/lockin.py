@@ -0,0 +1,50 @@
+import numpy as np
+
+CHOPPER_PULSES_PER_REVOLUTION = 10000
+CHOPPER_SECTOR_PULSES = 2500
+
+
+def chopper_sector(positions, reference: int = 0) -> np.ndarray:
+    """Nearest aligned chopper sector for positions in pulses.
+    Even sectors are hot, odd sectors are cold.
+    """
+    positions = np.asarray(positions, dtype=float) - reference
+    return np.round(positions / CHOPPER_SECTOR_PULSES).astype(int)
+
+
+def mean_power(power, mask, axis: int = -1) -> np.ndarray:
+    """Mean of dBm samples selected by mask, averaged in linear (mW) domain"""
+    linear = np.where(mask, 10 ** (np.asarray(power, dtype=float) / 10), 0)
+    count = np.sum(mask, axis=axis)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return 10 * np.log10(np.sum(linear, axis=axis) / count)
+
+
+def demodulate(power, start, stop, reference: int = 0, guard: float = 0.1):
+    """Software lock-in of NRX samples taken with a rotating chopper.
+
+    :param power: NRX samples, dBm, shape (..., n)
+    :param start: chopper positions at the start of every sample, pulses, shape (..., n)
+    :param stop: chopper positions at the end of every sample, pulses, shape (..., n)
+    :param reference: aligned hot chopper position, pulses
+    :param guard: fraction of a sector around the blade edges to reject
+    :return: hot power, cold power (dBm), hot samples count, cold samples count
+    """
+    power = np.asarray(power, dtype=float)
+    start = (np.asarray(start, dtype=float) - reference) / CHOPPER_SECTOR_PULSES
+    stop = (np.asarray(stop, dtype=float) - reference) / CHOPPER_SECTOR_PULSES
+    sector = np.round(start)
+    limit = 0.5 - guard
+    valid = (
+        (np.abs(start - sector) <= limit)
+        & (np.abs(stop - sector) <= limit)
+        & np.isfinite(power)
+    )
+    hot = valid & (sector % 2 == 0)
+    cold = valid & (sector % 2 == 1)
+    return (
+        mean_power(power, hot),
+        mean_power(power, cold),
+        np.sum(hot, axis=-1),
+        np.sum(cold, axis=-1),
+    )
@@ -0,0 +1,241 @@
+from typing import Dict, Sequence, Tuple, Union
+
+import numpy as np
+
+
+class RunningStatistics:
+    """Element-wise incremental statistics over repeated arrays (passes).
+    Mean and variance use Welford's update, drift is the least squares slope
+    of values over pass time. NaN values are skipped element-wise.
+    Memory doesn't depend on the number of passes.
+    """
+
+    def __init__(self, shape: Union[int, Sequence[int]]):
+        self.shape = (shape,) if isinstance(shape, int) else tuple(shape)
+        self.count = np.zeros(self.shape, dtype=int)
+        self.mean = np.full(self.shape, np.nan)
+        self._m2 = np.zeros(self.shape)
+        self.min = np.full(self.shape, np.nan)
+        self.max = np.full(self.shape, np.nan)
+        # sums for the drift regression over time
+        self._t = np.zeros(self.shape)
+        self._tt = np.zeros(self.shape)
+        self._ty = np.zeros(self.shape)
+        self._y = np.zeros(self.shape)
+        self.passes = 0
+
+    def update(self, values, t: float = None) -> None:
+        """Add one pass.
+
+        :param values: array of self.shape
+        :param t: pass time, the pass number if not given
+        """
+        values = np.asarray(values, dtype=float).reshape(self.shape)
+        t = float(self.passes if t is None else t)
+        self.passes += 1
+        valid = ~np.isnan(values)
+        self.count += valid
+        mean = np.where(np.isnan(self.mean), 0, self.mean)
+        delta = np.where(valid, values - mean, 0)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            mean = mean + np.where(valid, delta / self.count, 0)
+        self._m2 += np.where(valid, delta * (values - mean), 0)
+        self.mean = np.where(self.count > 0, mean, np.nan)
+        self.min = np.where(valid, np.fmin(self.min, values), self.min)
+        self.max = np.where(valid, np.fmax(self.max, values), self.max)
+        self._t += np.where(valid, t, 0)
+        self._tt += np.where(valid, t * t, 0)
+        self._ty += np.where(valid, t * values, 0)
+        self._y += np.where(valid, values, 0)
+
+    @property
+    def variance(self) -> np.ndarray:
+        """Sample variance (ddof=1)"""
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return np.where(self.count > 1, self._m2 / (self.count - 1), np.nan)
+
+    @property
+    def std(self) -> np.ndarray:
+        return np.sqrt(self.variance)
+
+    @property
+    def drift(self) -> np.ndarray:
+        """Slope of values over pass time, units of values per unit of t"""
+        denominator = self.count * self._tt - self._t**2
+        with np.errstate(invalid="ignore", divide="ignore"):
+            slope = (self.count * self._ty - self._t * self._y) / denominator
+        return np.where((self.count > 1) & (denominator > 0), slope, np.nan)
+
+    def to_dict(self) -> Dict:
+        return {
+            "passes": self.passes,
+            "count": self.count.tolist(),
+            "mean": self.mean.tolist(),
+            "std": self.std.tolist(),
+            "min": self.min.tolist(),
+            "max": self.max.tolist(),
+            "drift": self.drift.tolist(),
+        }
+
+
+class StreamStatistics:
+    """Mean, variance (Welford/Chan chunk merge), min/max and linear drift
+    of a scalar stream processed in chunks
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.mean = np.nan
+        self._m2 = 0.0
+        self.min = np.nan
+        self.max = np.nan
+        # drift regression sums, time relative to the first sample
+        self._t0 = None
+        self._t = 0.0
+        self._tt = 0.0
+        self._ty = 0.0
+        self._y = 0.0
+
+    def update(self, values, times=None) -> None:
+        values = np.asarray(values, dtype=float)
+        valid = np.isfinite(values)
+        if times is not None:
+            times = np.asarray(times, dtype=float)[valid]
+        values = values[valid]
+        count = len(values)
+        if not count:
+            return
+        mean = float(values.mean())
+        m2 = float(np.sum((values - mean) ** 2))
+        if self.count:
+            total = self.count + count
+            delta = mean - self.mean
+            self._m2 += m2 + delta**2 * self.count * count / total
+            self.mean += delta * count / total
+        else:
+            total = count
+            self._m2 = m2
+            self.mean = mean
+        if times is not None:
+            if self._t0 is None:
+                self._t0 = float(times[0])
+            t = times - self._t0
+            self._t += float(t.sum())
+            self._tt += float(np.sum(t * t))
+            self._ty += float(np.sum(t * values))
+            self._y += float(values.sum())
+        self.count = total
+        self.min = float(np.fmin(self.min, values.min()))
+        self.max = float(np.fmax(self.max, values.max()))
+
+    @property
+    def variance(self) -> float:
+        return self._m2 / (self.count - 1) if self.count > 1 else np.nan
+
+    @property
+    def std(self) -> float:
+        return float(np.sqrt(self.variance))
+
+    @property
+    def drift(self) -> float:
+        """Least squares slope of values over time, units of values per unit of time"""
+        denominator = self.count * self._tt - self._t**2
+        if self.count < 2 or denominator <= 0:
+            return np.nan
+        return (self.count * self._ty - self._t * self._y) / denominator
+
+    def to_dict(self) -> Dict:
+        return {
+            "count": self.count,
+            "mean": self.mean,
+            "std": self.std,
+            "min": self.min,
+            "max": self.max,
+            "drift": self.drift,
+        }
+
+
+class AllanDeviation:
+    """Overlapping Allan deviation of a stream sampled every tau0, processed in chunks.
+    Averaging factors are octaves 1, 2, 4 ... max_m. Only the last 2 * max_m
+    cumulative sums are kept between chunks, so memory doesn't depend on length.
+    """
+
+    def __init__(self, max_m: int = 2**14):
+        self.m = 2 ** np.arange(int(np.log2(max_m)) + 1)
+        self._sums = np.zeros(len(self.m))
+        self._counts = np.zeros(len(self.m), dtype=int)
+        self._offset = None
+        # cumulative sums tail, starts with S[0] = 0
+        self._tail = np.zeros(1)
+        self.samples = 0
+
+    def update(self, values) -> None:
+        values = np.asarray(values, dtype=float)
+        values = values[np.isfinite(values)]
+        if not len(values):
+            return
+        if self._offset is None:
+            # keeps cumulative sums small for precision
+            self._offset = values[0]
+        cumulative = self._tail[-1] + np.cumsum(values - self._offset)
+        full = np.concatenate((self._tail, cumulative))
+        first_new = len(self._tail)
+        for ind, m in enumerate(self.m):
+            start = max(first_new, 2 * m)
+            if start >= len(full):
+                continue
+            ends = np.arange(start, len(full))
+            diff = (full[ends] - 2 * full[ends - m] + full[ends - 2 * m]) / m
+            self._sums[ind] += float(np.sum(diff * diff))
+            self._counts[ind] += len(ends)
+        self._tail = full[-(2 * self.m[-1] + 1) :]
+        self.samples += len(values)
+
+    def deviation(self, tau0: float = 1) -> Tuple[np.ndarray, np.ndarray]:
+        """Averaging times tau = m * tau0 and deviations for the factors with data"""
+        valid = self._counts > 0
+        adev = np.sqrt(self._sums[valid] / (2 * self._counts[valid]))
+        return self.m[valid] * tau0, adev
+
+
+class WelchPSD:
+    """Incremental Welch power spectral density of a uniformly sampled stream.
+    New samples are cut into overlapping Hann windowed segments, only the new
+    segments are transformed and added to the accumulated periodogram,
+    the samples not yet forming a segment are kept for the next update.
+    """
+
+    def __init__(self, segment: int = 256, overlap: float = 0.5):
+        self.segment = int(segment)
+        self.step = max(int(self.segment * (1 - overlap)), 1)
+        self.window = np.hanning(self.segment)
+        self._sum = np.zeros(self.segment // 2 + 1)
+        self._tail = np.empty(0)
+        self.segments = 0
+
+    def update(self, values) -> int:
+        """Add samples, returns the number of new segments"""
+        values = np.asarray(values, dtype=float)
+        buffer = np.concatenate((self._tail, values[np.isfinite(values)]))
+        if len(buffer) < self.segment:
+            self._tail = buffer
+            return 0
+        count = (len(buffer) - self.segment) // self.step + 1
+        segments = np.lib.stride_tricks.sliding_window_view(buffer, self.segment)
+        segments = segments[:: self.step][:count]
+        segments = segments - segments.mean(axis=1, keepdims=True)
+        spectrum = np.fft.rfft(segments * self.window, axis=1)
+        self._sum += np.sum(np.abs(spectrum) ** 2, axis=0)
+        self.segments += count
+        self._tail = buffer[count * self.step :]
+        return count
+
+    def density(self, fs: float = 1) -> Tuple[np.ndarray, np.ndarray]:
+        """One-sided PSD, units of values squared per Hz, at the sample rate fs"""
+        frequency = np.fft.rfftfreq(self.segment, d=1 / fs)
+        if not self.segments:
+            return frequency, np.full(len(frequency), np.nan)
+        psd = self._sum / self.segments / (fs * np.sum(self.window**2))
+        psd[1 : (self.segment + 1) // 2] *= 2
+        return frequency, psd
@@ -0,0 +1,98 @@
+from typing import Dict, Sequence, Tuple
+
+import numpy as np
+
+AVERAGE_MODES = ("none", "linear", "exponential")
+HOLD_MODES = ("none", "max", "min")
+
+
+def to_linear(power) -> np.ndarray:
+    """dBm to mW"""
+    return 10 ** (np.asarray(power, dtype=float) / 10)
+
+
+def to_db(power) -> np.ndarray:
+    """mW to dBm"""
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return 10 * np.log10(power)
+
+
+def smooth(values, points: int) -> np.ndarray:
+    """Centered moving average over points, shorter windows at the edges"""
+    values = np.asarray(values, dtype=float)
+    if points <= 1:
+        return values
+    kernel = np.ones(int(points))
+    count = np.convolve(np.ones(len(values)), kernel, mode="same")
+    return np.convolve(values, kernel, mode="same") / count
+
+
+def band_power(x, power, bands: Sequence[Tuple[float, float]]) -> np.ndarray:
+    """Sum of the linear power of the trace points within every (start, stop) band
+    of ascending x, dBm
+    """
+    x = np.asarray(x, dtype=float)
+    bands = np.asarray(bands, dtype=float).reshape(-1, 2)
+    cumulative = np.concatenate(([0], np.cumsum(to_linear(power))))
+    start = np.searchsorted(x, bands.min(axis=1), "left")
+    stop = np.searchsorted(x, bands.max(axis=1), "right")
+    return to_db(cumulative[stop] - cumulative[start])
+
+
+class TraceProcessor:
+    """Host side accumulation of raw spectrum analyzer traces, dBm.
+    Averaging is done in linear power: linear is the mean of all traces since reset,
+    exponential is the running mean over the first count traces
+    continued with weight 1 / count. Hold applies to the raw traces,
+    smoothing to the averaged trace.
+    """
+
+    def __init__(
+        self,
+        average: str = "none",
+        count: int = 10,
+        hold: str = "none",
+        smooth_points: int = 1,
+        bands: Sequence[Tuple[float, float]] = (),
+    ):
+        if average not in AVERAGE_MODES:
+            raise ValueError(f"Unknown average mode '{average}'")
+        if hold not in HOLD_MODES:
+            raise ValueError(f"Unknown hold mode '{hold}'")
+        self.average = average
+        self.count = max(int(count), 1)
+        self.hold = hold
+        self.smooth_points = int(smooth_points)
+        self.bands = list(bands)
+        self.reset()
+
+    def reset(self) -> None:
+        self.traces = 0
+        self.mean = None
+        self.held = None
+
+    def process(self, x, trace) -> Dict:
+        trace = np.asarray(trace, dtype=float)
+        if self.mean is not None and len(trace) != len(self.mean):
+            self.reset()
+        self.traces += 1
+        linear = to_linear(trace)
+        if self.average == "none" or self.mean is None:
+            self.mean = linear
+        else:
+            weight = self.traces if self.average == "linear" else self.count
+            self.mean = self.mean + (linear - self.mean) / min(self.traces, weight)
+        if self.hold == "max":
+            self.held = trace if self.held is None else np.fmax(self.held, trace)
+        elif self.hold == "min":
+            self.held = trace if self.held is None else np.fmin(self.held, trace)
+        result = {
+            "x": x,
+            "y": to_db(smooth(self.mean, self.smooth_points)),
+            "raw": trace,
+            "hold": self.held,
+            "traces": self.traces,
+        }
+        if self.bands:
+            result["bands"] = band_power(x, to_db(self.mean), self.bands)
+        return result